@@ -134,4 +134,12 @@ INSERT INTO instructions (recipe_id, step_number, instruction_text) VALUES
 (11, 3, 'Finalize com um toque de azeite'),
 (12, 1, 'Cozinhe o arroz em água aromatizada'),
 (12, 2, 'Prepare os legumes com leve refogado'),
-(12, 3, 'Misture tudo suavemente');
\ No newline at end of file
+(12, 3, 'Misture tudo suavemente');
+
+-- Fill in the denormalized recipe counters from the links inserted above.
+UPDATE categories SET recipe_count = (
+SELECT COUNT(*) FROM recipe_categories WHERE recipe_categories.category_id = categories.category_id
+);
+UPDATE ingredients SET recipe_count = (
+SELECT COUNT(*) FROM recipe_ingredients WHERE recipe_ingredients.ingredient_id = ingredients.ingredient_id
+);
\ No newline at end of file
@@ -6,6 +6,7 @@ DROP TABLE IF EXISTS recipe_categories;
 DROP TABLE IF EXISTS recipes;
 DROP TABLE IF EXISTS categories;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS table_versions;
 CREATE TABLE users (
 user_id INT IDENTITY(1,1) PRIMARY KEY,
 email NVARCHAR(255) NOT NULL UNIQUE,
@@ -19,8 +20,12 @@ CREATE TABLE categories (
 category_id INT IDENTITY(1,1) PRIMARY KEY,
 name NVARCHAR(100) NOT NULL UNIQUE,
 description NVARCHAR(MAX),
-image_url NVARCHAR(MAX)
+image_url NVARCHAR(MAX),
+recipe_count INT NOT NULL DEFAULT 0,
+version INT NOT NULL DEFAULT 1,
+updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
 );
+CREATE INDEX ix_categories_recipe_count ON categories (recipe_count, category_id);
 CREATE TABLE recipes (
 id INT IDENTITY(1,1) PRIMARY KEY,
 title NVARCHAR(255) NOT NULL,
@@ -31,8 +36,12 @@ difficulty NVARCHAR(10) CHECK (difficulty IN ('FACIL', 'MEDIO', 'DIFICIL')),
 image_url NVARCHAR(MAX),
 author_id INT NOT NULL,
 created_at DATETIME2 NOT NULL DEFAULT GETDATE(),
+version INT NOT NULL DEFAULT 1,
+updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
 FOREIGN KEY (author_id) REFERENCES users(user_id) ON DELETE CASCADE
 );
+CREATE INDEX ix_recipes_author_id ON recipes (author_id);
+CREATE INDEX ix_recipes_created_at ON recipes (created_at);
 CREATE TABLE recipe_categories (
 recipe_id INT NOT NULL,
 category_id INT NOT NULL,
@@ -40,6 +49,7 @@ FOREIGN KEY (recipe_id) REFERENCES recipes(id) ON DELETE NO ACTION,
 FOREIGN KEY (category_id) REFERENCES categories(category_id) ON DELETE CASCADE,
 PRIMARY KEY (recipe_id, category_id)
 );
+CREATE INDEX ix_recipe_categories_category_id ON recipe_categories (category_id);
 CREATE TABLE instructions (
 instruction_id INT IDENTITY(1,1) PRIMARY KEY,
 recipe_id INT NOT NULL,
@@ -47,11 +57,16 @@ step_number INT NOT NULL,
 instruction_text NVARCHAR(MAX) NOT NULL,
 FOREIGN KEY (recipe_id) REFERENCES recipes(id) ON DELETE CASCADE
 );
+CREATE INDEX ix_instructions_recipe_id_step_number ON instructions (recipe_id, step_number);
 CREATE TABLE ingredients (
 ingredient_id INT IDENTITY(1,1) PRIMARY KEY,
 name NVARCHAR(255) NOT NULL UNIQUE,
-image_url NVARCHAR(MAX)
+image_url NVARCHAR(MAX),
+recipe_count INT NOT NULL DEFAULT 0,
+version INT NOT NULL DEFAULT 1,
+updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
 );
+CREATE INDEX ix_ingredients_recipe_count ON ingredients (recipe_count, ingredient_id);
 CREATE TABLE recipe_ingredients (
 recipe_id INT NOT NULL,
 ingredient_id INT NOT NULL,
@@ -60,4 +75,12 @@ unit NVARCHAR(50) NOT NULL,
 FOREIGN KEY (recipe_id) REFERENCES recipes(id) ON DELETE CASCADE,
 FOREIGN KEY (ingredient_id) REFERENCES ingredients(ingredient_id) ON DELETE CASCADE,
 PRIMARY KEY (recipe_id, ingredient_id)
-);
\ No newline at end of file
+);
+CREATE INDEX ix_recipe_ingredients_ingredient_id ON recipe_ingredients (ingredient_id);
+CREATE TABLE table_versions (
+table_name NVARCHAR(128) PRIMARY KEY,
+version INT NOT NULL,
+updated_at DATETIME2 NOT NULL
+);
+INSERT INTO table_versions (table_name, version, updated_at)
+VALUES ('categories', 1, SYSUTCDATETIME()), ('ingredients', 1, SYSUTCDATETIME());
\ No newline at end of file
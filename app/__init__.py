@@ -1,6 +1,58 @@
+import logging
+from contextlib import asynccontextmanager
+
+from anyio.to_thread import current_default_thread_limiter
 from fastapi import FastAPI
-from app.database import engine
-from app.models.base import Base
+
+from app.compression import CompressionMiddleware
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.images.derivatives import derivative_pipeline
+from app.migrations import migrate
+from app.query_stats import QueryStatsMiddleware
+from app.response_cache import ResponseCacheMiddleware
+from app.search.catalog import stop_rebuilds, warm_autocomplete
+from app.serialization import FastJSONResponse
+from app.security.hashing import password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+
+    Runs once around the lifetime of the application: everything before ``yield`` happens at
+    startup, everything after it at shutdown. At startup it sizes the threadpool, applies pending
+    schema migrations if DB_MIGRATE_ON_STARTUP is set and loads the autocomplete indexes; on
+    shutdown it cancels background search index rebuilds, stops the image derivative and password
+    hashing worker processes and closes the connection pool.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    # Size the threadpool running sync handlers and run_in_threadpool calls. Work running there
+    # may hold a database connection, so the pool should be able to serve every thread at once.
+    current_default_thread_limiter().total_tokens = settings.THREADPOOL_WORKERS
+    if settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW < settings.THREADPOOL_WORKERS:
+        logger.warning(
+            "The database pool (%d + %d overflow) is smaller than the threadpool (%d): "
+            "threads may queue on connection checkout",
+            settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.THREADPOOL_WORKERS
+        )
+
+    # The schema is migrated by a separate deploy step (app.commands.migrate); only development
+    # setups let the app do it.
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await migrate(engine)
+    async with SessionLocal() as db:
+        await warm_autocomplete(db)
+    yield
+    await stop_rebuilds()
+    derivative_pipeline.shutdown()
+    password_hasher.shutdown()
+    await engine.dispose()
 
 
 def create_app():
@@ -8,11 +60,15 @@ def create_app():
     Factory function to create and configure a FastAPI application instance.
 
     This function performs the following tasks:
-      - Initializes a new FastAPI application.
-      - Creates all database tables from the SQLAlchemy models defined in Base.
+      - Initializes a new FastAPI application, encoding responses with FastJSONResponse.
       - Imports and includes the routers for authentication, users, recipes, instructions,
-        ingredients, and categories.
+        ingredients, categories, images, metrics, and bulk imports.
       - Defines a simple root endpoint that returns a welcome message.
+      - Adds the response cache middleware serving the read-mostly catalog endpoints, outside it
+        the compression middleware (so cached responses are stored once, uncompressed), and
+        outermost the middleware counting each request's SQL statements into a Server-Timing header.
+      - Registers the lifespan handler that warms in-memory indexes at startup and stops
+        background workers on shutdown.
 
     Returns:
         FastAPI: The configured FastAPI application instance.
@@ -20,13 +76,13 @@ def create_app():
     Example:
         app = create_app()
     """
-    app = FastAPI()
-
-    # Create database tables based on the models defined in Base.
-    Base.metadata.create_all(bind=engine)
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+    app.add_middleware(ResponseCacheMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
 
     # Import routers from various modules to set up endpoint routes.
-    from app.routers import users, recipes, instructions, ingredients, auth, categories
+    from app.routers import users, recipes, instructions, ingredients, auth, categories, images, metrics, imports
 
     # Include the imported routers in the application.
     app.include_router(auth.router)
@@ -35,6 +91,9 @@ def create_app():
     app.include_router(instructions.router)
     app.include_router(ingredients.router)
     app.include_router(categories.router)
+    app.include_router(images.router)
+    app.include_router(metrics.router)
+    app.include_router(imports.router)
 
     # Define a simple route for the root URL that returns a welcome message.
     @app.get("/")
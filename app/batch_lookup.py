@@ -0,0 +1,71 @@
+"""
+Batch lookups by id (``?ids=``) shared by the ``/batch`` endpoints.
+
+A client holding a list of ids (favorites, recently viewed items, an offline cache to refresh)
+would otherwise fetch them one request at a time. A batch endpoint resolves up to MAX_BATCH_IDS
+ids with a single ``IN`` query (plus the usual eager loads), returns the items in the order the
+ids were requested and lists the ids that do not exist, so the client can tell a deleted item
+from a failed request.
+"""
+
+from typing import List
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+
+def batch_ids(
+    ids: str = Query(..., description=f"Comma-separated ids, at most {settings.MAX_BATCH_IDS}")
+) -> List[int]:
+    """
+    Dependency that reads the ``?ids=`` of a batch lookup.
+
+    Args:
+        ids (str): Comma-separated integer ids; repeated ids are looked up once.
+
+    Raises:
+        HTTPException: With status 400 if an id is not an integer or too many ids are given.
+
+    Returns:
+        List[int]: The distinct ids, in the order they were first given.
+    """
+    parts = [part.strip() for part in ids.split(",") if part.strip()]
+    invalid = [part for part in parts if not part.lstrip("-").isdigit()]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid ids: {', '.join(invalid)}"
+        )
+    unique = list(dict.fromkeys(int(part) for part in parts))
+    if len(unique) > settings.MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BATCH_IDS} ids can be requested at once"
+        )
+    return unique
+
+
+async def load_batch(db: AsyncSession, statement: Select, key, ids: List[int]) -> dict:
+    """
+    Load the entities with the given ids in one query.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        statement (Select): A select over one entity, with its loader options.
+        key: The entity's primary key column, e.g. ``Ingredient.ingredient_id``.
+        ids (List[int]): The ids to look up, in the desired output order.
+
+    Returns:
+        dict: A mapping compatible with the Batch schema: ``items`` in the order of ``ids`` and the
+            ``missing`` ids.
+    """
+    found = {}
+    if ids:
+        found = {getattr(item, key.key): item for item in await db.scalars(statement.where(key.in_(ids)))}
+    return {
+        "items": [found[item_id] for item_id in ids if item_id in found],
+        "missing": [item_id for item_id in ids if item_id not in found],
+    }
@@ -0,0 +1,318 @@
+"""
+Bulk import of recipes, ingredients and categories from NDJSON.
+
+An import reads one JSON object per line, validates the lines against the same schemas as the
+create endpoints, and writes them a chunk at a time: each chunk costs a handful of statements
+(``executemany`` inserts and updates) and one commit, instead of a request, several flushes and
+two commits per record. A failed line is reported with its line number and skipped; the other
+lines of its chunk are still written.
+
+  - Ingredients and categories are upserted by their unique name: an existing row gets the image
+    (and description) its line provides, leaving the fields the line omits as they are, and a new
+    name is inserted.
+  - Recipes reference existing categories and ingredients by id and are authored by the importing
+    user, as with ``POST /recipes/`` (the lines' ``author_id`` is ignored). Their recipe counts, search index entries and thumbnails are
+    updated like the create endpoint does.
+
+The input is consumed as a stream, so memory use is bounded by one chunk whatever the input size.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.images.derivatives import schedule_derivatives
+from app.images.store import ingest_image_value
+from app.models import Category, Ingredient, Recipe, RecipeCategory, RecipeIngredient
+from app.models.instruction import Instruction
+from app.models.recipe import DIFFICULTIES
+from app.queries.popularity import add_recipe_links
+from app.schemas.bulk_import import ImportKind, ImportLineError, ImportReport
+from app.schemas.category import CategoryCreate
+from app.schemas.ingredient import IngredientCreate
+from app.schemas.recipe import RecipeCreate
+from app.search.catalog import (
+    RecipeSearch, category_autocomplete, ingredient_autocomplete, ingredient_search, recipe_search
+)
+
+# A validated line: (line number, parsed record).
+Line = Tuple[int, BaseModel]
+
+# Callback run once a chunk is committed, e.g. to update in-memory indexes.
+AfterCommit = Optional[Callable[[], None]]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Split a stream of byte chunks into lines.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw input, e.g. ``Request.stream()``.
+
+    Yields:
+        bytes: Each line, without its line terminator.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def describe_validation_error(exc: ValidationError) -> str:
+    """
+    Summarize a pydantic validation error on one line.
+
+    Args:
+        exc (ValidationError): The validation error.
+
+    Returns:
+        str: The failing locations and messages, separated by semicolons.
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+async def _ingest_images(values: List[Optional[str]]) -> List[Optional[str]]:
+    # Image decoding and file writes are blocking; do the whole chunk in one threadpool call.
+    return await run_in_threadpool(lambda: [ingest_image_value(value) for value in values])
+
+
+async def _upsert_by_name(db: AsyncSession, model, key, batch: List[Line], report: ImportReport, fields) -> Tuple[list, list]:
+    # Later lines win when a name repeats within the chunk.
+    latest = {item.name: item for _, item in batch}
+    existing = dict((await db.execute(select(model.name, key).where(model.name.in_(latest)))).all())
+
+    fields = ("image_url", *fields)
+    images = await _ingest_images([
+        item.image_url if "image_url" in item.model_fields_set else None for item in latest.values()
+    ])
+    updates, inserts = {}, []
+    for item, image_url in zip(latest.values(), images):
+        values = {field: getattr(item, field) for field in fields}
+        values["image_url"] = image_url
+        if item.name in existing:
+            # Only the fields the line gives: an omitted image or description is kept, not cleared.
+            provided = tuple(field for field in fields if field in item.model_fields_set)
+            if provided:
+                row = {"_key": existing[item.name], **{field: values[field] for field in provided}}
+                updates.setdefault(provided, []).append(row)
+        else:
+            inserts.append({"name": item.name, **values})
+
+    # Core statements rather than ORM bulk operations: the ORM sends an UPDATE per row, since
+    # Versioned increments the version with a SQL expression, and splits inserts by their None
+    # values. One executemany is sent per set of updated fields.
+    table = model.__table__
+    for provided, rows in updates.items():
+        await db.execute(
+            update(table)
+            .where(table.c[key.key] == bindparam("_key"))
+            .values({field: bindparam(field) for field in provided}),
+            rows
+        )
+    created = []
+    if inserts:
+        # The new rows are matched to their names from RETURNING, so their order does not matter
+        # and the insert can go out as a single multi-row statement.
+        created = (await db.execute(insert(table).returning(table.c[key.key], table.c.name), inserts)).all()
+    report.created += len(inserts)
+    report.updated += len(latest) - len(inserts)
+    report.repeated += len(batch) - len(latest)
+    return created, [image_url for image_url in images if image_url is not None]
+
+
+async def _write_categories(db: AsyncSession, batch: List[Line], report: ImportReport, author_id: int) -> AfterCommit:
+    created, images = await _upsert_by_name(db, Category, Category.category_id, batch, report, ("description",))
+
+    def after_commit():
+        for image_url in images:
+            schedule_derivatives(image_url)
+        for category_id, name in created:
+            category_autocomplete.add(category_id, name)
+    return after_commit
+
+
+async def _write_ingredients(db: AsyncSession, batch: List[Line], report: ImportReport, author_id: int) -> AfterCommit:
+    created, images = await _upsert_by_name(db, Ingredient, Ingredient.ingredient_id, batch, report, ())
+
+    def after_commit():
+        for image_url in images:
+            schedule_derivatives(image_url)
+        for ingredient_id, name in created:
+            ingredient_search.add(ingredient_id, {"name": name})
+            ingredient_autocomplete.add(ingredient_id, name)
+    return after_commit
+
+
+def _check_recipe(recipe: RecipeCreate, category_names: dict, ingredient_names: dict) -> Optional[str]:
+    # Problems the database would only report for the whole chunk.
+    if recipe.difficulty not in DIFFICULTIES:
+        return f"difficulty: must be one of {', '.join(DIFFICULTIES)}"
+    category_ids = [category.category_id for category in recipe.categories]
+    ingredient_ids = [ingredient.ingredient_id for ingredient in recipe.ingredients]
+    if len(set(category_ids)) != len(category_ids):
+        return "categories: a category is listed twice"
+    if len(set(ingredient_ids)) != len(ingredient_ids):
+        return "ingredients: an ingredient is listed twice"
+    missing = [str(i) for i in category_ids if i not in category_names]
+    if missing:
+        return f"categories: unknown category_id {', '.join(missing)}"
+    missing = [str(i) for i in ingredient_ids if i not in ingredient_names]
+    if missing:
+        return f"ingredients: unknown ingredient_id {', '.join(missing)}"
+    return None
+
+
+async def _write_recipes(db: AsyncSession, batch: List[Line], report: ImportReport, author_id: int) -> AfterCommit:
+    category_ids = {category.category_id for _, recipe in batch for category in recipe.categories}
+    ingredient_ids = {ingredient.ingredient_id for _, recipe in batch for ingredient in recipe.ingredients}
+    category_names = dict((await db.execute(
+        select(Category.category_id, Category.name).where(Category.category_id.in_(category_ids))
+    )).all()) if category_ids else {}
+    ingredient_names = dict((await db.execute(
+        select(Ingredient.ingredient_id, Ingredient.name).where(Ingredient.ingredient_id.in_(ingredient_ids))
+    )).all()) if ingredient_ids else {}
+
+    recipes = []
+    for line, recipe in batch:
+        error = _check_recipe(recipe, category_names, ingredient_names)
+        if error:
+            report.errors.append(ImportLineError(line=line, error=error))
+        else:
+            recipes.append(recipe)
+    if not recipes:
+        return None
+
+    images = await _ingest_images([recipe.image_url for recipe in recipes])
+    recipe_ids = (await db.execute(
+        insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True),
+        [
+            {
+                "title": recipe.title,
+                "description": recipe.description,
+                "preparation_time": recipe.preparation_time,
+                "servings": recipe.servings,
+                "difficulty": recipe.difficulty,
+                "image_url": image_url,
+                "author_id": author_id,
+            }
+            for recipe, image_url in zip(recipes, images)
+        ]
+    )).scalars().all()
+
+    category_links = [
+        {"recipe_id": recipe_id, "category_id": category.category_id}
+        for recipe_id, recipe in zip(recipe_ids, recipes) for category in recipe.categories
+    ]
+    ingredient_links = [
+        {"recipe_id": recipe_id, "ingredient_id": ingredient.ingredient_id, "amount": ingredient.amount, "unit": ingredient.unit}
+        for recipe_id, recipe in zip(recipe_ids, recipes) for ingredient in recipe.ingredients
+    ]
+    instructions = [
+        {"recipe_id": recipe_id, "step_number": step, "instruction_text": text}
+        for recipe_id, recipe in zip(recipe_ids, recipes) for step, text in enumerate(recipe.instructions, 1)
+    ]
+    for model, rows in ((RecipeCategory, category_links), (RecipeIngredient, ingredient_links), (Instruction, instructions)):
+        if rows:
+            await db.execute(insert(model), rows)
+    await add_recipe_links(
+        db,
+        (link["category_id"] for link in category_links),
+        (link["ingredient_id"] for link in ingredient_links)
+    )
+    report.created += len(recipes)
+
+    def after_commit():
+        for image_url in images:
+            schedule_derivatives(image_url)
+        for recipe_id, recipe in zip(recipe_ids, recipes):
+            recipe_search.add(recipe_id, RecipeSearch.text_document(
+                recipe.title,
+                recipe.description,
+                (category_names[category.category_id] for category in recipe.categories),
+                (ingredient_names[ingredient.ingredient_id] for ingredient in recipe.ingredients)
+            ))
+    return after_commit
+
+
+# Schema and chunk writer of each import kind.
+IMPORTERS = {
+    ImportKind.categories: (CategoryCreate, _write_categories),
+    ImportKind.ingredients: (IngredientCreate, _write_ingredients),
+    ImportKind.recipes: (RecipeCreate, _write_recipes),
+}
+
+
+async def import_ndjson(
+        db: AsyncSession,
+        kind: ImportKind,
+        chunks: AsyncIterable[bytes],
+        author_id: int,
+        chunk_size: int = settings.IMPORT_CHUNK_SIZE
+) -> ImportReport:
+    """
+    Import an NDJSON stream of records of one kind.
+
+    Each chunk of ``chunk_size`` valid lines is written and committed on its own. If the database
+    rejects a chunk, it is rolled back and all of its lines are reported with the database error;
+    earlier and later chunks are unaffected.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        kind (ImportKind): The kind of records in the stream.
+        chunks (AsyncIterable[bytes]): The NDJSON input, in arbitrary byte chunks.
+        author_id (int): The user recorded as author of imported recipes.
+        chunk_size (int): Number of valid lines written per transaction.
+
+    Returns:
+        ImportReport: Counts of received, created, updated and repeated records and the per-line errors.
+    """
+    schema, write = IMPORTERS[kind]
+    report = ImportReport(kind=kind)
+    batch: List[Line] = []
+
+    async def flush() -> None:
+        counts = (report.created, report.updated, report.repeated, len(report.errors))
+        try:
+            after_commit = await write(db, batch, report, author_id)
+            await db.commit()
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            # Nothing of the chunk was written: undo its counts and report every line instead.
+            report.created, report.updated, report.repeated = counts[:3]
+            del report.errors[counts[3]:]
+            message = f"database error: {exc.__class__.__name__}: {getattr(exc, 'orig', exc)}"
+            report.errors.extend(ImportLineError(line=line, error=message) for line, _ in batch)
+            return
+        if after_commit is not None:
+            after_commit()
+
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        report.received += 1
+        try:
+            batch.append((line_number, schema.model_validate_json(line)))
+        except ValidationError as exc:
+            report.errors.append(ImportLineError(line=line_number, error=describe_validation_error(exc)))
+            continue
+        if len(batch) >= chunk_size:
+            await flush()
+            batch = []
+    if batch:
+        await flush()
+
+    report.errors.sort(key=lambda error: error.line)
+    return report
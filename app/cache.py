@@ -0,0 +1,105 @@
+"""
+Small in-process caches.
+
+``TTLCache`` is a thread-safe mapping bounded both in size (least recently used entries are
+evicted first) and in time (entries expire after a time-to-live). Lookups and evictions are O(1).
+Caches created with a name publish their hit and miss counts in the metrics registry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.metrics import metrics
+
+# Sentinel telling a missing entry apart from a cached None.
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries also expire after a time-to-live.
+
+    Expired entries are dropped lazily, when they are looked up or reach the LRU end, so the cache
+    needs no background thread.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Default time-to-live of an entry, in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = None
+        if name:
+            self._hits = metrics.counter(f"{name}_hits_total", f"Lookups answered by the {name} cache")
+            self._misses = metrics.counter(f"{name}_misses_total", f"Lookups missing the {name} cache")
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a live entry and mark it as recently used.
+
+        Args:
+            key (Hashable): The entry key.
+            default (Any): Returned when the key is absent or expired.
+
+        Returns:
+            Any: The cached value, or ``default``.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] <= now:
+                del self._entries[key]
+                entry = _MISSING
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+        if entry is _MISSING:
+            if self._misses is not None:
+                self._misses.inc()
+            return default
+        if self._hits is not None:
+            self._hits.inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used ones if the cache is full.
+
+        Args:
+            key (Hashable): The entry key.
+            value (Any): The value to cache.
+            ttl (Optional[float]): Time-to-live of this entry in seconds; defaults to ``self.ttl``.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key (Hashable): The entry key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,88 @@
+"""
+Render the missing thumbnails and placeholders of every stored image.
+
+New images get their variants rendered in the background when they are created, but images moved
+by migrate_images, jobs dropped while the pipeline was saturated and newly added variant sizes all
+need a catch-up pass. This command collects the image references used by recipes, categories and
+ingredients and renders whatever variants are missing, using a process pool.
+
+Usage:
+    python -m app.commands.backfill_derivatives [--workers 4]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.images.derivatives import render_variants
+from app.images.store import image_store, parse_image_reference
+from app.models import Category, Ingredient, Recipe
+
+
+async def referenced_digests(db) -> set:
+    """
+    Collect the digests of every image referenced from the database.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+
+    Returns:
+        set: The distinct image digests found in the image_url columns.
+    """
+    digests = set()
+    for column in (Recipe.image_url, Category.image_url, Ingredient.image_url):
+        for image_url in await db.scalars(select(column).where(column.like("/images/%")).distinct()):
+            digest = parse_image_reference(image_url)
+            if digest and image_store.exists(digest):
+                digests.add(digest)
+    return digests
+
+
+async def load_digests() -> set:
+    """
+    Open a session, collect the referenced image digests and release the connection pool.
+
+    Returns:
+        set: The distinct image digests found in the image_url columns.
+    """
+    async with SessionLocal() as db:
+        digests = await referenced_digests(db)
+    await engine.dispose()
+    return digests
+
+
+def main(argv=None):
+    """
+    Entry point of the backfill_derivatives command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Render missing image thumbnails and placeholders.")
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_WORKERS, help="worker processes")
+    args = parser.parse_args(argv)
+
+    digests = asyncio.run(load_digests())
+
+    rendered = failed = 0
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+        futures = {executor.submit(render_variants, image_store.root, digest): digest for digest in digests}
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    rendered += 1
+            except Exception as exc:
+                failed += 1
+                print(f"{futures[future]}: {exc}")
+
+    print(f"{len(digests)} image(s) checked, {rendered} rendered, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
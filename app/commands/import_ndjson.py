@@ -0,0 +1,103 @@
+"""
+Import recipes, ingredients or categories from an NDJSON file.
+
+Each line holds one JSON object in the format of the matching create endpoint. The file is
+read in chunks and written through the same code as ``POST /import/{kind}``: batched inserts
+and updates, one transaction per chunk, ingredients and categories upserted by name. Invalid
+lines are skipped and listed at the end.
+
+The API server's in-memory indexes and response caches do not see rows written by this command
+until they expire or the server restarts.
+
+Usage:
+    python -m app.commands.import_ndjson ingredients ingredients.ndjson
+    python -m app.commands.import_ndjson recipes recipes.ndjson --author-id 1
+    cat categories.ndjson | python -m app.commands.import_ndjson categories -
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO, Optional
+
+from app.bulk_import import import_ndjson
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.schemas import ImportKind, ImportReport
+
+# Bytes read from the input file at a time.
+READ_SIZE = 1 << 16
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    """
+    Read a file in chunks without blocking the event loop.
+
+    Args:
+        file (BinaryIO): The open input file.
+
+    Yields:
+        bytes: Successive chunks of the file.
+    """
+    while True:
+        chunk = await asyncio.to_thread(file.read, READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def run_import(kind: ImportKind, file: BinaryIO, author_id: Optional[int], chunk_size: int) -> ImportReport:
+    """
+    Import the file in one session.
+
+    Args:
+        kind (ImportKind): The kind of records in the file.
+        file (BinaryIO): The open input file.
+        author_id (Optional[int]): The user recorded as author of imported recipes.
+        chunk_size (int): Number of valid lines written per transaction.
+
+    Returns:
+        ImportReport: Counts of received, created and updated records and the per-line errors.
+    """
+    async with SessionLocal() as db:
+        report = await import_ndjson(db, kind, read_chunks(file), author_id, chunk_size)
+    await engine.dispose()
+    return report
+
+
+def main(argv=None):
+    """
+    Entry point of the import_ndjson command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Import recipes, ingredients or categories from an NDJSON file.")
+    parser.add_argument("kind", choices=[kind.value for kind in ImportKind], help="Kind of records in the file.")
+    parser.add_argument("path", help="NDJSON file to import, or - to read standard input.")
+    parser.add_argument("--author-id", type=int, help="Id of the user recorded as author of imported recipes.")
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE, help="Lines written per transaction."
+    )
+    args = parser.parse_args(argv)
+    kind = ImportKind(args.kind)
+    if kind is ImportKind.recipes and args.author_id is None:
+        parser.error("--author-id is required to import recipes")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    if args.path == "-":
+        report = asyncio.run(run_import(kind, sys.stdin.buffer, args.author_id, args.chunk_size))
+    else:
+        with open(args.path, "rb") as file:
+            report = asyncio.run(run_import(kind, file, args.author_id, args.chunk_size))
+
+    print(f"{report.kind.value}: {report.received} received, {report.created} created, {report.updated} updated, "
+          f"{report.repeated} repeated")
+    for error in report.errors:
+        print(f"line {error.line}: {error.error}", file=sys.stderr)
+    sys.exit(1 if report.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
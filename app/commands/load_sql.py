@@ -0,0 +1,106 @@
+"""
+Seed the configured database from a T-SQL data script (SQL/MockData.sql by default).
+
+The script is streamed and translated by app.sql_loader, so it loads into SQLite as well as SQL
+Server, e.g. to seed a development, test or benchmark database:
+
+    DATABASE_URL=sqlite+aiosqlite:///./dev.db python -m app.commands.load_sql --reset
+
+Pending schema migrations are applied first. The whole script runs in one transaction, followed by a rebuild
+of the recipe counters. Inline base64 images are moved to the image store on the way, as the
+create endpoints do, unless --keep-inline-images is given.
+
+Usage:
+    python -m app.commands.load_sql [script] [--reset] [--batch-size 500] [--keep-inline-images]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.images.store import ingest_image_value
+from app.migrations import drop_schema, upgrade
+from app.queries.popularity import rebuild_recipe_counts
+from app.sql_loader import SQLScriptError, load_script
+
+# The mock data shipped with the repository.
+DEFAULT_SCRIPT = Path(__file__).resolve().parents[2] / "SQL" / "MockData.sql"
+
+
+def ingest_images(table: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Move the inline base64 images of a batch of rows to the image store.
+
+    Args:
+        table (str): The name of the table the rows are inserted into.
+        rows (List[Dict[str, Any]]): The rows, modified in place.
+    """
+    for row in rows:
+        if "image_url" in row:
+            row["image_url"] = ingest_image_value(row["image_url"])
+
+
+async def load(path: Path, reset: bool, batch_size: int, keep_inline_images: bool) -> Dict[str, int]:
+    """
+    Load the script in a single transaction.
+
+    Args:
+        path (Path): The script to load.
+        reset (bool): Whether to drop every table and migrate an empty database first.
+        batch_size (int): Number of rows sent per insert.
+        keep_inline_images (bool): Whether to store base64 images in the database as they are.
+
+    Returns:
+        Dict[str, int]: The number of rows inserted per table name.
+    """
+    async with engine.begin() as connection:
+        if reset:
+            await connection.run_sync(drop_schema)
+        await connection.run_sync(upgrade)
+        with open(path, encoding="utf-8") as script:
+            loaded = await load_script(
+                connection, script, batch_size, transform=None if keep_inline_images else ingest_images
+            )
+        # The counters are derived data: recompute them whether or not the script maintains them.
+        async with AsyncSession(bind=connection) as db:
+            await rebuild_recipe_counts(db)
+    await engine.dispose()
+    return loaded
+
+
+def main(argv=None):
+    """
+    Entry point of the load_sql command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Seed the database from a T-SQL data script.")
+    parser.add_argument("script", nargs="?", type=Path, default=DEFAULT_SCRIPT, help="Script to load.")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate every table first.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows sent per insert.")
+    parser.add_argument(
+        "--keep-inline-images", action="store_true", help="Store base64 images in the database as they are."
+    )
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    started = time.perf_counter()
+    try:
+        loaded = asyncio.run(load(args.script, args.reset, args.batch_size, args.keep_inline_images))
+    except SQLScriptError as exc:
+        sys.exit(f"{args.script.name}: {exc}")
+    for table, count in loaded.items():
+        print(f"{table}: {count} row(s)")
+    print(f"loaded {args.script.name} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Apply the pending schema migrations of app/migrations to the configured database.
+
+Run it as a deploy step, before starting the new version of the app, which does no schema work
+of its own:
+
+    python -m app.commands.migrate
+
+Databases created before migrations existed are adopted: the scripts skip the tables, columns
+and indexes that are already there. --status lists the applied and pending migrations without
+changing anything, and exits with status 1 if some are pending, e.g. to gate a deploy.
+
+Usage:
+    python -m app.commands.migrate [--target VERSION] [--status]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.database import engine
+from app.migrations import applied_versions, discover, migrate
+
+
+async def status() -> list:
+    """
+    Read which migrations are applied.
+
+    Returns:
+        list: (Migration, applied) pairs in version order.
+    """
+    async with engine.connect() as connection:
+        applied = await connection.run_sync(applied_versions)
+    await engine.dispose()
+    return [(migration, migration.version in applied) for migration in discover()]
+
+
+async def run(target) -> list:
+    """
+    Apply the pending migrations in a single transaction.
+
+    Args:
+        target (Optional[int]): The last version to apply; all of them by default.
+
+    Returns:
+        list: The migrations applied, in order.
+    """
+    applied = await migrate(engine, target)
+    await engine.dispose()
+    return applied
+
+
+def main(argv=None):
+    """
+    Entry point of the migrate command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Apply the pending schema migrations.")
+    parser.add_argument("--target", type=int, help="Last migration version to apply; all of them by default.")
+    parser.add_argument("--status", action="store_true", help="List the migrations and exit, changing nothing.")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        pending = 0
+        for migration, applied in asyncio.run(status()):
+            pending += not applied
+            print(f"{'applied' if applied else 'pending'} {migration.version:04d} {migration.name}: "
+                  f"{migration.description}")
+        sys.exit(1 if pending else 0)
+
+    started = time.perf_counter()
+    applied = asyncio.run(run(args.target))
+    for migration in applied:
+        print(f"applied {migration.version:04d} {migration.name}")
+    print(f"{len(applied)} migration(s) applied in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
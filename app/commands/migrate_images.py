@@ -0,0 +1,108 @@
+"""
+Move inline base64 images out of the database into the image store.
+
+Walks the recipes, categories and ingredients tables in primary-key order, a batch at a time,
+stores every base64 ``image_url`` in the content-addressed image store and rewrites the column to
+the short ``/images/<sha256>`` reference. Rows that already hold a reference or a URL are left
+untouched, so the command can be re-run safely after an interruption. Values that do not decode
+to a JPEG, PNG, GIF or WebP image of at most IMAGE_MAX_BYTES are left inline.
+
+Usage:
+    python -m app.commands.migrate_images [--batch-size 50] [--dry-run]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+
+from app.database import SessionLocal, engine
+from app.images.store import ingest_image_value, parse_image_reference
+from app.models import Category, Ingredient, Recipe
+
+# Models holding an image_url column, with their primary key column.
+IMAGE_MODELS = (
+    (Recipe, Recipe.id),
+    (Category, Category.category_id),
+    (Ingredient, Ingredient.ingredient_id),
+)
+
+
+async def migrate_model(db, model, key, batch_size: int, dry_run: bool) -> int:
+    """
+    Rewrite the base64 images of one table to image references.
+
+    Only the primary key and image_url are loaded, and rows are fetched with keyset pagination so
+    memory stays bounded by one batch of images.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        model: The mapped class to migrate (Recipe, Category or Ingredient).
+        key: The primary key column of the model.
+        batch_size (int): How many rows to load and commit at a time.
+        dry_run (bool): If True, images are not stored and no rows are changed.
+
+    Returns:
+        int: The number of rows whose image was (or would be) moved to the image store.
+    """
+    migrated = 0
+    last_key = None
+    while True:
+        query = select(model).options(load_only(key, model.image_url)).where(model.image_url.isnot(None))
+        if last_key is not None:
+            query = query.where(key > last_key)
+        rows = (await db.scalars(query.order_by(key).limit(batch_size))).all()
+        if not rows:
+            break
+
+        for row in rows:
+            if parse_image_reference(row.image_url) or row.image_url.startswith(("http://", "https://")):
+                continue
+            if dry_run:
+                migrated += 1
+                continue
+            reference = await asyncio.to_thread(ingest_image_value, row.image_url)
+            if reference != row.image_url:
+                row.image_url = reference
+                migrated += 1
+
+        last_key = getattr(rows[-1], key.key)
+        if not dry_run:
+            await db.commit()
+        # Drop the loaded images from the identity map before fetching the next batch.
+        db.expunge_all()
+    return migrated
+
+
+async def migrate(batch_size: int, dry_run: bool):
+    """
+    Migrate the images of every table holding an image_url column.
+
+    Args:
+        batch_size (int): How many rows to load and commit at a time.
+        dry_run (bool): If True, images are not stored and no rows are changed.
+    """
+    async with SessionLocal() as db:
+        for model, key in IMAGE_MODELS:
+            migrated = await migrate_model(db, model, key, batch_size, dry_run)
+            print(f"{model.__tablename__}: {migrated} image(s) {'to migrate' if dry_run else 'migrated'}")
+    await engine.dispose()
+
+
+def main(argv=None):
+    """
+    Entry point of the migrate_images command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Move base64 image_url values into the image store.")
+    parser.add_argument("--batch-size", type=int, default=50, help="rows loaded and committed per batch")
+    parser.add_argument("--dry-run", action="store_true", help="only count the rows that would be migrated")
+    args = parser.parse_args(argv)
+    asyncio.run(migrate(args.batch_size, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Recompute the recipe_count columns of categories and ingredients from the link tables.
+
+The counters are maintained by the API's write endpoints. Links inserted or deleted by other
+means (SQL scripts, manual fixes, deletes that cascade without going through the API) leave them
+off; this command reconciles them, updating only the rows whose count drifted. It is safe to run
+at any time, including on a live database.
+
+Usage:
+    python -m app.commands.rebuild_recipe_counts
+"""
+
+import argparse
+import asyncio
+
+from app.database import SessionLocal, engine
+from app.queries.popularity import rebuild_recipe_counts
+
+
+async def rebuild() -> dict:
+    """
+    Reconcile every counter in a single transaction.
+
+    Returns:
+        dict: The number of corrected rows per table name.
+    """
+    async with SessionLocal() as db:
+        corrected = await rebuild_recipe_counts(db)
+        await db.commit()
+    await engine.dispose()
+    return corrected
+
+
+def main(argv=None):
+    """
+    Entry point of the rebuild_recipe_counts command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments; defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Recompute the recipe counts of categories and ingredients.")
+    parser.parse_args(argv)
+
+    for table, corrected in asyncio.run(rebuild()).items():
+        print(f"{table}: {corrected} count(s) corrected")
+
+
+if __name__ == "__main__":
+    main()
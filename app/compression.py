@@ -0,0 +1,252 @@
+"""
+Negotiated response compression (zstd or gzip) with a cache of compressed bodies.
+
+Recipe, ingredient and category payloads are mostly JSON and base64 image text, which compress
+several times over. ``CompressionMiddleware`` picks an encoding from the request's
+Accept-Encoding (zstd, through the ``zstandard`` package, when the client accepts it,
+otherwise gzip) and compresses JSON and text responses of at least COMPRESSION_MIN_SIZE bytes.
+Streamed responses are compressed chunk by chunk, flushing after each one, so they stay streamed.
+
+Compressed bodies of cacheable responses (those with an ETag or served through the response
+cache) are kept in an LRU keyed by encoding and a digest of the uncompressed body, so a popular
+payload is compressed once rather than on every request. Hashing a body costs a fraction of
+compressing it.
+
+A compressed response no longer has the bytes its strong ETag promised, so the ETag is sent as
+weak (``W/"..."``); If-None-Match uses weak comparison, so revalidation keeps working.
+"""
+
+import gzip
+import hashlib
+import zlib
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import TTLCache
+from app.config import settings
+from app.metrics import metrics
+
+try:
+    import zstandard
+except ImportError:  # Installs without zstandard (see requirements.txt) only offer gzip.
+    zstandard = None
+
+# Media types worth compressing; images and other binary formats are already compressed.
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "image/svg+xml", "text/"
+)
+
+# Bodies from this size are compressed in the threadpool rather than on the event loop.
+THREAD_THRESHOLD = 256 * 1024
+
+# Statuses whose body must not be compressed: none, or a byte range of the identity body.
+UNCOMPRESSED_STATUSES = (204, 206, 304)
+
+compressed_responses = metrics.counter("http_compressed_responses_total", "Responses sent compressed")
+bytes_in = metrics.counter("http_compression_bytes_in_total", "Body bytes before compression")
+bytes_out = metrics.counter("http_compression_bytes_out_total", "Body bytes after compression")
+
+
+def available_encodings() -> tuple:
+    """
+    List the content codings the server can produce, in order of preference.
+
+    Returns:
+        tuple: "zstd" (when zstandard is installed) and "gzip".
+    """
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Choose the content coding of a response from the request's Accept-Encoding.
+
+    Args:
+        accept_encoding (str): The header value, e.g. "gzip, deflate, br, zstd" or "gzip;q=0.5, *;q=0".
+
+    Returns:
+        Optional[str]: The accepted coding with the highest q-value, preferring zstd on ties, or
+            None to send the body as it is.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.strip().partition(";")
+        weight = 1.0
+        name, _, value = parameters.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        if coding:
+            weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for coding in available_encodings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a whole body.
+
+    Args:
+        body (bytes): The uncompressed body.
+        encoding (str): "zstd" or "gzip".
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for streamed bodies, flushing after each chunk so the client can
+    decode everything sent so far.
+    """
+
+    def __init__(self, encoding: str):
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            # wbits 16 + MAX_WBITS produces the gzip container.
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Compress one chunk of the body.
+
+        Args:
+            chunk (bytes): The next uncompressed bytes.
+
+        Returns:
+            bytes: Compressed bytes decodable up to the end of the chunk.
+        """
+        return self._compressor.compress(chunk) + self._compressor.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        """
+        End the compressed stream.
+
+        Returns:
+            bytes: The remaining compressed bytes and the stream trailer.
+        """
+        return self._compressor.flush()
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the coding negotiated from Accept-Encoding.
+
+    Add it outside the response cache, so the cache keeps a single uncompressed copy of each
+    response whatever the encodings clients accept.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, cache: Optional[TTLCache] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.cache = cache if cache is not None else compressed_bodies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+
+        start: Optional[Message] = None
+        streamer: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, streamer, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                compressible = message["status"] not in UNCOMPRESSED_STATUSES and _is_compressible(headers)
+                if compressible:
+                    headers.add_vary_header("Accept-Encoding")
+                if not compressible or encoding is None:
+                    passthrough = True
+                    await send({**message, "headers": headers.raw})
+                    return
+                # Hold the start until the first body message tells whether and how to compress.
+                start = {**message, "headers": headers.raw}
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start["headers"])
+            if streamer is None and not more_body:
+                # The whole body in one message.
+                passthrough = True
+                if len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    return
+                compressed = await self._compress_body(body, encoding, headers)
+                self._mark_compressed(headers, encoding)
+                headers["content-length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if streamer is None:
+                streamer = StreamCompressor(encoding)
+                self._mark_compressed(headers, encoding)
+                del headers["content-length"]
+                await send(start)
+            bytes_in.inc(len(body))
+            chunk = streamer.compress(body) if body else b""
+            if not more_body:
+                chunk += streamer.finish()
+            bytes_out.inc(len(chunk))
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress_body(self, body: bytes, encoding: str, headers: MutableHeaders) -> bytes:
+        # Only responses meant to be reused are cached; others would just churn the LRU.
+        cacheable = "etag" in headers or "x-cache" in headers
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest()) if cacheable else None
+        compressed = self.cache.get(key) if key is not None else None
+        if compressed is None:
+            if len(body) >= THREAD_THRESHOLD:
+                compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            if key is not None:
+                self.cache.set(key, compressed)
+        bytes_in.inc(len(body))
+        bytes_out.inc(len(compressed))
+        return compressed
+
+    @staticmethod
+    def _mark_compressed(headers: MutableHeaders, encoding: str) -> None:
+        compressed_responses.inc()
+        headers["content-encoding"] = encoding
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+
+# Global cache of compressed bodies used by CompressionMiddleware.
+compressed_bodies = TTLCache(
+    settings.COMPRESSION_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS, name="compressed_body"
+)
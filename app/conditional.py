@@ -0,0 +1,139 @@
+"""
+HTTP conditional GET (ETag / If-None-Match and Last-Modified / If-Modified-Since).
+
+A client that keeps a response can send back its validators to ask whether it is still current;
+if it is, the answer is an empty ``304 Not Modified`` instead of the full payload, base64 images
+included.
+
+The validators are derived from the ``version`` and ``updated_at`` columns of the rows a response
+is built from (see app.models.base.Versioned), read by a small query, so the handler decides on
+the 304 before loading the response's data or serializing anything:
+
+    validator = Validator.for_request(request, state, last_modified)
+    if validator.matches(request):
+        return validator.not_modified()
+    ...
+    return validator.apply(render_item(...))
+
+The ETag hashes the request path and query string with the state, since ``?fields=``, ``?size=``
+and the pagination parameters change the body. It is a strong ETag: the same state and request
+always produce the same bytes.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request, Response, status
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, with the weak comparison GET requests use.
+
+    Args:
+        if_none_match (str): The header value: ``*`` or a comma-separated list of entity tags.
+        etag (str): The current entity tag, quotes included.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+@dataclass(frozen=True)
+class Validator:
+    """
+    The validators of one response.
+
+    Attributes:
+        etag (str): The strong entity tag, quotes included.
+        last_modified (Optional[datetime]): Naive UTC time of the last change to the response's
+            rows, if known.
+    """
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def for_request(cls, request: Request, state: Any, last_modified: Optional[datetime] = None) -> "Validator":
+        """
+        Build the validators of the response to a request.
+
+        Args:
+            request (Request): The request being answered.
+            state (Any): A value with a stable ``repr`` that changes whenever the data the response
+                is built from changes, typically ids and versions of its rows.
+            last_modified (Optional[datetime]): Naive UTC time of the latest change among those rows.
+
+        Returns:
+            Validator: The validators.
+        """
+        query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+        digest = hashlib.blake2b(repr((request.url.path, query, state)).encode(), digest_size=16).hexdigest()
+        return cls(f'"{digest}"', last_modified)
+
+    def headers(self) -> Dict[str, str]:
+        """
+        Build the response headers carrying the validators.
+
+        Returns:
+            Dict[str, str]: The ETag and Last-Modified headers, and a Cache-Control asking clients
+                to revalidate before reusing their copy.
+        """
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(tzinfo=UTC), usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """
+        Check whether the client's cached copy is current.
+
+        If-None-Match takes precedence; If-Modified-Since is only considered without it, at the
+        one-second resolution of HTTP dates.
+
+        Args:
+            request (Request): The conditional request.
+
+        Returns:
+            bool: True if a 304 should be sent.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return self.last_modified.replace(microsecond=0, tzinfo=UTC) <= since
+
+    def not_modified(self) -> Response:
+        """
+        Answer a request whose cached copy is current.
+
+        Returns:
+            Response: An empty 304 response carrying the validators.
+        """
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+    def apply(self, response: Response) -> Response:
+        """
+        Add the validators to a full response.
+
+        Args:
+            response (Response): The 200 response.
+
+        Returns:
+            Response: The same response.
+        """
+        response.headers.update(self.headers())
+        return response
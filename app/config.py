@@ -1,4 +1,6 @@
 import os
+from typing import Optional
+
 from dotenv import load_dotenv
 from pydantic.v1 import BaseSettings
 
@@ -18,9 +20,45 @@ class Settings(BaseSettings):
         DATABASE (str): The name of the database, read from the environment variable "DB_NAME".
         DB_USERNAME (str): The database username, read from the environment variable "DB_USERNAME".
         DB_PASSWORD (str): The database password, read from the environment variable "DB_PASSWORD".
+        DB_ODBC_DRIVER (str): The ODBC driver used to reach SQL Server through aioodbc.
+        DATABASE_URL (Optional[str]): A full SQLAlchemy async database URL overriding the SQL Server
+            settings, e.g. "sqlite+aiosqlite:///./dev.db" for local development.
         JWT_SECRET (str): The secret key for JWT token encoding, read from the environment variable "JWT_SECRET".
         JWT_ALGORITHM (str): The algorithm for JWT token encoding, read from the environment variable "JWT_ALGORITHM".
         ACCESS_TOKEN_EXPIRE_MINUTES (int): The expiration time for access tokens (in minutes).
+        DEFAULT_PAGE_SIZE (int): Number of items returned by collection endpoints when no ?limit= is given.
+        MAX_PAGE_SIZE (int): Largest ?limit= accepted by collection endpoints.
+        MAX_BATCH_IDS (int): Largest number of ids accepted by the batch lookup endpoints (?ids=).
+        STREAM_BATCH_SIZE (int): Rows fetched and serialized per batch when a collection is streamed (?stream=).
+        IMAGE_STORE_PATH (str): Directory where uploaded images are stored, keyed by content hash.
+        IMAGE_MAX_BYTES (int): Largest image accepted as base64 data in image_url fields.
+        IMAGE_WORKERS (int): Worker processes rendering thumbnails and placeholders.
+        IMAGE_MAX_PENDING (int): Maximum image derivative jobs queued at once; extra jobs are left to the backfill.
+        SEARCH_INDEX_REFRESH_SECONDS (int): Age after which the in-memory search indexes are rebuilt.
+        AUTOCOMPLETE_MAX_RESULTS (int): Largest ?limit= accepted by the autocomplete endpoints.
+        PASSWORD_HASH_WORKERS (int): Worker processes hashing and verifying passwords; defaults to the CPU count.
+        PASSWORD_HASH_MAX_PENDING (int): Maximum password hash operations queued at once; beyond it requests get a 503.
+        AUTH_CACHE_SIZE (int): Number of decoded tokens, and of user principals, kept in memory.
+        AUTH_CACHE_TTL_SECONDS (int): How long a cached principal may serve requests before it is reloaded.
+        RESPONSE_CACHE_SIZE (int): Number of serialized responses kept by the response cache.
+        RESPONSE_CACHE_TTL_SECONDS (int): Longest time a cached response is served, bounding staleness across processes.
+        IMPORT_CHUNK_SIZE (int): Number of NDJSON lines validated and written per transaction by the bulk import.
+        THREADPOOL_WORKERS (int): Threads running blocking work (sync handlers, run_in_threadpool) at once.
+        DB_POOL_SIZE (int): Database connections kept open in the pool.
+        DB_MAX_OVERFLOW (int): Extra connections opened under load beyond DB_POOL_SIZE. Together they
+            match THREADPOOL_WORKERS, so blocking work done while holding a connection never waits on the pool.
+        DB_POOL_TIMEOUT_SECONDS (float): How long a request waits for a free connection before failing.
+        DB_POOL_RECYCLE_SECONDS (int): Age after which a connection is replaced, before the server or a
+            firewall drops it as idle.
+        DB_POOL_PRE_PING (bool): Whether to test connections on checkout and transparently replace dead ones.
+        DB_MIGRATE_ON_STARTUP (bool): Whether the app applies pending schema migrations when it starts, for
+            development; deployments run ``python -m app.commands.migrate`` instead, and the app does no schema work.
+        COMPRESSION_MIN_SIZE (int): Smallest response body, in bytes, sent compressed to clients accepting it.
+        COMPRESSION_GZIP_LEVEL (int): gzip compression level, from 1 (fastest) to 9 (smallest).
+        COMPRESSION_ZSTD_LEVEL (int): zstd compression level, from 1 (fastest) to 22 (smallest).
+        COMPRESSION_CACHE_SIZE (int): Number of compressed bodies of cacheable responses kept in memory.
+        SLOW_QUERY_SECONDS (float): Duration from which a SQL statement is logged as slow, with its route.
+        N_PLUS_ONE_THRESHOLD (int): Executions of the same statement within one request flagged as a probable N+1.
 
     Example:
         You can instantiate the settings and access configuration values as follows:
@@ -32,11 +70,53 @@ class Settings(BaseSettings):
     DATABASE: str = os.getenv("DB_NAME")
     DB_USERNAME: str = os.getenv("DB_USERNAME")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD")
+    DB_ODBC_DRIVER: str = os.getenv("DB_ODBC_DRIVER", "ODBC Driver 18 for SQL Server")
+    DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
 
     JWT_SECRET: str = os.getenv("JWT_SECRET")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    STREAM_BATCH_SIZE: int = 200
+    MAX_BATCH_IDS: int = 500
+
+    IMAGE_STORE_PATH: str = "media/images"
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_PENDING: int = 64
+
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+    AUTOCOMPLETE_MAX_RESULTS: int = 50
+
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    IMPORT_CHUNK_SIZE: int = 500
+
+    THREADPOOL_WORKERS: int = 40
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_MIGRATE_ON_STARTUP: bool = False
+
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_SIZE: int = 256
+
+    SLOW_QUERY_SECONDS: float = 0.2
+    N_PLUS_ONE_THRESHOLD: int = 5
+
 
 # Creating a global settings instance which will be used throughout the app.
 settings = Settings()
@@ -0,0 +1,116 @@
+"""
+Database connection pool configuration and metrics.
+
+The pool is sized from the DB_POOL_* settings rather than SQLAlchemy's defaults (5 connections
+plus 10 overflow, no pre-ping, no recycling). Its state is published in the metrics registry so
+the service can be sized from data:
+
+  - ``db_pool_checkout_seconds``: time requests waited for a connection,
+  - ``db_pool_checkout_timeouts_total``: checkouts that gave up after DB_POOL_TIMEOUT_SECONDS,
+  - ``db_pool_checked_out``: connections in use,
+  - ``db_pool_connections``: connections open, idle or in use,
+  - ``db_pool_overflow``: open connections beyond DB_POOL_SIZE.
+
+A checkout wait above zero, or a non-zero overflow, means requests are queueing on the pool.
+"""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.metrics import metrics
+
+# Buckets of the checkout wait histogram, in seconds: most checkouts should not wait at all.
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+checkout_wait = metrics.histogram(
+    "db_pool_checkout_seconds", "Time waited for a database connection from the pool", CHECKOUT_BUCKETS
+)
+checkout_timeouts = metrics.counter(
+    "db_pool_checkout_timeouts_total", "Connection checkouts that timed out waiting for the pool"
+)
+checked_out = metrics.gauge("db_pool_checked_out", "Database connections in use")
+connections = metrics.gauge("db_pool_connections", "Database connections open, idle or in use")
+overflow = metrics.gauge("db_pool_overflow", "Open database connections beyond DB_POOL_SIZE")
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool for async engines that times every checkout.
+
+    Pool events only fire once a connection is handed out, so the wait before it is measured
+    around the pool's own checkout instead.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            checkout_timeouts.inc()
+            raise
+        finally:
+            checkout_wait.observe(time.perf_counter() - started)
+
+
+def _count_connect(dbapi_connection, connection_record) -> None:
+    connections.inc()
+    overflow.set(max(0, connections.value - settings.DB_POOL_SIZE))
+
+
+def _count_close(dbapi_connection, connection_record) -> None:
+    connections.dec()
+    overflow.set(max(0, connections.value - settings.DB_POOL_SIZE))
+
+
+def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    checked_out.inc()
+
+
+def _count_checkin(dbapi_connection, connection_record) -> None:
+    checked_out.dec()
+
+
+def observe_pool(engine: AsyncEngine) -> None:
+    """
+    Publish the connection counts of an engine's pool through pool events.
+
+    The listeners are registered on the engine, so they carry over to the new pool created when
+    the engine is disposed.
+
+    Args:
+        engine (AsyncEngine): The engine whose pool to observe.
+    """
+    event.listen(engine.sync_engine, "connect", _count_connect)
+    event.listen(engine.sync_engine, "close", _count_close)
+    event.listen(engine.sync_engine, "checkout", _count_checkout)
+    event.listen(engine.sync_engine, "checkin", _count_checkin)
+
+
+def pool_options(url: URL) -> dict:
+    """
+    Build the connection pool arguments of create_async_engine for a database URL.
+
+    Args:
+        url (URL): The database URL.
+
+    Returns:
+        dict: Keyword arguments selecting and sizing the pool from the DB_POOL_* settings. Empty
+            for an in-memory SQLite database, which lives in a single connection and keeps
+            SQLAlchemy's StaticPool.
+    """
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
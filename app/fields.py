@@ -0,0 +1,125 @@
+"""
+Sparse fieldsets (``?fields=``) for read endpoints.
+
+A client that only needs a few attributes of each item, e.g. ``?fields=id,title`` for a list view,
+should not pay for loading and serializing large ``NVARCHAR(MAX)`` columns such as ``description``
+and ``image_url``. The requested field names are mapped to ``load_only`` so unrequested columns are
+never SELECTed, unrequested relationships are not eagerly loaded, and the response is serialized
+with a trimmed copy of the response schema containing only the requested fields.
+"""
+
+from functools import lru_cache
+from typing import Callable, FrozenSet, Optional, Type
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+
+
+@lru_cache(maxsize=None)
+def trimmed_schema(schema: Type[BaseModel], names: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    Build (once per distinct selection) a copy of a response schema restricted to some fields.
+
+    Args:
+        schema (Type[BaseModel]): The full response schema, e.g. RecipeResponse.
+        names (FrozenSet[str]): The field names to keep.
+
+    Returns:
+        Type[BaseModel]: A schema with only the selected fields, validating from attributes.
+    """
+    definitions = {
+        name: (field.annotation, field)
+        for name, field in schema.model_fields.items()
+        if name in names
+    }
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
+class FieldSet:
+    """
+    A validated ``?fields=`` selection for one resource.
+
+    Attributes:
+        schema (Type[BaseModel]): The full response schema of the resource.
+        model: The SQLAlchemy mapped class the resource is loaded from.
+        names (FrozenSet[str]): The selected field names, always including the primary key.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model, names: FrozenSet[str]):
+        self.schema = schema
+        self.model = model
+        self.names = names
+
+    def includes(self, name: str) -> bool:
+        """
+        Check whether a field (typically a relationship) was selected.
+
+        Args:
+            name (str): The field name.
+
+        Returns:
+            bool: True if the field is part of the selection.
+        """
+        return name in self.names
+
+    def load_options(self) -> tuple:
+        """
+        Build the loader option restricting the SELECT to the selected columns.
+
+        Returns:
+            tuple: A ``load_only`` option for the selected column attributes of the model.
+        """
+        columns = sa_inspect(self.model).column_attrs.keys()
+        return (load_only(*[getattr(self.model, name) for name in self.names if name in columns]),)
+
+    def apply(self, statement):
+        """
+        Apply the column restriction to a select over the model.
+
+        Args:
+            statement (Select): A select whose primary entity is the model.
+
+        Returns:
+            Select: The statement with ``load_only`` applied.
+        """
+        return statement.options(*self.load_options())
+
+
+def sparse_fields(schema: Type[BaseModel], model) -> Callable[..., Optional[FieldSet]]:
+    """
+    Create a dependency that parses ``?fields=`` for a resource.
+
+    Args:
+        schema (Type[BaseModel]): The full response schema of the resource.
+        model: The SQLAlchemy mapped class the resource is loaded from.
+
+    Returns:
+        Callable: A FastAPI dependency returning a FieldSet, or None when ``?fields=`` is absent.
+    """
+    allowed = tuple(schema.model_fields)
+    primary_keys = frozenset(column.key for column in sa_inspect(model).primary_key)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of: {', '.join(allowed)}"
+        )
+    ) -> Optional[FieldSet]:
+        if fields is None:
+            return None
+        names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+        unknown = sorted(names.difference(allowed))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+        return FieldSet(schema, model, names | primary_keys.intersection(allowed))
+
+    return dependency
@@ -0,0 +1,2 @@
+from app.images.store import ImageStore, image_store, ingest_image_value, image_reference, parse_image_reference
+from app.images.derivatives import ImageSize, derivative_pipeline, schedule_derivatives, variant_url
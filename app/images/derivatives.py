@@ -0,0 +1,216 @@
+"""
+Thumbnail and placeholder derivatives of stored images.
+
+When an image enters the image store, a background pipeline renders a few downscaled JPEG variants
+plus a tiny blurred placeholder (a low-quality image placeholder, a few hundred bytes) that clients
+can show while the real image loads. Decoding and resizing is CPU-bound, so it runs in a bounded
+process pool instead of the request path; if the pool is saturated the job is dropped and left to
+the backfill command.
+
+Clients pick a variant with ``?size=`` on recipe, category and ingredient read endpoints, which
+rewrites ``image_url`` values to the variant URL. The rewrite does not look at the store, so a
+response depends only on the database and its ETag and cached copy stay valid once the variant is
+rendered; until then the variant URL redirects to the original image (see app.routers.images).
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.images.store import ImageStore, image_reference, image_store, parse_image_reference
+
+logger = logging.getLogger(__name__)
+
+# Longest side, in pixels, of each downscaled variant.
+VARIANT_SIZES = {
+    "thumb": 128,
+    "small": 320,
+    "medium": 640,
+}
+
+# Longest side of the blurred placeholder; it is meant to be stretched by the client.
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER = "placeholder"
+
+
+class ImageSize(str, Enum):
+    """
+    Image variants selectable with ``?size=`` on read endpoints.
+    """
+    thumb = "thumb"
+    small = "small"
+    medium = "medium"
+    placeholder = PLACEHOLDER
+
+
+def render_variants(root: str, digest: str) -> List[str]:
+    """
+    Render every missing variant of a stored image.
+
+    This runs inside a worker process, so it takes plain, picklable arguments and builds its own
+    ImageStore.
+
+    Args:
+        root (str): The image store directory.
+        digest (str): The hexadecimal SHA-256 digest of the original image.
+
+    Returns:
+        List[str]: The names of the variants that were rendered.
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    store = ImageStore(root)
+    wanted = [name for name in (*VARIANT_SIZES, PLACEHOLDER) if not os.path.isfile(store.variant_path(digest, name))]
+    if not wanted:
+        return []
+
+    with Image.open(store.path_for(digest)) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    for name in wanted:
+        variant = image.copy()
+        buffer = BytesIO()
+        if name == PLACEHOLDER:
+            variant.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            variant = variant.filter(ImageFilter.GaussianBlur(1))
+            variant.save(buffer, "JPEG", quality=50)
+        else:
+            variant.thumbnail((VARIANT_SIZES[name], VARIANT_SIZES[name]))
+            variant.save(buffer, "JPEG", quality=80, optimize=True, progressive=True)
+        store.put_variant(digest, name, buffer.getvalue())
+    return wanted
+
+
+class DerivativePipeline:
+    """
+    Bounded process pool rendering image variants off the request path.
+
+    At most ``max_pending`` jobs are queued or running at once; further submissions are dropped
+    (and logged) instead of piling up memory, and the backfill command catches them up later.
+    The pool uses the "spawn" start method so worker processes never inherit the server's threads
+    or open database connections.
+
+    Attributes:
+        store (ImageStore): The image store holding originals and variants.
+        max_workers (int): Number of worker processes.
+        max_pending (int): Maximum number of jobs queued or running at once.
+    """
+
+    def __init__(self, store: ImageStore, max_workers: int, max_pending: int):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(self, digest: str) -> bool:
+        """
+        Queue the rendering of the variants of an image.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the original image.
+
+        Returns:
+            bool: True if the job was queued (or is already queued), False if the pool is saturated.
+        """
+        with self._lock:
+            if digest in self._pending:
+                return True
+            if len(self._pending) >= self.max_pending:
+                logger.warning("Image derivative queue full, skipping %s", digest)
+                return False
+            future = self._get_executor().submit(render_variants, self.store.root, digest)
+            self._pending[digest] = future
+        future.add_done_callback(lambda done: self._finished(digest, done))
+        return True
+
+    def _finished(self, digest: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(digest, None)
+        if future.exception() is not None:
+            logger.error("Rendering variants of image %s failed", digest, exc_info=future.exception())
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, waiting for running jobs to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def schedule_derivatives(image_url: Optional[str]) -> None:
+    """
+    Queue variant rendering for the image referenced by an image_url value, if any.
+
+    Args:
+        image_url (Optional[str]): The value stored in an image_url column.
+    """
+    digest = parse_image_reference(image_url)
+    if digest:
+        derivative_pipeline.submit(digest)
+
+
+def variant_url(image_url: Optional[str], size: ImageSize) -> Optional[str]:
+    """
+    Rewrite an image_url value to point at the requested variant.
+
+    Values that are not image references are returned unchanged. Image references get the
+    variant URL whether or not the variant is rendered yet: it redirects to the original image
+    until it is.
+
+    Args:
+        image_url (Optional[str]): The value stored in an image_url column.
+        size (ImageSize): The requested variant.
+
+    Returns:
+        Optional[str]: The variant URL, or the original value.
+    """
+    digest = parse_image_reference(image_url)
+    if digest is None:
+        return image_url
+    return f"{image_reference(digest)}?size={size.value}"
+
+
+def rewrite_image_urls(data, size: ImageSize):
+    """
+    Rewrite, in place, every ``image_url`` found in serialized response data.
+
+    Args:
+        data: JSON-compatible response data (dicts and lists), including nested objects such as
+            a recipe's categories and ingredients.
+        size (ImageSize): The requested variant.
+
+    Returns:
+        The same data object, for convenience.
+    """
+    if isinstance(data, list):
+        for item in data:
+            rewrite_image_urls(item, size)
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if key == "image_url":
+                data[key] = variant_url(value, size)
+            elif isinstance(value, (dict, list)):
+                rewrite_image_urls(value, size)
+    return data
+
+
+# Global pipeline used by the create endpoints.
+derivative_pipeline = DerivativePipeline(image_store, settings.IMAGE_WORKERS, settings.IMAGE_MAX_PENDING)
@@ -0,0 +1,259 @@
+"""
+Content-addressed storage for recipe, category and ingredient images.
+
+Images used to be stored inline as base64 text in the ``image_url`` columns, so every list
+response carried whole JPEGs. Image bytes now live once on local disk under the SHA-256 of their
+content, and the columns hold a short reference of the form ``/images/<sha256>`` that is served by
+the images router. Identical images uploaded several times are stored only once.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+
+from app.config import settings
+
+# Prefix of the image references stored in the image_url columns.
+IMAGE_URL_PREFIX = "/images/"
+
+# A SHA-256 digest in lowercase hexadecimal, as used for file names and references.
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Leading bytes of the image formats we expect, mapped to their media type.
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def detect_media_type(head: bytes) -> Optional[str]:
+    """
+    Detect the media type of image bytes from their leading bytes.
+
+    Args:
+        head (bytes): At least the first 12 bytes of the image.
+
+    Returns:
+        Optional[str]: The media type, or None if the bytes are not a JPEG, PNG, GIF or WebP image.
+    """
+    for signature, media_type in _SIGNATURES:
+        if head.startswith(signature):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class ImageStore:
+    """
+    Stores image bytes on local disk, keyed by the SHA-256 of their content.
+
+    Files are sharded into two directory levels taken from the digest (``ab/cd/abcd...``) so no
+    single directory grows too large. Writes go to a temporary file that is atomically renamed into
+    place, so concurrent uploads of the same image are safe and readers never see partial files.
+
+    Attributes:
+        root (str): The directory holding the stored images.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, digest: str) -> str:
+        """
+        Return the file path where the image with the given digest is (or would be) stored.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the image.
+
+        Returns:
+            str: The absolute path of the image file.
+        """
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def variant_path(self, digest: str, variant: str) -> str:
+        """
+        Return the file path of a derived variant (thumbnail, placeholder...) of a stored image.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the original image.
+            variant (str): The variant name, e.g. "thumb".
+
+        Returns:
+            str: The absolute path of the variant file, stored next to the original.
+        """
+        return f"{self.path_for(digest)}.{variant}"
+
+    def exists(self, digest: str) -> bool:
+        """
+        Check whether an image with the given digest is stored.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the image.
+
+        Returns:
+            bool: True if the image file exists.
+        """
+        return os.path.isfile(self.path_for(digest))
+
+    def put(self, data: bytes) -> str:
+        """
+        Store image bytes, skipping the write if identical content is already stored.
+
+        Args:
+            data (bytes): The raw image bytes.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest identifying the stored image.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if not os.path.isfile(path):
+            write_atomic(path, data)
+        return digest
+
+    def put_variant(self, digest: str, variant: str, data: bytes) -> None:
+        """
+        Store the bytes of a derived variant of an image.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the original image.
+            variant (str): The variant name, e.g. "thumb".
+            data (bytes): The encoded variant image.
+        """
+        write_atomic(self.variant_path(digest, variant), data)
+
+    def media_type(self, digest: str) -> str:
+        """
+        Detect the media type of a stored image from its leading bytes.
+
+        Args:
+            digest (str): The hexadecimal SHA-256 digest of the image.
+
+        Returns:
+            str: The detected media type, or "application/octet-stream" if unknown.
+        """
+        with open(self.path_for(digest), "rb") as image_file:
+            head = image_file.read(12)
+        return detect_media_type(head) or "application/octet-stream"
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file so that readers see either nothing or the complete content.
+
+    Args:
+        path (str): The destination path; missing parent directories are created.
+        data (bytes): The bytes to write.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def image_reference(digest: str) -> str:
+    """
+    Build the value stored in an image_url column for a stored image.
+
+    Args:
+        digest (str): The hexadecimal SHA-256 digest of the image.
+
+    Returns:
+        str: The image reference, e.g. "/images/3a7bd3...".
+    """
+    return f"{IMAGE_URL_PREFIX}{digest}"
+
+
+def parse_image_reference(value: Optional[str]) -> Optional[str]:
+    """
+    Extract the digest from an image reference.
+
+    Args:
+        value (Optional[str]): A value read from an image_url column.
+
+    Returns:
+        Optional[str]: The digest if the value is an image reference, otherwise None.
+    """
+    if value and value.startswith(IMAGE_URL_PREFIX):
+        digest = value[len(IMAGE_URL_PREFIX):]
+        if DIGEST_PATTERN.match(digest):
+            return digest
+    return None
+
+
+def _base64_payload(value: str) -> str:
+    # The base64 part of image data, given bare or as a data: URI.
+    if value.startswith("data:") and "," in value:
+        return value.split(",", 1)[1]
+    return value
+
+
+def check_image_value(value: Optional[str]) -> Optional[str]:
+    """
+    Validate the size of an image_url value supplied by a client, before it is decoded.
+
+    Used as a pydantic validator of the create schemas, so oversized image data is answered with
+    a 422 (or rejected as a line of a bulk import) without being decoded.
+
+    Args:
+        value (Optional[str]): The image_url value.
+
+    Raises:
+        ValueError: If the value is longer than the base64 encoding of IMAGE_MAX_BYTES bytes.
+
+    Returns:
+        Optional[str]: The value, unchanged.
+    """
+    if value and len(value) > settings.IMAGE_MAX_BYTES:
+        encoded = "".join(_base64_payload(value).split())
+        if len(encoded) * 3 // 4 - encoded[-2:].count("=") > settings.IMAGE_MAX_BYTES:
+            raise ValueError(f"image data exceeds {settings.IMAGE_MAX_BYTES} bytes")
+    return value
+
+
+def ingest_image_value(value: Optional[str], store: Optional[ImageStore] = None) -> Optional[str]:
+    """
+    Turn an image_url value supplied by a client into what should be stored in the database.
+
+    Base64 image data (optionally as a ``data:`` URI) is decoded, written to the image store and
+    replaced by a short image reference. Empty values, existing image references, http(s) URLs,
+    anything that is not valid base64, and decoded data that is not a JPEG, PNG, GIF or WebP image
+    of at most IMAGE_MAX_BYTES bytes are returned unchanged.
+
+    Args:
+        value (Optional[str]): The image_url value to ingest.
+        store (Optional[ImageStore]): The store to write to; defaults to the global image_store.
+
+    Returns:
+        Optional[str]: The value to persist in the image_url column.
+    """
+    if not value or parse_image_reference(value) or value.startswith(("http://", "https://")):
+        return value
+
+    try:
+        data = base64.b64decode("".join(_base64_payload(value).split()), validate=True)
+    except (binascii.Error, ValueError):
+        return value
+    if not data or len(data) > settings.IMAGE_MAX_BYTES or detect_media_type(data[:12]) is None:
+        return value
+
+    digest = (store or image_store).put(data)
+    return image_reference(digest)
+
+
+# Global image store used by the API and the maintenance commands.
+image_store = ImageStore(settings.IMAGE_STORE_PATH)
@@ -0,0 +1,237 @@
+"""
+In-process metrics registry.
+
+A small set of thread-safe instruments (counters, gauges and histograms) that components register
+by name and update as they work. ``GET /metrics`` returns a JSON snapshot of every registered
+instrument. Values live in the memory of one server process, so with several workers each one
+reports its own figures.
+"""
+
+import bisect
+import threading
+from typing import Dict, Sequence
+
+# Default histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """
+    A value that only goes up, e.g. the number of rejected requests.
+
+    Attributes:
+        name (str): The metric name.
+        description (str): What the metric counts.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount (int): How much to add. Defaults to 1.
+        """
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {"type": "counter", "description": self.description, "value": self._value}
+
+
+class Gauge:
+    """
+    A value that goes up and down, e.g. the number of queued jobs.
+
+    Attributes:
+        name (str): The metric name.
+        description (str): What the metric measures.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value) -> None:
+        """
+        Replace the current value.
+
+        Args:
+            value: The new value.
+        """
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount=1) -> None:
+        """
+        Increase the current value.
+
+        Args:
+            amount: How much to add. Defaults to 1.
+        """
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1) -> None:
+        """
+        Decrease the current value.
+
+        Args:
+            amount: How much to subtract. Defaults to 1.
+        """
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {"type": "gauge", "description": self.description, "value": self._value}
+
+
+class Histogram:
+    """
+    A distribution of observed values, e.g. operation latencies in seconds.
+
+    Observations are counted into fixed buckets, so memory stays constant no matter how many values
+    are recorded; the snapshot reports cumulative bucket counts along with count, sum and max.
+
+    Attributes:
+        name (str): The metric name.
+        description (str): What the observed values are.
+        buckets (Sequence[float]): Ascending bucket upper bounds.
+    """
+
+    def __init__(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket plus a final overflow slot for values above the last bound.
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one value.
+
+        Args:
+            value (float): The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self._count, self._sum, self._max
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {
+            "type": "histogram",
+            "description": self.description,
+            "count": count,
+            "sum": total,
+            "max": maximum,
+            "buckets": cumulative,
+        }
+
+
+class MetricsRegistry:
+    """
+    Named collection of instruments.
+
+    Asking for an instrument that already exists returns the existing one, so modules can declare
+    their metrics at import time without coordinating with each other.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, kind, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(name, *args, **kwargs)
+            elif not isinstance(metric, kind):
+                raise ValueError(f"Metric {name!r} is already registered as a {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """
+        Get or register a counter.
+
+        Args:
+            name (str): The metric name.
+            description (str): What the metric counts.
+
+        Returns:
+            Counter: The counter registered under ``name``.
+        """
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """
+        Get or register a gauge.
+
+        Args:
+            name (str): The metric name.
+            description (str): What the metric measures.
+
+        Returns:
+            Gauge: The gauge registered under ``name``.
+        """
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Get or register a histogram.
+
+        Args:
+            name (str): The metric name.
+            description (str): What the observed values are.
+            buckets (Sequence[float]): Ascending bucket upper bounds, used only on registration.
+
+        Returns:
+            Histogram: The histogram registered under ``name``.
+        """
+        return self._get_or_create(Histogram, name, description, buckets)
+
+    def snapshot(self) -> dict:
+        """
+        Read every registered instrument.
+
+        Returns:
+            dict: A mapping from metric name to its current values, sorted by name.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+
+
+# Global registry shared by the whole application.
+metrics = MetricsRegistry()
@@ -0,0 +1,174 @@
+"""
+Versioned schema migrations.
+
+The schema is not created from the models when the app starts: ``create_all`` reflects every
+table on each boot, and never alters a table that already exists, so columns and indexes added
+to the models never reached databases created earlier. Each schema change is instead a script in
+app/migrations/versions, named ``v<NNNN>_<name>.py`` and exposing ``upgrade(connection)``, and
+the pending ones are applied in version order as a deploy step, before the new code starts:
+
+    python -m app.commands.migrate
+
+The versions applied are recorded in the ``schema_migrations`` table, so each script runs once
+per database, and all pending scripts run in a single transaction. Scripts only add to the schema
+and skip what already exists, so a database created by an earlier ``create_all`` or by
+SQL/TableCreation.sql is adopted by simply running them.
+
+Scripts must not import the models: a script describes the schema as of its version, while the
+models describe the latest one. Helpers for the usual operations are in app.migrations.operations.
+"""
+
+import importlib
+import logging
+import pkgutil
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.migrations import versions
+from app.models import Base
+from app.models.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Module name of a migration script: its version and a short name.
+SCRIPT_NAME = re.compile(r"v(\d+)_(\w+)")
+
+migrations_table = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class MigrationError(Exception):
+    """
+    Raised when the migration scripts are inconsistent, e.g. two scripts share a version.
+    """
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One versioned schema change.
+
+    Attributes:
+        version (int): Position of the migration in the sequence, from the script name.
+        name (str): The rest of the script name, e.g. "foreign_key_indexes".
+        description (str): First line of the script's docstring.
+        upgrade (Callable[[Connection], None]): Applies the change within the caller's transaction.
+    """
+    version: int
+    name: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    """
+    Load the migration scripts of app/migrations/versions.
+
+    Raises:
+        MigrationError: If two scripts have the same version.
+
+    Returns:
+        List[Migration]: Every migration, in version order.
+    """
+    migrations = {}
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        match = SCRIPT_NAME.fullmatch(module_info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        version = int(match[1])
+        if version in migrations:
+            raise MigrationError(f"Migrations {migrations[version].name} and {match[2]} share version {version}")
+        description = (module.__doc__ or "").strip().partition("\n")[0]
+        migrations[version] = Migration(version, match[2], description, module.upgrade)
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def applied_versions(connection: Connection) -> set:
+    """
+    Read the versions already applied to the database.
+
+    Args:
+        connection (Connection): A connection to the database.
+
+    Returns:
+        set: The applied versions; empty for a database never migrated.
+    """
+    if not inspect(connection).has_table(migrations_table.name):
+        return set()
+    return set(connection.scalars(select(migrations_table.c.version)))
+
+
+def pending_migrations(connection: Connection) -> List[Migration]:
+    """
+    List the migrations not yet applied to the database.
+
+    Args:
+        connection (Connection): A connection to the database.
+
+    Returns:
+        List[Migration]: The pending migrations, in version order.
+    """
+    applied = applied_versions(connection)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def upgrade(connection: Connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply the pending migrations, up to ``target`` if given, within the connection's transaction.
+
+    Args:
+        connection (Connection): A connection with a transaction begun; the caller commits.
+        target (Optional[int]): The last version to apply; all of them by default.
+
+    Returns:
+        List[Migration]: The migrations applied, in order.
+    """
+    migrations_table.create(connection, checkfirst=True)
+    applied = []
+    for migration in pending_migrations(connection):
+        if target is not None and migration.version > target:
+            break
+        logger.info("Applying migration %04d %s", migration.version, migration.name)
+        migration.upgrade(connection)
+        connection.execute(
+            insert(migrations_table).values(version=migration.version, name=migration.name, applied_at=utcnow())
+        )
+        applied.append(migration)
+    return applied
+
+
+def drop_schema(connection: Connection) -> None:
+    """
+    Drop every table of the models along with the migration history, e.g. to reseed a database.
+
+    Args:
+        connection (Connection): A connection with a transaction begun; the caller commits.
+    """
+    Base.metadata.drop_all(connection)
+    migrations_table.drop(connection, checkfirst=True)
+
+
+async def migrate(engine: AsyncEngine, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply the pending migrations in a single transaction.
+
+    Args:
+        engine (AsyncEngine): The engine of the database to migrate.
+        target (Optional[int]): The last version to apply; all of them by default.
+
+    Returns:
+        List[Migration]: The migrations applied, in order.
+    """
+    async with engine.begin() as connection:
+        return await connection.run_sync(upgrade, target)
@@ -0,0 +1,69 @@
+"""
+Schema operations for migration scripts.
+
+Each operation first checks whether its object already exists and does nothing if so, which lets
+the scripts adopt databases created by ``create_all`` or SQL/TableCreation.sql. Tables are
+described by name and columns only, never through the models.
+"""
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+
+def has_column(connection: Connection, table_name: str, column_name: str) -> bool:
+    """
+    Check whether a table has a column.
+
+    Args:
+        connection (Connection): A connection to the database.
+        table_name (str): The table.
+        column_name (str): The column.
+
+    Returns:
+        bool: True if the column exists.
+    """
+    return any(column["name"] == column_name for column in inspect(connection).get_columns(table_name))
+
+
+def add_column(connection: Connection, table_name: str, column: Column) -> bool:
+    """
+    Add a column to an existing table, unless it is already there.
+
+    A NOT NULL column needs a server default, which fills in the existing rows.
+
+    Args:
+        connection (Connection): A connection with a transaction begun.
+        table_name (str): The table.
+        column (Column): The new column, not attached to any table.
+
+    Returns:
+        bool: True if the column was added.
+    """
+    if has_column(connection, table_name, column.name):
+        return False
+    Table(table_name, MetaData(), column)
+    definition = CreateColumn(column).compile(dialect=connection.dialect)
+    table = connection.dialect.identifier_preparer.quote(table_name)
+    connection.execute(text(f"ALTER TABLE {table} ADD {definition}"))
+    return True
+
+
+def create_index(connection: Connection, name: str, table_name: str, *column_names: str) -> bool:
+    """
+    Create an index, unless one with the same name exists on the table.
+
+    Args:
+        connection (Connection): A connection with a transaction begun.
+        name (str): The index name, ``ix_<table>_<columns>`` by convention.
+        table_name (str): The indexed table.
+        *column_names (str): The indexed columns, in key order.
+
+    Returns:
+        bool: True if the index was created.
+    """
+    if any(index["name"] == name for index in inspect(connection).get_indexes(table_name)):
+        return False
+    table = Table(table_name, MetaData(), *(Column(column_name) for column_name in column_names))
+    Index(name, *(table.c[column_name] for column_name in column_names)).create(connection)
+    return True
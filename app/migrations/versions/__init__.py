@@ -0,0 +1,3 @@
+"""
+Migration scripts, one module per schema version: ``v<NNNN>_<name>.py`` with an ``upgrade(connection)``.
+"""
@@ -0,0 +1,84 @@
+"""
+Create the original tables: users, recipes, categories, ingredients, instructions and links.
+
+The tables are created only where missing, so databases created before migrations existed, by
+``create_all`` or SQL/TableCreation.sql, are taken over as they are.
+"""
+
+from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, ForeignKey, Integer, MetaData, Numeric, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("email", String(255), unique=True, nullable=False),
+    Column("password", String(255), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("created_at", DateTime),
+    Column("last_login", DateTime),
+    Column("is_active", Boolean),
+)
+
+Table(
+    "categories",
+    metadata,
+    Column("category_id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False, unique=True),
+    Column("description", String),
+    Column("image_url", String),
+)
+
+Table(
+    "ingredients",
+    metadata,
+    Column("ingredient_id", Integer, primary_key=True),
+    Column("name", String(255), unique=True, nullable=False),
+    Column("image_url", String),
+)
+
+Table(
+    "recipes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", String),
+    Column("preparation_time", Integer, nullable=False),
+    Column("servings", Integer, nullable=False),
+    Column("difficulty", String(10)),
+    Column("image_url", String),
+    Column("author_id", Integer, ForeignKey("users.user_id", ondelete="CASCADE")),
+    Column("created_at", DateTime),
+    CheckConstraint("difficulty IN ('FACIL', 'MEDIO', 'DIFICIL')", name="valid_difficulty"),
+)
+
+Table(
+    "instructions",
+    metadata,
+    Column("instruction_id", Integer, primary_key=True),
+    Column("recipe_id", Integer, ForeignKey("recipes.id", ondelete="CASCADE")),
+    Column("step_number", Integer, nullable=False),
+    Column("instruction_text", String, nullable=False),
+)
+
+Table(
+    "recipe_categories",
+    metadata,
+    Column("recipe_id", Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("categories.category_id", ondelete="CASCADE"), primary_key=True),
+)
+
+Table(
+    "recipe_ingredients",
+    metadata,
+    Column("recipe_id", Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True),
+    Column("ingredient_id", Integer, ForeignKey("ingredients.ingredient_id", ondelete="CASCADE"), primary_key=True),
+    Column("amount", Numeric(10, 2), nullable=False),
+    Column("unit", String(50), nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
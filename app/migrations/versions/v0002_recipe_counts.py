@@ -0,0 +1,27 @@
+"""
+Add the recipe_count counters of categories and ingredients, with their top-N indexes.
+
+The counters of existing rows are computed from the link tables.
+"""
+
+from sqlalchemy import Column, Integer, column, func, select, table, update
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import add_column, create_index
+
+# (table, key, link table) of each counter.
+COUNTERS = (
+    ("categories", "category_id", "recipe_categories"),
+    ("ingredients", "ingredient_id", "recipe_ingredients"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for table_name, key, link_name in COUNTERS:
+        add_column(connection, table_name, Column("recipe_count", Integer, nullable=False, server_default="0"))
+        create_index(connection, f"ix_{table_name}_recipe_count", table_name, "recipe_count", key)
+
+        counted = table(table_name, column(key), column("recipe_count"))
+        link = table(link_name, column(key))
+        actual = select(func.count()).select_from(link).where(link.c[key] == counted.c[key]).scalar_subquery()
+        connection.execute(update(counted).where(counted.c.recipe_count != actual).values(recipe_count=actual))
@@ -0,0 +1,33 @@
+"""
+Add the version and updated_at columns of recipes, categories and ingredients.
+
+They identify the state of a row for HTTP conditional requests (see app.models.base.Versioned).
+Existing rows start at version 1, updated at the time of the migration.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, column, func, table, text, update
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import add_column
+
+TABLES = ("recipes", "categories", "ingredients")
+
+
+def upgrade(connection: Connection) -> None:
+    sqlite = connection.dialect.name == "sqlite"
+    # updated_at holds UTC. CURRENT_TIMESTAMP is the server's local time on SQL Server, which
+    # would shift Last-Modified by the server's UTC offset; SQLite's is already UTC.
+    now = func.sysutcdatetime() if connection.dialect.name == "mssql" else func.current_timestamp()
+    for table_name in TABLES:
+        add_column(connection, table_name, Column("version", Integer, nullable=False, server_default="1"))
+        if not sqlite:
+            add_column(connection, table_name, Column("updated_at", DateTime, nullable=False, server_default=now))
+            continue
+        # SQLite cannot add a column whose default is not a constant: add it with a fixed default,
+        # then stamp the existing rows. The application always sets updated_at on insert.
+        if add_column(
+                connection, table_name,
+                Column("updated_at", DateTime, nullable=False, server_default=text("'1970-01-01 00:00:00'"))
+        ):
+            stamped = table(table_name, column("updated_at"))
+            connection.execute(update(stamped).values(updated_at=func.current_timestamp()))
@@ -0,0 +1,30 @@
+"""
+Index the foreign keys and sort columns the recipe listings filter and order on.
+
+Without them the recipe listings by author, category and ingredient, and the instructions of a
+recipe, scan their tables:
+
+  - recipes (author_id) for /recipes/author/ and the deletion of a user's recipes,
+  - recipes (created_at) for reading recipes by creation date,
+  - instructions (recipe_id, step_number) for a recipe's instructions in step order; as its
+    leading column, recipe_id alone is served by the same index,
+  - recipe_categories (category_id) and recipe_ingredients (ingredient_id) for the recipes of a
+    category or ingredient, whose primary keys lead with recipe_id.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations.operations import create_index
+
+INDEXES = (
+    ("ix_recipes_author_id", "recipes", ("author_id",)),
+    ("ix_recipes_created_at", "recipes", ("created_at",)),
+    ("ix_instructions_recipe_id_step_number", "instructions", ("recipe_id", "step_number")),
+    ("ix_recipe_categories_category_id", "recipe_categories", ("category_id",)),
+    ("ix_recipe_ingredients_ingredient_id", "recipe_ingredients", ("ingredient_id",)),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for name, table_name, column_names in INDEXES:
+        create_index(connection, name, table_name, *column_names)
@@ -0,0 +1,36 @@
+"""
+Add the table_versions table holding the version of the categories and ingredients tables.
+
+Their collection endpoints read it for their ETag and Last-Modified instead of aggregating the
+whole table on every request. Each table starts at version 1, last modified at its latest row.
+"""
+
+from datetime import datetime, UTC
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, column, func, insert, select, table
+from sqlalchemy.engine import Connection
+
+TRACKED_TABLES = ("categories", "ingredients")
+
+metadata = MetaData()
+
+table_versions = Table(
+    "table_versions",
+    metadata,
+    Column("table_name", String(128), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+    seeded = set(connection.scalars(select(table_versions.c.table_name)))
+    for table_name in TRACKED_TABLES:
+        if table_name in seeded:
+            continue
+        tracked = table(table_name, column("updated_at"))
+        last_modified = connection.scalar(select(func.max(tracked.c.updated_at)))
+        connection.execute(
+            insert(table_versions).values(table_name=table_name, version=1, updated_at=last_modified or datetime.now(UTC).replace(tzinfo=None))
+        )
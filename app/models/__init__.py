@@ -5,3 +5,4 @@ from app.models.recipe_ingredient import RecipeIngredient
 from app.models.recipe_category import RecipeCategory
 from app.models.user import User
 from app.models.category import Category
+from app.models.table_version import TableVersion
@@ -1,3 +1,60 @@
+from datetime import datetime, UTC
+
+from sqlalchemy import Column, DateTime, Integer, literal_column
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.expression import FunctionElement
 
 Base = declarative_base()
+
+
+def utcnow() -> datetime:
+    """
+    The current time as a naive UTC datetime, as stored in DateTime columns.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class utc_timestamp(FunctionElement):
+    """
+    The database's current UTC time, for server defaults of columns holding naive UTC datetimes.
+
+    CURRENT_TIMESTAMP is UTC on SQLite but the server's local time on SQL Server, which has
+    SYSUTCDATETIME() instead.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_timestamp)
+def _compile_utc_timestamp(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utc_timestamp, "mssql")
+def _compile_utc_timestamp_mssql(element, compiler, **kw):
+    return "SYSUTCDATETIME()"
+
+
+class Versioned:
+    """
+    Mixin adding the columns that identify the state of a row, for HTTP conditional requests.
+
+    Every UPDATE of the row, through the ORM or Core, increments ``version`` and stamps
+    ``updated_at`` unless the statement sets them itself. Response validators (ETag and
+    Last-Modified) are computed from these two columns without loading or serializing the row.
+
+    Attributes:
+        version (int): 1 on insert, incremented by every update.
+        updated_at (datetime): UTC time of the insert or of the last update.
+    """
+    version = Column(
+        Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1
+    )
+    updated_at = Column(
+        DateTime, nullable=False, default=utcnow, onupdate=utcnow, server_default=utc_timestamp()
+    )
+
+    # Read the new version back (RETURNING) when the ORM flushes an update, rather than expiring it:
+    # expired attributes cannot be lazily reloaded in async code.
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,17 +1,26 @@
 from typing import List
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import declarative_base, relationship, Session, Mapped
 
 from app.models.recipe_category import RecipeCategory
-from app.models.base import Base
+from app.models.base import Base, Versioned
+from app.models.table_version import TRACK_VERSION
 
 
-class Category(Base):
+class Category(Versioned, Base):
     __tablename__ = "categories"
     category_id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False, unique=True)
     description = Column(String)
     image_url = Column(String)
+    # Number of recipes linked to the category, kept up to date by the write endpoints so the
+    # top categories can be read from the index below instead of counting recipe_categories.
+    recipe_count = Column(Integer, nullable=False, default=0, server_default="0")
     recipes = relationship('Recipe', secondary=RecipeCategory.__table__, back_populates='categories')
 
+    __table_args__ = (
+        Index("ix_categories_recipe_count", recipe_count, category_id),
+        {"info": {TRACK_VERSION: True}},
+    )
+
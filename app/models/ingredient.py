@@ -1,15 +1,24 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import declarative_base, relationship, Session
 
 from app.models.recipe_ingredient import RecipeIngredient
-from app.models.base import Base
+from app.models.base import Base, Versioned
+from app.models.table_version import TRACK_VERSION
 from typing import List
 from sqlalchemy.orm import Mapped
 
 
-class Ingredient(Base):
+class Ingredient(Versioned, Base):
     __tablename__ = "ingredients"
     ingredient_id = Column(Integer, primary_key=True)
     name = Column(String(255), unique=True, nullable=False)
     image_url = Column(String)
+    # Number of recipes using the ingredient, kept up to date by the write endpoints so the top
+    # ingredients can be read from the index below instead of counting recipe_ingredients.
+    recipe_count = Column(Integer, nullable=False, default=0, server_default="0")
     recipes: Mapped[List["RecipeIngredient"]] = relationship(back_populates="ingredient")
+
+    __table_args__ = (
+        Index("ix_ingredients_recipe_count", recipe_count, ingredient_id),
+        {"info": {TRACK_VERSION: True}},
+    )
@@ -1,6 +1,6 @@
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import Mapped, relationship
 
 from app.models.base import Base
@@ -17,3 +17,6 @@ class Instruction(Base):
     instruction_text = Column(String, nullable=False)
     recipe: Mapped[List["Recipe"]] = relationship(back_populates="instructions")
 
+    # Serves both the lookup of a recipe's instructions and their ordering by step.
+    __table_args__ = (Index("ix_instructions_recipe_id_step_number", recipe_id, step_number), )
+
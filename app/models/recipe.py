@@ -1,16 +1,20 @@
 from datetime import datetime, UTC
 from typing import List
 
-from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint, DateTime
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, CheckConstraint, DateTime
 from sqlalchemy.orm import declarative_base, relationship, Session, Mapped
 
 from app.models.instruction import Instruction
 from app.models.recipe_ingredient import RecipeIngredient
 from app.models.recipe_category import RecipeCategory
-from app.models.base import Base
+from app.models.base import Base, Versioned
 
 
-class Recipe(Base):
+# Allowed values of Recipe.difficulty.
+DIFFICULTIES = ('FACIL', 'MEDIO', 'DIFICIL')
+
+
+class Recipe(Versioned, Base):
     __tablename__ = "recipes"
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
@@ -26,9 +30,11 @@ class Recipe(Base):
                               secondary=RecipeCategory.__table__,
                               back_populates='recipes')
     ingredients: Mapped[List["RecipeIngredient"]] = relationship(back_populates="recipe")
-    instructions: Mapped[List["Instruction"]] = relationship(back_populates="recipe")
+    instructions: Mapped[List["Instruction"]] = relationship(back_populates="recipe",
+                                                             order_by=Instruction.step_number)
 
 
-    __table_args__ = (CheckConstraint(difficulty.in_(
-        ['FACIL', 'MEDIO', 'DIFICIL']),
-                                      name='valid_difficulty'), )
+    __table_args__ = (CheckConstraint(difficulty.in_(DIFFICULTIES),
+                                      name='valid_difficulty'),
+                      Index("ix_recipes_author_id", author_id),
+                      Index("ix_recipes_created_at", created_at))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, Numeric
 
 from app.models.base import Base
 
@@ -7,3 +7,6 @@ class RecipeCategory(Base):
     __tablename__ = "recipe_categories"
     recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
     category_id = Column(Integer, ForeignKey("categories.category_id", ondelete="CASCADE"), primary_key=True)
+
+    # The primary key leads with recipe_id; this index finds the recipes of a category.
+    __table_args__ = (Index("ix_recipe_categories_category_id", category_id), )
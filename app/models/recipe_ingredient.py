@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 
@@ -19,3 +19,6 @@ class RecipeIngredient(Base):
     unit = Column(String(50), nullable=False)
     recipe: Mapped["Recipe"] = relationship(back_populates="ingredients")
     ingredient: Mapped["Ingredient"] = relationship(back_populates="recipes")
+
+    # The primary key leads with recipe_id; this index finds the recipes using an ingredient.
+    __table_args__ = (Index("ix_recipe_ingredients_ingredient_id", ingredient_id), )
@@ -0,0 +1,64 @@
+from sqlalchemy import Column, DateTime, Integer, String, event, insert, update
+from sqlalchemy.engine import Engine
+
+from app.models.base import Base, utcnow
+
+# Table.info flag of the tables whose writes bump their TableVersion row.
+TRACK_VERSION = "track_table_version"
+
+# Execution option of the writes changing nothing the tracked tables' collection endpoints show,
+# such as the recipe_count counters: they leave the table's version as it is.
+SKIP_VERSION = "skip_table_version"
+
+# Key of the set of tables whose version the current transaction already bumped, in Connection.info.
+BUMPED_TABLES = "table_versions_bumped"
+
+
+class TableVersion(Base):
+    """
+    Version of a whole table, for the HTTP validators of its collection endpoints.
+
+    Every transaction writing to a tracked table (one with ``info={TRACK_VERSION: True}``)
+    increments the table's row here once, within the same transaction, so the state of a
+    collection is read with a single primary-key lookup instead of aggregating the table. Writes
+    executed with the ``SKIP_VERSION`` option do not count.
+
+    Attributes:
+        table_name (str): The tracked table.
+        version (int): Number of committed transactions that wrote to the table.
+        updated_at (datetime): UTC time of the last of these transactions.
+    """
+    __tablename__ = "table_versions"
+    table_name = Column(String(128), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=utcnow)
+
+
+@event.listens_for(Engine, "before_execute")
+def _bump_table_version(connection, clauseelement, multiparams, params, execution_options) -> None:
+    # Bumped before the write rather than after it, so the connection never has to run a
+    # statement while the write's RETURNING rows are still pending. Statements built on other
+    # Table objects than the models', such as those of the migration scripts, are not tracked.
+    if not getattr(clauseelement, "is_dml", False) or execution_options.get(SKIP_VERSION):
+        return
+    table = clauseelement.table
+    if not getattr(table, "info", {}).get(TRACK_VERSION):
+        return
+    bumped = connection.info.setdefault(BUMPED_TABLES, set())
+    if table.name in bumped:
+        return
+    bumped.add(table.name)
+    versions = TableVersion.__table__
+    result = connection.execute(
+        update(versions)
+        .where(versions.c.table_name == table.name)
+        .values(version=versions.c.version + 1, updated_at=utcnow())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(versions).values(table_name=table.name, version=1, updated_at=utcnow()))
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _end_table_version_transaction(connection) -> None:
+    connection.info.pop(BUMPED_TABLES, None)
@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination shared by every collection endpoint.
+
+Instead of OFFSET, each page is fetched with a ``WHERE key > last_seen_key`` predicate on an
+ordered, unique key (usually the primary key), so the database seeks straight to the page through
+the index and page N costs the same as page 1. The position of the last row is handed to the
+client as an opaque, URL-safe cursor that it sends back to get the next page.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+
+@dataclass
+class PageParams:
+    """
+    Pagination parameters parsed from the query string.
+
+    Attributes:
+        limit (int): Maximum number of items to return, already bounded by MAX_PAGE_SIZE.
+        cursor (Optional[str]): Opaque cursor returned by the previous page, if any.
+    """
+    limit: int
+    cursor: Optional[str] = None
+
+
+def page_params(
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+) -> PageParams:
+    """
+    Dependency that reads ``?limit=`` and ``?cursor=`` for a paginated endpoint.
+
+    Args:
+        limit (int): Requested page size; FastAPI rejects values above MAX_PAGE_SIZE with a 422.
+        cursor (Optional[str]): The ``next_cursor`` value from the previous page.
+
+    Returns:
+        PageParams: The validated pagination parameters.
+    """
+    return PageParams(limit=limit, cursor=cursor)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the key values of the last row on a page into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): The key column values, in key order.
+
+    Returns:
+        str: A URL-safe base64 string without padding.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor sent by the client.
+        size (int): The number of key values the endpoint expects.
+
+    Raises:
+        HTTPException: With status 400 if the cursor is malformed or does not match the key.
+
+    Returns:
+        List[Any]: The key values of the last row of the previous page.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(keys: Sequence, values: Sequence[Any]):
+    """
+    Build the "strictly after" predicate for a composite ascending key.
+
+    Row-value comparisons such as ``(a, b) > (x, y)`` are not supported by SQL Server, so the
+    predicate is expanded to ``a > x OR (a = x AND b > y)``.
+
+    Args:
+        keys (Sequence): The ordered key columns.
+        values (Sequence[Any]): The key values of the last row already returned.
+
+    Returns:
+        ColumnElement: A boolean SQL expression selecting the rows after the cursor.
+    """
+    clauses = []
+    for i, key in enumerate(keys):
+        equal_prefix = [keys[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, key > values[i]))
+    return or_(*clauses)
+
+
+async def paginate(db: AsyncSession, statement: Select, keys: Sequence, page: PageParams) -> dict:
+    """
+    Fetch one page of a query using keyset pagination.
+
+    The statement is ordered by ``keys`` (ascending), filtered to the rows after ``page.cursor``
+    and limited to one row more than the page size, which tells whether a next page exists without
+    a separate COUNT.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        statement (Select): A select over one entity to paginate; it must not already be ordered.
+        keys (Sequence): Columns forming a unique, ascending sort key, e.g. ``(Recipe.id,)``.
+        page (PageParams): The requested page size and cursor.
+
+    Returns:
+        dict: A mapping compatible with the Page schema, with ``items`` and ``next_cursor``.
+    """
+    if page.cursor:
+        statement = statement.where(keyset_filter(keys, decode_cursor(page.cursor, len(keys))))
+    # The key columns are selected alongside the entity so the cursor can be built even when
+    # those attributes are deferred on the entity itself.
+    statement = statement.add_columns(*keys).order_by(*keys).limit(page.limit + 1)
+    rows = (await db.execute(statement)).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor(list(rows[-1][1:]))
+    return {"items": [row[0] for row in rows], "next_cursor": next_cursor}
+
+
+def paginate_ranked(ranked_ids: Sequence[Any], page: PageParams) -> Tuple[List[Any], Optional[str]]:
+    """
+    Slice one page out of an in-memory ranking, such as search results.
+
+    A relevance ranking has no indexed sort key to seek on, but it is computed in memory and is
+    deterministic for a given index state, so the cursor simply records the position reached.
+
+    Args:
+        ranked_ids (Sequence[Any]): All matching ids, best first.
+        page (PageParams): The requested page size and cursor.
+
+    Raises:
+        HTTPException: With status 400 if the cursor is malformed.
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: The ids on this page and the cursor of the next page.
+    """
+    offset = 0
+    if page.cursor:
+        (offset,) = decode_cursor(page.cursor, 1)
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    end = offset + page.limit
+    next_cursor = encode_cursor([end]) if end < len(ranked_ids) else None
+    return list(ranked_ids[offset:end]), next_cursor
@@ -0,0 +1 @@
+from app.queries.recipes import recipe_graph_options, recipe_query, recipes_by_ids
@@ -0,0 +1,33 @@
+"""
+Multi-row INSERT statements for writing many rows in few round trips.
+
+An ``executemany`` is sent row by row by most drivers (pyodbc without fast_executemany included),
+so inserting N links costs N round trips. ``insert_values`` renders the rows into
+``INSERT ... VALUES (...), (...), ...`` statements instead, each as large as the database allows.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# SQL Server accepts at most 2100 bind parameters per statement and 1000 rows per VALUES list;
+# SQLite's limits are higher.
+MAX_PARAMETERS = 2000
+MAX_ROWS = 1000
+
+
+async def insert_values(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert rows with as few multi-row INSERT statements as the parameter limits allow.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session holding the transaction.
+        model: The mapped class to insert into.
+        rows (List[Dict[str, Any]]): The rows, all with the same keys.
+    """
+    if not rows:
+        return
+    per_statement = max(1, min(MAX_ROWS, MAX_PARAMETERS // len(rows[0])))
+    for start in range(0, len(rows), per_statement):
+        await db.execute(insert(model).values(rows[start:start + per_statement]))
@@ -0,0 +1,139 @@
+"""
+Maintenance of the denormalized ``recipe_count`` columns of categories and ingredients.
+
+The top categories and top ingredients endpoints order by ``recipe_count`` through an index
+instead of counting the link tables on every call. The counters are adjusted in the same
+transaction as the links they count:
+
+  - ``add_recipe_links`` when recipes' categories and ingredients are inserted,
+  - ``remove_recipe_links`` before recipes are deleted (their links go with them through the
+    ON DELETE CASCADE foreign keys, which bypass the application),
+  - ``rebuild_recipe_counts`` recomputes every counter from the link tables, to repair drift
+    left by writes made outside the application (see app.commands.rebuild_recipe_counts).
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import Row, Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.ingredient import Ingredient
+from app.models.recipe_category import RecipeCategory
+from app.models.recipe_ingredient import RecipeIngredient
+from app.models.table_version import SKIP_VERSION
+
+# (counted model, its key, link model, the link's foreign key to the counted model)
+COUNTERS = (
+    (Category, Category.category_id, RecipeCategory, RecipeCategory.category_id),
+    (Ingredient, Ingredient.ingredient_id, RecipeIngredient, RecipeIngredient.ingredient_id),
+)
+
+# Columns of the counted rows returned by add_recipe_links: those their response schemas show.
+RETURNED_COLUMNS = (
+    (Category.category_id, Category.name, Category.description, Category.image_url),
+    (Ingredient.ingredient_id, Ingredient.name, Ingredient.image_url),
+)
+
+
+# Execution options of the counter updates. Counting a recipe does not change the collections of
+# the counted tables either, so it leaves their table version (and /categories/ and /ingredients/
+# ETags) as it is, and recipe writes do not queue on the table_versions rows.
+COUNTER_UPDATE = {"synchronize_session": False, SKIP_VERSION: True}
+
+
+def _unversioned(model) -> dict:
+    # The counters appear in no response, so counting a recipe leaves the version columns (and
+    # with them the ETags of the counted rows) as they are.
+    return {"version": model.version, "updated_at": model.updated_at}
+
+
+async def add_recipe_links(
+        db: AsyncSession,
+        category_ids: Iterable[int],
+        ingredient_ids: Iterable[int]
+) -> Tuple[Dict[int, Row], Dict[int, Row]]:
+    """
+    Count new recipes in the counters of the categories and ingredients they were linked to.
+
+    An id listed n times (linked by n new recipes) is incremented by n. Ids sharing the same
+    increment are updated by a single statement, so a bulk import costs a few statements however
+    many recipes it links.
+
+    The updates return the counted rows (RETURNING, or OUTPUT on SQL Server), so a caller learns
+    in the same round trip which ids exist and what to show for them, without reading them back.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session holding the recipes' transaction.
+        category_ids (Iterable[int]): The category of each new recipe-category link.
+        ingredient_ids (Iterable[int]): The ingredient of each new recipe-ingredient link.
+
+    Returns:
+        Tuple[Dict[int, Row], Dict[int, Row]]: The counted categories and ingredients by id, as rows
+            of RETURNED_COLUMNS. Ids that do not exist are missing.
+    """
+    counted = []
+    for (model, key, _, _), columns, ids in zip(COUNTERS, RETURNED_COLUMNS, (category_ids, ingredient_ids)):
+        by_increment = defaultdict(list)
+        for item_id, increment in Counter(ids).items():
+            by_increment[increment].append(item_id)
+        rows = {}
+        for increment, item_ids in by_increment.items():
+            result = await db.execute(
+                update(model)
+                .where(key.in_(item_ids))
+                .values(recipe_count=model.recipe_count + increment, **_unversioned(model))
+                .returning(*columns)
+                .execution_options(**COUNTER_UPDATE)
+            )
+            rows.update((row[0], row) for row in result)
+        counted.append(rows)
+    return counted[0], counted[1]
+
+
+async def remove_recipe_links(db: AsyncSession, recipe_ids: Select) -> None:
+    """
+    Stop counting the given recipes, before they are deleted.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session holding the deletion's transaction.
+        recipe_ids (Select): A select of the ids of the recipes about to be deleted, e.g.
+            ``select(Recipe.id).where(Recipe.author_id == user_id)``.
+    """
+    for model, key, link, link_key in COUNTERS:
+        removed = (
+            select(func.count())
+            .select_from(link)
+            .where(link_key == key, link.recipe_id.in_(recipe_ids))
+            .scalar_subquery()
+        )
+        await db.execute(
+            update(model)
+            .where(key.in_(select(link_key).where(link.recipe_id.in_(recipe_ids))))
+            .values(recipe_count=model.recipe_count - removed, **_unversioned(model))
+            .execution_options(**COUNTER_UPDATE)
+        )
+
+
+async def rebuild_recipe_counts(db: AsyncSession) -> dict:
+    """
+    Recompute every counter from the link tables, touching only the rows that drifted.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session; the caller commits.
+
+    Returns:
+        dict: The number of corrected rows per table name.
+    """
+    corrected = {}
+    for model, key, link, link_key in COUNTERS:
+        actual = select(func.count()).select_from(link).where(link_key == key).scalar_subquery()
+        result = await db.execute(
+            update(model)
+            .where(model.recipe_count != actual)
+            .values(recipe_count=actual, **_unversioned(model))
+            .execution_options(**COUNTER_UPDATE)
+        )
+        corrected[model.__tablename__] = result.rowcount
+    return corrected
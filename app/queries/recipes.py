@@ -0,0 +1,108 @@
+"""
+Shared query builders for loading recipes together with everything RecipeResponse serializes.
+
+RecipeResponse walks ``categories``, ``ingredients`` and each ``RecipeIngredient.ingredient``.
+Left to the default lazy loading, each of those attributes triggers its own SELECT per recipe,
+so a list of N recipes costs 1 + 2N + M round trips. The loader options defined here fetch the
+whole graph in a fixed number of queries no matter how many recipes are returned:
+
+  1. the recipes themselves,
+  2. the categories of all loaded recipes (SELECT IN through recipe_categories),
+  3. the recipe_ingredients of all loaded recipes, joined to their ingredient rows.
+
+When a sparse fieldset is requested, only the selected columns are loaded and relationships that
+were not selected are skipped entirely.
+"""
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.fields import FieldSet
+from app.models.recipe import Recipe
+from app.models.recipe_ingredient import RecipeIngredient
+
+
+def recipe_graph_options(fields: Optional[FieldSet] = None):
+    """
+    Build the loader options needed to serialize a Recipe as a RecipeResponse.
+
+    Collections are loaded with ``selectinload`` so that a single ``IN (...)`` query covers every
+    recipe in the result without multiplying the parent rows. The many-to-one
+    ``RecipeIngredient.ingredient`` is joined into that same query with ``joinedload``, since it
+    adds at most one row per link.
+
+    Args:
+        fields (Optional[FieldSet]): A sparse fieldset; when given, only the selected columns and
+            relationships are loaded.
+
+    Returns:
+        tuple: Loader options to pass to ``Select.options``.
+    """
+    options = []
+    if fields is not None:
+        options.extend(fields.load_options())
+    if fields is None or fields.includes("categories"):
+        options.append(selectinload(Recipe.categories))
+    if fields is None or fields.includes("ingredients"):
+        options.append(selectinload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient))
+    return tuple(options)
+
+
+def recipe_query(fields: Optional[FieldSet] = None) -> Select:
+    """
+    Start a Recipe select that eagerly loads the full RecipeResponse graph.
+
+    Callers can keep chaining joins, filters and ordering on the returned statement; the eager
+    loading strategy stays in effect for whatever rows it finally yields. Eager loading is also
+    what makes the result safe to serialize with an AsyncSession, where lazy loads are not allowed.
+
+    Args:
+        fields (Optional[FieldSet]): A sparse fieldset restricting what is loaded.
+
+    Returns:
+        Select: A select over Recipe with the recipe graph loader options applied.
+
+    Example:
+        result = await db.execute(recipe_query().where(Recipe.author_id == user_id))
+        recipes = result.scalars().all()
+    """
+    return select(Recipe).options(*recipe_graph_options(fields))
+
+
+def recipe_detail_query() -> Select:
+    """
+    Start a Recipe select that eagerly loads the RecipeDetailResponse graph.
+
+    On top of recipe_query's loads, the instructions of the loaded recipes are fetched with one
+    more SELECT IN, already in step order (the relationship is ordered by step_number). A recipe
+    and everything its detail screen shows thus costs four queries on one connection.
+
+    Returns:
+        Select: A select over Recipe with the detail graph loader options applied.
+    """
+    return recipe_query().options(selectinload(Recipe.instructions))
+
+
+async def recipes_by_ids(db: AsyncSession, ids: Sequence[int], fields: Optional[FieldSet] = None) -> List[Recipe]:
+    """
+    Load the recipes with the given ids, in the order the ids were given.
+
+    Ids that do not exist are skipped. The graph is eagerly loaded as in recipe_query, so the whole
+    batch costs the same fixed number of queries regardless of its size.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        ids (Sequence[int]): The recipe ids, in the desired output order.
+        fields (Optional[FieldSet]): A sparse fieldset restricting what is loaded.
+
+    Returns:
+        List[Recipe]: The recipes found, ordered like ``ids``.
+    """
+    if not ids:
+        return []
+    result = await db.execute(recipe_query(fields).where(Recipe.id.in_(ids)))
+    by_id = {recipe.id: recipe for recipe in result.scalars()}
+    return [by_id[recipe_id] for recipe_id in ids if recipe_id in by_id]
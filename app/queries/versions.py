@@ -0,0 +1,88 @@
+"""
+State queries feeding the HTTP validators of app.conditional.
+
+Each query reads only ids and the ``version``/``updated_at`` columns of the rows a response is
+built from, so deciding on a 304 costs one small query and no serialization.
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Category, Ingredient, Recipe, RecipeCategory, RecipeIngredient, TableVersion
+
+# A response's state and the time of its last change, or None when its main row does not exist.
+State = Optional[Tuple[Any, Optional[datetime]]]
+
+
+async def recipe_state(db: AsyncSession, recipe_id: int) -> State:
+    """
+    Read the versions of a recipe and of the categories and ingredients it shows.
+
+    A renamed ingredient changes every recipe using it, so the linked rows are part of the state.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        recipe_id (int): The recipe id.
+
+    Returns:
+        State: The sorted (kind, id, version) rows and their latest updated_at, or None if the
+            recipe does not exist.
+    """
+    rows = (await db.execute(union_all(
+        select(literal("recipe"), Recipe.id, Recipe.version, Recipe.updated_at)
+        .where(Recipe.id == recipe_id),
+        select(literal("category"), Category.category_id, Category.version, Category.updated_at)
+        .join(RecipeCategory, RecipeCategory.category_id == Category.category_id)
+        .where(RecipeCategory.recipe_id == recipe_id),
+        select(literal("ingredient"), Ingredient.ingredient_id, Ingredient.version, Ingredient.updated_at)
+        .join(RecipeIngredient, RecipeIngredient.ingredient_id == Ingredient.ingredient_id)
+        .where(RecipeIngredient.recipe_id == recipe_id),
+    ))).all()
+    if not any(kind == "recipe" for kind, _, _, _ in rows):
+        return None
+    return tuple(sorted(row[:3] for row in rows)), max(row[3] for row in rows)
+
+
+async def row_state(db: AsyncSession, model, key, item_id: int) -> State:
+    """
+    Read the version of a single row.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        model: A mapped class with the Versioned columns, e.g. Ingredient.
+        key: Its primary key column.
+        item_id (int): The row's id.
+
+    Returns:
+        State: The row's version and updated_at, or None if it does not exist.
+    """
+    row = (await db.execute(select(model.version, model.updated_at).where(key == item_id))).first()
+    if row is None:
+        return None
+    return row.version, row.updated_at
+
+
+async def table_state(db: AsyncSession, model) -> Tuple[Any, Optional[datetime]]:
+    """
+    Read the version of a whole table, for its collection endpoints.
+
+    The version is kept in table_versions and bumped by every transaction writing to the table
+    (see app.models.table_version), so this is a single-row lookup whatever the table's size.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+        model: A mapped class whose table tracks its version.
+
+    Returns:
+        Tuple[Any, Optional[datetime]]: The table's version and the time of its last write; 0 and
+            None for a table not written since versions were tracked.
+    """
+    row = (await db.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(TableVersion.table_name == model.__tablename__)
+    )).first()
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
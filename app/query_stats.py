@@ -0,0 +1,161 @@
+"""
+Per-request SQL instrumentation.
+
+``QueryStatsMiddleware`` opens a ``RequestQueries`` record for every HTTP request. Engine-wide
+``before_cursor_execute``/``after_cursor_execute`` hooks add each statement the request sends to
+it, with its duration. The request's totals come back to the client in a ``Server-Timing``
+header (shown by browser developer tools):
+
+    Server-Timing: db;dur=12.4;desc="7 queries"
+
+Statements slower than SLOW_QUERY_SECONDS are logged with the route that ran them. A statement
+text sent N_PLUS_ONE_THRESHOLD times or more within one request (typically a lazy load run once
+per row of a list) is logged once as a probable N+1.
+
+The record lives in a context variable, which SQLAlchemy carries into the greenlet running the
+async engine's sync code, so statements are attributed to the request that awaited them even
+when many requests are served concurrently.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Key of the start times of the statements running on a connection, kept in Connection.info.
+QUERY_STARTS = "query_stats_starts"
+
+query_seconds = metrics.histogram("sql_query_seconds", "Duration of SQL statements")
+slow_queries = metrics.counter("sql_slow_queries_total", "SQL statements slower than SLOW_QUERY_SECONDS")
+n_plus_one = metrics.counter("sql_n_plus_one_total", "Statements repeated often enough within a request to flag an N+1")
+queries_per_request = metrics.histogram(
+    "sql_queries_per_request", "SQL statements sent per HTTP request", (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+
+
+class RequestQueries:
+    """
+    SQL statements sent on behalf of one request.
+
+    Attributes:
+        count (int): Number of statements executed.
+        seconds (float): Total time spent executing them.
+        statements (Counter): Executions per statement text.
+    """
+
+    def __init__(self, scope: Scope):
+        self._scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    @property
+    def route(self) -> str:
+        """
+        The route path template (e.g. "/recipes/{recipe_id}"), or the request path until a route
+        has matched. The router stores the matched route in the scope before the endpoint runs.
+        """
+        route = self._scope.get("route")
+        return getattr(route, "path", None) or self._scope["path"]
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """
+        Account for one executed statement.
+
+        Args:
+            statement (str): The SQL text, with bind parameter placeholders.
+            elapsed (float): Its execution time in seconds.
+        """
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] += 1
+        if self.statements[statement] == settings.N_PLUS_ONE_THRESHOLD:
+            n_plus_one.inc()
+            logger.warning(
+                "Probable N+1 on %s: statement executed %d times in one request: %s",
+                self.route, settings.N_PLUS_ONE_THRESHOLD, statement
+            )
+
+    def server_timing(self) -> str:
+        """
+        Format the totals as a Server-Timing header value.
+
+        Returns:
+            str: The "db" timing entry, with the duration in milliseconds.
+        """
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+# The record of the request being served, if any.
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware recording the SQL statements of each HTTP request.
+
+    Add it outside the response cache, so cached responses get the header of the request serving
+    them rather than the one stored with them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = current_queries.set(queries)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", queries.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_queries.reset(token)
+            queries_per_request.observe(queries.count)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(connection, cursor, statement, parameters, context, executemany) -> None:
+    connection.info.setdefault(QUERY_STARTS, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(connection, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - connection.info[QUERY_STARTS].pop()
+    query_seconds.observe(elapsed)
+    queries = current_queries.get()
+    if queries is not None:
+        queries.record(statement, elapsed)
+    if elapsed >= settings.SLOW_QUERY_SECONDS:
+        slow_queries.inc()
+        logger.warning(
+            "Slow query on %s (%.3fs): %s",
+            queries.route if queries is not None else "no request", elapsed, statement
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _forget_failed_query(exception_context) -> None:
+    # A failed statement gets no after_cursor_execute; drop its start time.
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(QUERY_STARTS) and exception_context.cursor is not None:
+        connection.info[QUERY_STARTS].pop()
@@ -0,0 +1,96 @@
+"""
+Response rendering for read endpoints.
+
+Handlers pass the ORM objects they loaded to the helpers below, which serialize them through the
+fast path of app.serialization: one validation against the (possibly trimmed) schema and JSON
+written by pydantic-core, returned as a ready response that FastAPI does not validate again.
+
+When the client asks for a sparse fieldset (``?fields=``) the output is validated with a trimmed
+copy of the schema, and when it asks for an image variant (``?size=``) image URLs are rewritten
+before the data is encoded.
+"""
+
+from typing import List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.fields import FieldSet, trimmed_schema
+from app.images.derivatives import ImageSize, rewrite_image_urls
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page
+from app.serialization import FastJSONResponse, dump_jsonable, json_response
+
+
+def _schema_for(schema: Type[BaseModel], fields: Optional[FieldSet]) -> Type[BaseModel]:
+    return trimmed_schema(schema, fields.names) if fields else schema
+
+
+def _respond(schema, content, size: Optional[ImageSize]) -> FastJSONResponse:
+    if size is None:
+        return json_response(schema, content)
+    return FastJSONResponse(rewrite_image_urls(dump_jsonable(schema, content), size))
+
+
+def render_page(page: dict, schema: Type[BaseModel], fields: Optional[FieldSet] = None,
+                size: Optional[ImageSize] = None) -> FastJSONResponse:
+    """
+    Render a page returned by ``paginate``.
+
+    Args:
+        page (dict): A mapping with ``items`` and ``next_cursor``.
+        schema (Type[BaseModel]): The full item schema, e.g. RecipeResponse.
+        fields (Optional[FieldSet]): The requested sparse fieldset, if any.
+        size (Optional[ImageSize]): The requested image variant, if any.
+
+    Returns:
+        FastJSONResponse: The serialized page.
+    """
+    return _respond(Page[_schema_for(schema, fields)], page, size)
+
+
+def render_batch(batch: dict, schema: Type[BaseModel], fields: Optional[FieldSet] = None,
+                 size: Optional[ImageSize] = None) -> FastJSONResponse:
+    """
+    Render the result of ``load_batch``.
+
+    Args:
+        batch (dict): A mapping with ``items`` and ``missing``.
+        schema (Type[BaseModel]): The full item schema, e.g. RecipeResponse.
+        fields (Optional[FieldSet]): The requested sparse fieldset, if any.
+        size (Optional[ImageSize]): The requested image variant, if any.
+
+    Returns:
+        FastJSONResponse: The serialized batch.
+    """
+    return _respond(Batch[_schema_for(schema, fields)], batch, size)
+
+
+def render_item(item, schema: Type[BaseModel], fields: Optional[FieldSet] = None,
+                size: Optional[ImageSize] = None) -> FastJSONResponse:
+    """
+    Render a single ORM object.
+
+    Args:
+        item: The ORM object to render.
+        schema (Type[BaseModel]): The full schema of the object, e.g. RecipeResponse.
+        fields (Optional[FieldSet]): The requested sparse fieldset, if any.
+        size (Optional[ImageSize]): The requested image variant, if any.
+
+    Returns:
+        FastJSONResponse: The serialized item.
+    """
+    return _respond(_schema_for(schema, fields), item, size)
+
+
+def render_list(items, schema: Type[BaseModel]) -> FastJSONResponse:
+    """
+    Render a list of ORM objects.
+
+    Args:
+        items: The ORM objects to render.
+        schema (Type[BaseModel]): The schema of one item, e.g. InstructionResponse.
+
+    Returns:
+        FastJSONResponse: The serialized list.
+    """
+    return json_response(List[schema], items)
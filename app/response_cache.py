@@ -0,0 +1,282 @@
+"""
+In-process cache of serialized responses for read-mostly endpoints.
+
+Endpoints opt in with the ``cache_response`` decorator, naming the tables their output is built
+from. ``ResponseCacheMiddleware`` then answers repeated GET requests for those endpoints with the
+stored status, headers and body bytes, skipping the database, the handler and serialization.
+
+Entries are keyed by path, normalized query string and the current *generation* of each table
+the endpoint reads. Committing a transaction that wrote to a table, through a session or directly
+on a connection, bumps that table's generation once the commit is done (see the SQLAlchemy
+listeners below), so every entry built from the old data stops matching at once and ages out of
+the LRU. A response computed while a write commits is stored under the generation it started with
+and is never served.
+
+Other server processes do not see this process' commits; ``RESPONSE_CACHE_TTL_SECONDS`` bounds
+how long they may serve data from before another process' write.
+"""
+
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import TTLCache
+from app.conditional import etag_matches
+from app.config import settings
+from app.models.base import Base
+
+# Key of the set of written table names kept in Connection.info until commit.
+WRITTEN_TABLES = "response_cache_written_tables"
+
+# Key of the tables written by a committing transaction, kept in Connection.info until the commit
+# is known to be done.
+COMMITTED_TABLES = "response_cache_committed_tables"
+
+# Headers of a stored response repeated on a 304 answered from the cache.
+VALIDATOR_HEADERS = (b"etag", b"last-modified", b"cache-control")
+
+
+def cache_response(*tables: str):
+    """
+    Mark an endpoint as cacheable by ResponseCacheMiddleware.
+
+    Apply it below the route decorator, so the route registers the marked function.
+
+    Args:
+        *tables (str): Names of the tables the endpoint's response is built from. A commit writing
+            to any of them invalidates the cached responses.
+
+    Returns:
+        Callable: A decorator returning the endpoint unchanged apart from the marker.
+
+    Example:
+        @router.get("/")
+        @cache_response("categories")
+        async def get_categories(...):
+            ...
+    """
+    def decorator(endpoint):
+        endpoint.cache_tables = tuple(tables)
+        return endpoint
+    return decorator
+
+
+def _cascade_map() -> Dict[str, Set[str]]:
+    # Tables whose rows the database deletes along with a row of the key table (ON DELETE CASCADE),
+    # followed transitively: deleting a user also deletes their recipes and the recipes' links.
+    direct = defaultdict(set)
+    for table in Base.metadata.tables.values():
+        for foreign_key in table.foreign_keys:
+            if (foreign_key.ondelete or "").upper() == "CASCADE":
+                direct[foreign_key.column.table.name].add(table.name)
+    closure = {}
+    for name in list(direct):
+        seen, stack = set(), [name]
+        while stack:
+            for child in direct.get(stack.pop(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        closure[name] = seen
+    return closure
+
+
+class ResponseCache:
+    """
+    Response store keyed by request and table generations.
+
+    Attributes:
+        entries (TTLCache): The stored responses, LRU- and TTL-bounded.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl, name="response_cache")
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def generations(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Read the current generation of each table.
+
+        Args:
+            tables (Iterable[str]): Table names.
+
+        Returns:
+            Tuple[int, ...]: One generation number per table, in the same order.
+        """
+        return tuple(self._generations[table] for table in tables)
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """
+        Invalidate every response built from any of the given tables.
+
+        Args:
+            tables (Iterable[str]): Names of the tables that were written.
+        """
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+
+    def clear(self) -> None:
+        """
+        Drop every stored response.
+        """
+        self.entries.clear()
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving and storing the responses of endpoints marked with cache_response.
+
+    Only GET requests answered with 200 in a single body message are stored; streamed responses
+    pass through. A served entry carries an ``X-Cache: HIT`` header, a freshly computed one
+    ``X-Cache: MISS``. A stored response with an ETag is served as a 304 to a request whose
+    If-None-Match matches it.
+    """
+
+    def __init__(self, app: ASGIApp, cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.cache = cache or response_cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        tables = _route_tables(scope["app"], scope["path"])
+        if tables is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        key = (scope["path"], query, self.cache.generations(tables))
+        entry = self.cache.entries.get(key)
+        if entry is not None:
+            status, headers, body = entry
+            if _not_modified(scope, headers):
+                status, body = 304, b""
+                headers = [(name, value) for name, value in headers if name in VALIDATOR_HEADERS]
+            await send({"type": "http.response.start", "status": status, "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Dict = {}
+        streamed = False
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal streamed
+            if message["type"] == "http.response.start":
+                start.update(message)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body" and start.get("status") == 200 and not streamed:
+                if message.get("more_body", False):
+                    # A streamed body may be arbitrarily large: pass it through without keeping it.
+                    streamed = True
+                else:
+                    self.cache.entries.set(key, (200, list(start.get("headers", [])), message.get("body", b"")))
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+
+def _not_modified(scope: Scope, headers) -> bool:
+    # A stored response with an ETag answers a matching If-None-Match with a 304, like its handler.
+    etag = dict(headers).get(b"etag")
+    if_none_match = dict(scope["headers"]).get(b"if-none-match")
+    return etag is not None and if_none_match is not None and etag_matches(
+        if_none_match.decode("latin-1"), etag.decode("latin-1")
+    )
+
+
+# Paths resolve to the same route for the life of the app, so the route lookup is memoized.
+@lru_cache(maxsize=1024)
+def _route_tables(app, path: str) -> Optional[Tuple[str, ...]]:
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": ""}
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return getattr(getattr(route, "endpoint", None), "cache_tables", None)
+    return None
+
+
+# Global cache used by the middleware and the session listeners.
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+# Tables deleted along with a row of each table, resolved once all models are imported.
+_cascades: Optional[Dict[str, Set[str]]] = None
+
+# Key of the connections a session wrote through, kept in Session.info until commit.
+SESSION_CONNECTIONS = "response_cache_connections"
+
+
+@event.listens_for(Engine, "after_execute")
+def _record_written_table(connection, clauseelement, multiparams, params, execution_options, result) -> None:
+    # Every INSERT/UPDATE/DELETE reaches the connection, whether it comes from a flush or from a
+    # bulk statement, so the written tables are collected here rather than from the session.
+    global _cascades
+    if not getattr(clauseelement, "is_dml", False):
+        return
+    name = clauseelement.table.name
+    written = connection.info.setdefault(WRITTEN_TABLES, set())
+    written.add(name)
+    if clauseelement.is_delete:
+        if _cascades is None:
+            _cascades = _cascade_map()
+        written.update(_cascades.get(name, ()))
+
+
+@event.listens_for(Engine, "commit")
+def _mark_committed_tables(connection) -> None:
+    # Runs just before the database commit. The generations are only bumped once it is done, so a
+    # request reading a new generation is guaranteed to see the committed rows: by the session
+    # listener below, or for connections used directly (engine.begin()) when the connection
+    # starts its next transaction or goes back to the pool.
+    written = connection.info.pop(WRITTEN_TABLES, None)
+    if written:
+        connection.info.setdefault(COMMITTED_TABLES, set()).update(written)
+
+
+@event.listens_for(Engine, "rollback")
+def _forget_rolled_back_tables(connection) -> None:
+    connection.info.pop(WRITTEN_TABLES, None)
+
+
+def _invalidate_committed_tables(info: dict) -> None:
+    committed = info.pop(COMMITTED_TABLES, None)
+    if committed:
+        response_cache.invalidate(committed)
+
+
+@event.listens_for(Engine, "begin")
+def _invalidate_before_next_transaction(connection) -> None:
+    _invalidate_committed_tables(connection.info)
+
+
+@event.listens_for(Pool, "checkin")
+def _invalidate_on_checkin(dbapi_connection, connection_record) -> None:
+    if connection_record is not None:
+        _invalidate_committed_tables(connection_record.info)
+
+
+@event.listens_for(Session, "after_begin")
+def _track_session_connection(session: Session, transaction, connection) -> None:
+    session.info.setdefault(SESSION_CONNECTIONS, []).append(connection)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_session_tables(session: Session) -> None:
+    for connection in session.info.pop(SESSION_CONNECTIONS, ()):
+        _invalidate_committed_tables(connection.info)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_session_connections(session: Session) -> None:
+    session.info.pop(SESSION_CONNECTIONS, None)
@@ -6,3 +6,6 @@ from app.routers.instructions import router as instructions_router
 from app.routers.instructions import router as instructions_router
 from app.routers.categories import router as categories_router
 
+from app.routers.images import router as images_router
+from app.routers.metrics import router as metrics_router
+from app.routers.imports import router as imports_router
@@ -2,11 +2,13 @@ from datetime import datetime, UTC
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import User
 from app.security.config import verify_password, create_access_token
+from app.security.principals import invalidate_user
 
 
 class TokenRequest(BaseModel):
@@ -26,7 +28,7 @@ router = APIRouter(tags=["authentication"])
 
 
 @router.post("/token")
-async def login(credentials: TokenRequest, db: Session = Depends(get_db)):
+async def login(credentials: TokenRequest, db: AsyncSession = Depends(get_db)):
     """
     Authenticate a user and generate an access token.
 
@@ -36,7 +38,7 @@ async def login(credentials: TokenRequest, db: Session = Depends(get_db)):
 
     Args:
         credentials (TokenRequest): The email and password supplied by the client.
-        db (Session): The SQLAlchemy database session injected via dependency.
+        db (AsyncSession): The SQLAlchemy async database session injected via dependency.
 
     Raises:
         HTTPException: If the user does not exist or the password is incorrect,
@@ -46,10 +48,11 @@ async def login(credentials: TokenRequest, db: Session = Depends(get_db)):
         dict: A dictionary containing the access token, token type ("bearer"), and user details.
     """
     # Query the database for a user with the provided email.
-    user = db.query(User).filter(User.email == credentials.email).first()
+    result = await db.execute(select(User).where(User.email == credentials.email))
+    user = result.scalar_one_or_none()
 
     # If user is not found or the password doesn't match, raise an Unauthorized exception.
-    if not user or not verify_password(credentials.password, user.password):
+    if not user or not await verify_password(credentials.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -57,10 +60,12 @@ async def login(credentials: TokenRequest, db: Session = Depends(get_db)):
 
     # Update the last_login timestamp to the current UTC time.
     user.last_login = datetime.now(UTC)
-    db.commit()
+    await db.commit()
+    # Cached principals of this user's other tokens still hold the previous last_login.
+    invalidate_user(user.user_id)
 
     # Generate a JWT access token for the authenticated user.
-    access_token = create_access_token(user.email)
+    access_token = create_access_token(user.email, user.user_id)
 
     # Return the token along with basic user information.
     return {
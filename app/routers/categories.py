@@ -1,90 +1,181 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
+from app.config import settings
+from app.batch_lookup import batch_ids, load_batch
+from app.conditional import Validator
 from app.database import get_db
-from app.models import Category, RecipeCategory, User
-from app.schemas import CategoryResponse, CategoryCreate
+from app.fields import FieldSet, sparse_fields
+from app.images.derivatives import ImageSize, schedule_derivatives
+from app.images.store import ingest_image_value
+from app.models import Category
+from app.pagination import PageParams, page_params, paginate
+from app.queries.versions import table_state
+from app.rendering import render_batch, render_page
+from app.response_cache import cache_response
+from app.schemas import Batch, CategoryResponse, CategoryCreate, Page, Suggestion
+from app.search.catalog import category_autocomplete
 from app.security.dependencies import get_current_user
+from app.security.principals import Principal
 
 # Initialize API router for category endpoints.
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+# Dependency parsing ?fields= against the CategoryResponse schema.
+category_fields = sparse_fields(CategoryResponse, Category)
 
-@router.get("/", response_model=List[CategoryResponse])
-def get_categories(db: Session = Depends(get_db)):
+
+@router.get("/", response_model=Page[CategoryResponse])
+@cache_response("categories")
+async def get_categories(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[FieldSet] = Depends(category_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Retrieve all categories.
+    Retrieve categories, one page at a time.
 
-    This endpoint returns a list of all category records from the database.
+    This endpoint returns category records from the database ordered by id, using keyset pagination.
+    Responses are cached in memory until the categories table is next written. They carry an
+    ETag and a Last-Modified header derived from the state of the whole table, and conditional
+    requests still matching it get an empty 304.
 
     Args:
-        db (Session): The SQLAlchemy database session, provided by dependency injection.
+        request (Request): The incoming request, read for its conditional headers.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The SQLAlchemy database session, provided by dependency injection.
 
     Returns:
-        List[CategoryResponse]: A list of categories available in the system.
+        Page[CategoryResponse]: A page of categories and the cursor of the next page.
     """
-    categories = db.query(Category).all()
-    return categories
+    validator = Validator.for_request(request, *await table_state(db, Category))
+    if validator.matches(request):
+        return validator.not_modified()
+
+    query = select(Category)
+    if fields:
+        query = fields.apply(query)
+    result = await paginate(db, query, (Category.category_id,), page)
+    return validator.apply(render_page(result, CategoryResponse, fields, size))
 
 
 @router.get("/top", response_model=List[CategoryResponse])
-def get_top_categories(limit: int = 10, db: Session = Depends(get_db)):
+@cache_response("categories")
+async def get_top_categories(
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve the top categories based on recipe usage.
 
-    This endpoint joins the Category table with RecipeCategory to count how many recipes
-    are associated with each category. It groups by all category attributes, orders the results
-    by the count in descending order, and returns the top categories up to the specified limit.
+    Categories are ordered by their recipe_count column, the number of recipes associated with
+    each category maintained on every recipe write, so the query is a read of the
+    (recipe_count, category_id) index rather than a count over recipe_categories. Categories
+    without recipes are left out. Responses are cached in memory until a category (or a count)
+    is next written.
 
     Args:
         limit (int, optional): The maximum number of top categories to return. Defaults to 10.
-        db (Session): The SQLAlchemy database session.
+        db (AsyncSession): The SQLAlchemy database session.
 
     Returns:
         List[CategoryResponse]: A list of the top categories; if none are found, an empty list is returned.
     """
-    top_categories = (
-        db.query(
+    top_categories = (await db.execute(
+        select(
             Category.category_id,
             Category.name,
             Category.description,
             Category.image_url
         )
-        .join(RecipeCategory)
-        .group_by(
-            Category.category_id,
-            Category.name,
-            Category.description,
-            Category.image_url
-        )
-        .order_by(func.count(RecipeCategory.recipe_id).desc())
+        .where(Category.recipe_count > 0)
+        .order_by(Category.recipe_count.desc(), Category.category_id.desc())
         .limit(limit)
-        .all()
-    )
+    )).all()
 
     if not top_categories:
         return []
     return top_categories
 
 
+@router.get("/autocomplete", response_model=List[Suggestion])
+async def autocomplete_categories(
+    q: str,
+    limit: int = Query(10, ge=1, le=settings.AUTOCOMPLETE_MAX_RESULTS),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Suggest category names for a partially typed query.
+
+    Answers come from an in-memory prefix index (built at startup and refreshed on create), so no
+    database query is made. Matches on the start of the name rank first, then matches on the start
+    of a later word; if there are not enough, names similar to the query (typos) fill the rest.
+
+    Args:
+        q (str): The text typed so far.
+        limit (int, optional): The maximum number of suggestions to return. Defaults to 10.
+        db (AsyncSession): The SQLAlchemy database session, only used if the index must be rebuilt.
+
+    Returns:
+        List[Suggestion]: Up to ``limit`` suggested categories, best first.
+    """
+    return [{"id": item_id, "name": name} for item_id, name in await category_autocomplete.complete(db, q, limit)]
+
+
+@router.get("/batch", response_model=Batch[CategoryResponse])
+@cache_response("categories")
+async def get_categories_batch(
+    ids: List[int] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(category_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve several categories by id in one request, with a single IN query.
+
+    Responses are cached in memory until the categories table is next written.
+
+    Args:
+        ids (List[int]): The ?ids= comma-separated category ids.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The SQLAlchemy database session, provided by dependency injection.
+
+    Returns:
+        Batch[CategoryResponse]: The categories found, in the requested order, and the ids not found.
+    """
+    query = select(Category)
+    if fields:
+        query = fields.apply(query)
+    result = await load_batch(db, query, Category.category_id, ids)
+    return render_batch(result, CategoryResponse, fields, size)
+
+
 @router.post("/", response_model=CategoryResponse)
-def create_category(
+async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new category.
 
     This endpoint allows an authenticated user to create a new category record in the database.
+    A base64 image is moved to the image store and replaced by a short image reference, and its
+    thumbnails are rendered in the background.
 
     Args:
         category (CategoryCreate): The category data required for creation.
-        db (Session): The SQLAlchemy database session, provided via dependency injection.
-        current_user (User): The currently authenticated user, provided by the authentication dependency.
+        db (AsyncSession): The SQLAlchemy database session, provided via dependency injection.
+        current_user (Principal): The currently authenticated user, provided by the authentication dependency.
 
     Returns:
         CategoryResponse: The details of the newly created category.
@@ -92,9 +183,10 @@ def create_category(
     new_category = Category(
         name=category.name,
         description=category.description,
-        image_url=category.image_url
+        image_url=await run_in_threadpool(ingest_image_value, category.image_url)
     )
     db.add(new_category)
-    db.commit()
-    db.refresh(new_category)
+    await db.commit()
+    schedule_derivatives(new_category.image_url)
+    category_autocomplete.add(new_category.category_id, new_category.name)
     return new_category
@@ -0,0 +1,103 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Request, Response, status
+from starlette.responses import FileResponse, RedirectResponse
+from starlette.types import Receive, Scope, Send
+
+from app.images.derivatives import ImageSize, derivative_pipeline
+from app.images.store import image_reference, image_store
+
+# Images are immutable: a given URL always refers to the same bytes, so clients may cache them forever.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Initialize API router for image endpoints.
+router = APIRouter(prefix="/images", tags=["images"])
+
+
+class ImageFileResponse(FileResponse):
+    """
+    FileResponse for content-addressed images.
+
+    Extends Starlette's FileResponse (which already handles Range requests) with two things:
+      - ``If-Range`` is honoured against our strong, content-derived ETag rather than only the
+        mtime-based one Starlette computes.
+      - When the ASGI server offers the ``http.response.zerocopysend`` extension, whole-file
+        responses are handed to the server as a file object so it can use sendfile(2) instead of
+        copying the image through Python in chunks.
+    """
+
+    zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.zerocopy = "http.response.zerocopysend" in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        return http_if_range == self.headers["etag"] or super()._should_use_range(http_if_range, stat_result)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if not self.zerocopy or send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            await send({"type": "http.response.zerocopysend", "file": file, "more_body": False})
+
+
+@router.get("/{image_hash}")
+def get_image(
+    request: Request,
+    image_hash: str = Path(pattern=r"^[0-9a-f]{64}$"),
+    size: Optional[ImageSize] = None
+):
+    """
+    Serve a stored image, or one of its derived variants, by its content hash.
+
+    The ETag is the content hash itself (suffixed with the variant name), so it is strong and needs
+    no hashing at request time. A matching ``If-None-Match`` gets a 304 without touching the file.
+    Responses carry ``Cache-Control: immutable`` and support byte Range requests.
+
+    Read endpoints hand out variant URLs before the variants are rendered, so a variant that is
+    missing while its original is stored gets an uncached temporary redirect to the original, and
+    its rendering is queued again in case the first job was dropped.
+
+    Args:
+        request (Request): The incoming request, used to read conditional headers.
+        image_hash (str): The hexadecimal SHA-256 digest of the image.
+        size (Optional[ImageSize]): The variant to serve instead of the original image.
+
+    Raises:
+        HTTPException: If the image is not stored (404).
+
+    Returns:
+        Response: The image bytes, a partial range, a redirect to the original image, or an empty
+            304 response.
+    """
+    if size is None:
+        path = image_store.path_for(image_hash)
+        etag = f'"{image_hash}"'
+    else:
+        path = image_store.variant_path(image_hash, size.value)
+        etag = f'"{image_hash}-{size.value}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+    if not os.path.isfile(path):
+        if size is None or not image_store.exists(image_hash):
+            raise HTTPException(status_code=404, detail="Image not found")
+        derivative_pipeline.submit(image_hash)
+        return RedirectResponse(
+            image_reference(image_hash),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "no-store"}
+        )
+
+    # If-None-Match uses weak comparison, so a W/ prefix on the client's tag is ignored.
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if "*" in client_tags or etag in client_tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Variants are always rendered as JPEG.
+    media_type = image_store.media_type(image_hash) if size is None else "image/jpeg"
+    return ImageFileResponse(path, media_type=media_type, headers=headers)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bulk_import import import_ndjson
+from app.database import get_db
+from app.schemas import ImportKind, ImportReport
+from app.security.dependencies import get_current_user
+from app.security.principals import Principal
+
+# Initialize API router for bulk import endpoints.
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post(
+    "/{kind}",
+    response_model=ImportReport,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    }
+)
+async def import_records(
+    kind: ImportKind,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Import recipes, ingredients or categories from an NDJSON request body.
+
+    The body holds one JSON object per line, in the format of the matching create endpoint
+    (RecipeCreate, IngredientCreate or CategoryCreate). It is read as a stream and written in
+    chunks of IMPORT_CHUNK_SIZE lines, each in its own transaction, using batched inserts and
+    updates. Ingredients and categories are upserted by name; recipes are authored by the
+    current user. Invalid lines are skipped and reported with their line number.
+
+    Args:
+        kind (ImportKind): The kind of records in the body.
+        request (Request): The incoming request, whose body is streamed.
+        db (AsyncSession): The SQLAlchemy database session, provided via dependency injection.
+        current_user (Principal): The currently authenticated user, provided by the authentication dependency.
+
+    Returns:
+        ImportReport: Counts of received, created and updated records and the per-line errors.
+    """
+    return await import_ndjson(db, kind, request.stream(), current_user.user_id)
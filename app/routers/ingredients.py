@@ -1,96 +1,214 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.batch_lookup import batch_ids, load_batch
+from app.conditional import Validator
 from app.database import get_db
-from app.models import RecipeIngredient, User
+from app.fields import FieldSet, sparse_fields
+from app.images.derivatives import ImageSize, schedule_derivatives
+from app.images.store import ingest_image_value
 from app.models.ingredient import Ingredient
+from app.pagination import PageParams, page_params, paginate, paginate_ranked
+from app.queries.versions import row_state, table_state
+from app.rendering import render_batch, render_item, render_page
+from app.response_cache import cache_response
+from app.schemas.autocomplete import Suggestion
+from app.schemas.batch import Batch
 from app.schemas.ingredient import IngredientResponse, IngredientCreate
+from app.schemas.pagination import Page
+from app.search.catalog import ingredient_autocomplete, ingredient_search
 from app.security.dependencies import get_current_user
+from app.security.principals import Principal
 
 # Initialize API router for ingredient endpoints.
 router = APIRouter(prefix="/ingredients", tags=["ingredients"])
 
+# Dependency parsing ?fields= against the IngredientResponse schema.
+ingredient_fields = sparse_fields(IngredientResponse, Ingredient)
 
-@router.get("/", response_model=List[IngredientResponse])
-def get_ingredients(db: Session = Depends(get_db)):
+
+@router.get("/", response_model=Page[IngredientResponse])
+@cache_response("ingredients")
+async def get_ingredients(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    fields: Optional[FieldSet] = Depends(ingredient_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Retrieve all ingredients from the database.
+    Retrieve ingredients from the database, one page at a time, ordered by id.
+
+    Responses are cached in memory until the ingredients table is next written. They carry an
+    ETag and a Last-Modified header derived from the state of the whole table, and conditional
+    requests still matching it get an empty 304.
 
     Args:
-        db (Session): SQLAlchemy session provided by dependency injection.
+        request (Request): The incoming request, read for its conditional headers.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): SQLAlchemy session provided by dependency injection.
 
     Returns:
-        List[IngredientResponse]: A list of all ingredients.
+        Page[IngredientResponse]: A page of ingredients and the cursor of the next page.
     """
-    ingredients = db.query(Ingredient).all()
-    return ingredients
+    validator = Validator.for_request(request, *await table_state(db, Ingredient))
+    if validator.matches(request):
+        return validator.not_modified()
+
+    query = select(Ingredient)
+    if fields:
+        query = fields.apply(query)
+    result = await paginate(db, query, (Ingredient.ingredient_id,), page)
+    return validator.apply(render_page(result, IngredientResponse, fields, size))
 
 
 @router.get("/top/{limit}", response_model=List[IngredientResponse])
-def get_top_ingredients(limit: int, db: Session = Depends(get_db)):
+@cache_response("ingredients")
+async def get_top_ingredients(
+    limit: int = Path(ge=1, le=settings.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve the top ingredients based on their frequency of appearance in recipes.
 
-    This endpoint joins the Ingredient table with RecipeIngredient to perform a count of how many
-    recipes include each ingredient, groups by the ingredient attributes, orders in descending
-    order of usage count, and applies a limit to the results.
+    Ingredients are ordered by their recipe_count column, the number of recipes including each
+    ingredient maintained on every recipe write, so the query is a read of the
+    (recipe_count, ingredient_id) index rather than a count over recipe_ingredients. Ingredients
+    used by no recipe are left out. Responses are cached in memory until an ingredient (or a
+    count) is next written.
 
     Args:
         limit (int): The maximum number of top ingredients to return.
-        db (Session): SQLAlchemy session for database interaction.
+        db (AsyncSession): SQLAlchemy session for database interaction.
 
     Returns:
         List[IngredientResponse]: A list of top ingredients; returns an empty list if none are found.
     """
-    top_ingredients = (
-        db.query(Ingredient.ingredient_id, Ingredient.name, Ingredient.image_url)
-        .join(RecipeIngredient)
-        .group_by(Ingredient.ingredient_id, Ingredient.name, Ingredient.image_url)
-        .order_by(func.count(RecipeIngredient.recipe_id).desc())
+    top_ingredients = (await db.execute(
+        select(Ingredient.ingredient_id, Ingredient.name, Ingredient.image_url)
+        .where(Ingredient.recipe_count > 0)
+        .order_by(Ingredient.recipe_count.desc(), Ingredient.ingredient_id.desc())
         .limit(limit)
-        .all()
-    )
+    )).all()
 
     if not top_ingredients:
         return []
     return top_ingredients
 
 
-@router.get("/search", response_model=List[IngredientResponse])
-def search_recipes(query: str, db: Session = Depends(get_db)):
+@router.get("/autocomplete", response_model=List[Suggestion])
+async def autocomplete_ingredients(
+    q: str,
+    limit: int = Query(10, ge=1, le=settings.AUTOCOMPLETE_MAX_RESULTS),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Suggest ingredient names for a partially typed query.
+
+    Answers come from an in-memory prefix index (built at startup and refreshed on create), so no
+    database query is made. Matches on the start of the name rank first, then matches on the start
+    of a later word; if there are not enough, names similar to the query (typos) fill the rest.
+
+    Args:
+        q (str): The text typed so far.
+        limit (int, optional): The maximum number of suggestions to return. Defaults to 10.
+        db (AsyncSession): The SQLAlchemy database session, only used if the index must be rebuilt.
+
+    Returns:
+        List[Suggestion]: Up to ``limit`` suggested ingredients, best first.
+    """
+    return [{"id": item_id, "name": name} for item_id, name in await ingredient_autocomplete.complete(db, q, limit)]
+
+
+@router.get("/search", response_model=Page[IngredientResponse])
+async def search_recipes(
+    query: str,
+    page: PageParams = Depends(page_params),
+    fields: Optional[FieldSet] = Depends(ingredient_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Search for ingredients that match the provided query.
 
-    This endpoint performs a case-insensitive search on the ingredient name using SQL ILIKE.
-    It returns a distinct ordered list of ingredients that match the search term.
+    This endpoint searches ingredient names through the in-memory ingredient index, ignoring case
+    and accents; the last word may be a prefix. It returns a page of matching ingredients ranked
+    by relevance.
 
     Args:
         query (str): The search string to match ingredient names.
-        db (Session): The SQLAlchemy database session provided by dependency injection.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The SQLAlchemy database session provided by dependency injection.
 
     Returns:
-        List[IngredientResponse]: A list of ingredients matching the given query, or an empty list if none match.
+        Page[IngredientResponse]: A page of ingredients matching the given query, best match first.
     """
-    ingredients = (
-        db.query(Ingredient)
-        .filter(Ingredient.name.ilike(f"%{query}%"))
-        .distinct()
-        .order_by(Ingredient.name)
-        .all()
-    )
-    return ingredients or []
+    ids, next_cursor = paginate_ranked(await ingredient_search.search(db, query), page)
+    ingredients = select(Ingredient).where(Ingredient.ingredient_id.in_(ids))
+    if fields:
+        ingredients = fields.apply(ingredients)
+    by_id = {ingredient.ingredient_id: ingredient for ingredient in await db.scalars(ingredients)}
+    result = {"items": [by_id[i] for i in ids if i in by_id], "next_cursor": next_cursor}
+    return render_page(result, IngredientResponse, fields, size)
+
+
+@router.get("/batch", response_model=Batch[IngredientResponse])
+@cache_response("ingredients")
+async def get_ingredients_batch(
+    ids: List[int] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(ingredient_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve several ingredients by id in one request, with a single IN query.
+
+    Responses are cached in memory until the ingredients table is next written.
+
+    Args:
+        ids (List[int]): The ?ids= comma-separated ingredient ids.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): SQLAlchemy session provided through dependency injection.
+
+    Returns:
+        Batch[IngredientResponse]: The ingredients found, in the requested order, and the ids not found.
+    """
+    query = select(Ingredient)
+    if fields:
+        query = fields.apply(query)
+    result = await load_batch(db, query, Ingredient.ingredient_id, ids)
+    return render_batch(result, IngredientResponse, fields, size)
 
 
 @router.get("/{ingredient_id}", response_model=IngredientResponse)
-def get_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
+async def get_ingredient(
+    ingredient_id: int,
+    request: Request,
+    fields: Optional[FieldSet] = Depends(ingredient_fields),
+    size: Optional[ImageSize] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve a specific ingredient by its unique identifier.
 
+    The response carries an ETag and a Last-Modified header derived from the ingredient's
+    version; conditional requests still matching it get an empty 304.
+
     Args:
         ingredient_id (int): The unique identifier of the ingredient to retrieve.
-        db (Session): SQLAlchemy session provided through dependency injection.
+        request (Request): The incoming request, read for its conditional headers.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): SQLAlchemy session provided through dependency injection.
 
     Raises:
         HTTPException: If the ingredient with the given id is not found.
@@ -98,39 +216,53 @@ def get_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
     Returns:
         IngredientResponse: The details of the requested ingredient.
     """
-    ingredient = db.query(Ingredient).filter(
-        Ingredient.ingredient_id == ingredient_id
-    ).first()
+    state = await row_state(db, Ingredient, Ingredient.ingredient_id, ingredient_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    validator = Validator.for_request(request, *state)
+    if validator.matches(request):
+        return validator.not_modified()
+
+    query = select(Ingredient)
+    if fields:
+        query = fields.apply(query)
+    ingredient = (await db.execute(
+        query.where(Ingredient.ingredient_id == ingredient_id)
+    )).scalar_one_or_none()
     if not ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found")
-    return ingredient
+    return validator.apply(render_item(ingredient, IngredientResponse, fields, size))
 
 
 @router.post("/", response_model=IngredientResponse)
-def create_ingredient(
+async def create_ingredient(
     ingredient: IngredientCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new ingredient in the database.
 
     This endpoint creates a new ingredient record with the provided data.
+    A base64 image is moved to the image store and replaced by a short image reference, and its
+    thumbnails are rendered in the background.
     It requires an authenticated user to perform the action.
 
     Args:
         ingredient (IngredientCreate): The schema containing the data for the new ingredient.
-        db (Session): The SQLAlchemy database session provided via dependency injection.
-        current_user (User): The currently authenticated user, provided by the auth dependency.
+        db (AsyncSession): The SQLAlchemy database session provided via dependency injection.
+        current_user (Principal): The currently authenticated user, provided by the auth dependency.
 
     Returns:
         IngredientResponse: The newly created ingredient's details.
     """
     new_ingredient = Ingredient(
-        name=ingredient.name
-        # image_url can be set here if available, e.g., image_url=ingredient.image_url
+        name=ingredient.name,
+        image_url=await run_in_threadpool(ingest_image_value, ingredient.image_url)
     )
     db.add(new_ingredient)
-    db.commit()
-    db.refresh(new_ingredient)
+    await db.commit()
+    schedule_derivatives(new_ingredient.image_url)
+    ingredient_search.add(new_ingredient.ingredient_id, {"name": new_ingredient.name})
+    ingredient_autocomplete.add(new_ingredient.ingredient_id, new_ingredient.name)
     return new_ingredient
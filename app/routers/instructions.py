@@ -1,41 +1,55 @@
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.instruction import Instruction
+from app.pagination import PageParams, page_params, paginate
+from app.rendering import render_item, render_page
 from app.schemas.instruction import InstructionResponse
+from app.schemas.pagination import Page
+from app.streaming import STREAM_RESPONSES, StreamFormat, stream_collection
 
 # Initialize API Router for instruction endpoints.
 router = APIRouter(prefix="/instructions", tags=["instructions"])
 
 
-@router.get("/", response_model=List[InstructionResponse])
-def get_instructions(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[InstructionResponse], responses=STREAM_RESPONSES)
+async def get_instructions(
+        page: PageParams = Depends(page_params),
+        stream: Optional[StreamFormat] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
-    Retrieve all instructions.
+    Retrieve instructions, one page at a time.
 
-    This endpoint returns a list of all instruction records from the database.
+    This endpoint returns instruction records from the database ordered by id, using keyset pagination.
 
     Args:
-        db (Session): A SQLAlchemy session provided via dependency injection.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        stream (Optional[StreamFormat]): Optional ?stream= format in which to send every instruction
+            after the cursor, as one streamed response, instead of a page.
+        db (AsyncSession): A SQLAlchemy session provided via dependency injection.
 
     Returns:
-        List[InstructionResponse]: A list of instruction details.
+        Page[InstructionResponse]: A page of instruction details and the cursor of the next page.
     """
-    instructions = db.query(Instruction).all()
-    return instructions
+    keys = (Instruction.instruction_id,)
+    if stream:
+        return stream_collection(select(Instruction), keys, InstructionResponse, stream, page.cursor)
+    return render_page(await paginate(db, select(Instruction), keys, page), InstructionResponse)
 
 
 @router.get("/{instruction_id}", response_model=InstructionResponse)
-def get_instruction(instruction_id: int, db: Session = Depends(get_db)):
+async def get_instruction(instruction_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve a specific instruction by its unique identifier.
 
     Args:
         instruction_id (int): The ID of the instruction to retrieve.
-        db (Session): A SQLAlchemy session provided via dependency injection.
+        db (AsyncSession): A SQLAlchemy session provided via dependency injection.
 
     Raises:
         HTTPException: If no instruction with the given ID exists.
@@ -43,7 +57,9 @@ def get_instruction(instruction_id: int, db: Session = Depends(get_db)):
     Returns:
         InstructionResponse: Detailed information about the specified instruction.
     """
-    instruction = db.query(Instruction).filter(Instruction.instruction_id == instruction_id).first()
+    instruction = (await db.execute(
+        select(Instruction).where(Instruction.instruction_id == instruction_id)
+    )).scalar_one_or_none()
     if not instruction:
         raise HTTPException(status_code=404, detail="Instruction not found")
-    return instruction
+    return render_item(instruction, InstructionResponse)
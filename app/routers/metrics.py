@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from app.metrics import metrics
+
+# Initialize API router for the metrics endpoint.
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+def get_metrics():
+    """
+    Report the application's in-process metrics.
+
+    Returns every counter, gauge and histogram registered in the metrics registry, such as the
+    password hashing queue depth and latencies. Figures cover the current server process only.
+
+    Returns:
+        dict: A mapping from metric name to its type, description and current values.
+    """
+    return metrics.snapshot()
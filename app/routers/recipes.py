@@ -1,93 +1,123 @@
-from operator import or_
-from typing import List
+from datetime import UTC, datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from jose import jwt, JWTError
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
-from app.config import settings
+from app.batch_lookup import batch_ids, load_batch
+from app.conditional import Validator
 from app.database import get_db
-from app.models import RecipeIngredient, Ingredient, Category, User
+from app.fields import FieldSet, sparse_fields
+from app.images.derivatives import ImageSize, schedule_derivatives
+from app.images.store import ingest_image_value
+from app.models import RecipeIngredient, Ingredient, Category
 from app.models.instruction import Instruction
 from app.models.recipe import Recipe
 from app.models.recipe_category import RecipeCategory
-from app.schemas import RecipeIngredientResponse
+from app.pagination import PageParams, page_params, paginate, paginate_ranked
+from app.queries.batch import insert_values
+from app.queries.popularity import add_recipe_links
+from app.queries.recipes import recipe_detail_query, recipe_query, recipes_by_ids
+from app.queries.versions import recipe_state
+from app.rendering import render_batch, render_item, render_list, render_page
+from app.schemas import Batch, Page, RecipeIngredientResponse
 from app.schemas.instruction import InstructionResponse
-from app.schemas.recipe import RecipeResponse, RecipeCreate
-from app.security.dependencies import get_current_user, oauth2_scheme
+from app.schemas.recipe import RecipeDetailResponse, RecipeResponse, RecipeCreate
+from app.search.catalog import RecipeSearch, recipe_search
+from app.security.dependencies import get_current_user
+from app.security.principals import Principal
+from app.streaming import STREAM_RESPONSES, StreamFormat, stream_collection
 
 # Initialize the API router for recipe-related endpoints.
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
+# Dependency parsing ?fields= against the RecipeResponse schema.
+recipe_fields = sparse_fields(RecipeResponse, Recipe)
 
-@router.get("/", response_model=List[RecipeResponse])
-def get_recipes(db: Session = Depends(get_db)):
+
+@router.get("/", response_model=Page[RecipeResponse], responses=STREAM_RESPONSES)
+async def get_recipes(
+        page: PageParams = Depends(page_params),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        stream: Optional[StreamFormat] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
-    Retrieve all recipes.
+    Retrieve recipes, one page at a time.
 
-    This endpoint fetches all recipe entries from the database.
+    This endpoint fetches recipe entries from the database ordered by id, using keyset pagination.
 
     Args:
-        db (Session): The SQLAlchemy database session provided by dependency injection.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        stream (Optional[StreamFormat]): Optional ?stream= format in which to send every matching recipe
+            after the cursor, as one streamed response, instead of a page.
+        db (AsyncSession): The SQLAlchemy database session provided by dependency injection.
 
     Returns:
-        List[RecipeResponse]: A list of recipes available in the system.
+        Page[RecipeResponse]: A page of recipes and the cursor of the next page.
     """
-    recipes = db.query(Recipe).all()
-    return recipes
+    query = recipe_query(fields)
+    if stream:
+        return stream_collection(query, (Recipe.id,), RecipeResponse, stream, page.cursor, fields, size)
+    result = await paginate(db, query, (Recipe.id,), page)
+    return render_page(result, RecipeResponse, fields, size)
 
 
-@router.get("/author/", response_model=List[RecipeResponse])
-def get_recipes_by_author(
+@router.get("/author/", response_model=Page[RecipeResponse], responses=STREAM_RESPONSES)
+async def get_recipes_by_author(
         author_id: int,
-        token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
+        page: PageParams = Depends(page_params),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        stream: Optional[StreamFormat] = None,
+        current_user: Principal = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve recipes created by a specific author.
 
-    This endpoint extracts the current user's email from the provided token and then fetches
-    the recipes that belong to that user (by author_id).
+    This endpoint identifies the current user from the bearer token, through the same cached
+    authentication dependency as every other protected endpoint, and then fetches the recipes
+    that belong to that user (by author_id).
 
     Args:
         author_id (int): The author's unique identifier.
-        token (str): JWT token extracted by the OAuth2PasswordBearer dependency.
-        db (Session): The database session.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        stream (Optional[StreamFormat]): Optional ?stream= format in which to send every matching recipe
+            after the cursor, as one streamed response, instead of a page.
+        current_user (Principal): The authenticated user, resolved from the bearer token.
+        db (AsyncSession): The database session.
 
     Raises:
         HTTPException: If credentials are invalid or user not found.
 
     Returns:
-        List[RecipeResponse]: A list of recipes created by the specified author.
+        Page[RecipeResponse]: A page of recipes created by the specified author.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        # Decode the JWT token to retrieve payload.
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.email == email).first()
-    recipes = (
-        db.query(Recipe)
-        .filter(Recipe.author_id == user.user_id)
-        .all()
-    )
-    # Return an empty list if no recipes are found.
-    if not recipes:
-        return []
-    return recipes
-
-
-@router.get("/category/{category_id}", response_model=List[RecipeResponse])
-def get_recipes_by_category(category_id: int, db: Session = Depends(get_db)):
+    query = recipe_query(fields).where(Recipe.author_id == current_user.user_id)
+    if stream:
+        return stream_collection(query, (Recipe.id,), RecipeResponse, stream, page.cursor, fields, size)
+    result = await paginate(db, query, (Recipe.id,), page)
+    return render_page(result, RecipeResponse, fields, size)
+
+
+@router.get("/category/{category_id}", response_model=Page[RecipeResponse], responses=STREAM_RESPONSES)
+async def get_recipes_by_category(
+        category_id: int,
+        page: PageParams = Depends(page_params),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        stream: Optional[StreamFormat] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve recipes filtered by a specific category.
 
@@ -95,25 +125,37 @@ def get_recipes_by_category(category_id: int, db: Session = Depends(get_db)):
 
     Args:
         category_id (int): Unique identifier for the category.
-        db (Session): The database session provided by dependency injection.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        stream (Optional[StreamFormat]): Optional ?stream= format in which to send every matching recipe
+            after the cursor, as one streamed response, instead of a page.
+        db (AsyncSession): The database session provided by dependency injection.
 
     Returns:
-        List[RecipeResponse]: A list of recipes matching the specified category.
+        Page[RecipeResponse]: A page of recipes matching the specified category.
     """
-    recipes = (
-        db.query(Recipe)
+    query = (
+        recipe_query(fields)
         .join(RecipeCategory)
         .join(Category)
-        .filter(Category.category_id == category_id)
-        .all()
+        .where(Category.category_id == category_id)
     )
-    if not recipes:
-        return []
-    return recipes
-
-
-@router.get("/ingredient/{ingredient_id}", response_model=List[RecipeResponse])
-def get_recipes_by_ingredient(ingredient_id: int, db: Session = Depends(get_db)):
+    if stream:
+        return stream_collection(query, (Recipe.id,), RecipeResponse, stream, page.cursor, fields, size)
+    result = await paginate(db, query, (Recipe.id,), page)
+    return render_page(result, RecipeResponse, fields, size)
+
+
+@router.get("/ingredient/{ingredient_id}", response_model=Page[RecipeResponse], responses=STREAM_RESPONSES)
+async def get_recipes_by_ingredient(
+        ingredient_id: int,
+        page: PageParams = Depends(page_params),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        stream: Optional[StreamFormat] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve recipes that use a specific ingredient.
 
@@ -121,71 +163,107 @@ def get_recipes_by_ingredient(ingredient_id: int, db: Session = Depends(get_db))
 
     Args:
         ingredient_id (int): Unique identifier for the ingredient.
-        db (Session): The SQLAlchemy database session.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        stream (Optional[StreamFormat]): Optional ?stream= format in which to send every matching recipe
+            after the cursor, as one streamed response, instead of a page.
+        db (AsyncSession): The SQLAlchemy database session.
 
     Returns:
-        List[RecipeResponse]: A list of recipes containing the ingredient.
+        Page[RecipeResponse]: A page of recipes containing the ingredient.
     """
-    recipes = (
-        db.query(Recipe)
+    query = (
+        recipe_query(fields)
         .join(RecipeIngredient)
         .join(Ingredient)
-        .filter(Ingredient.ingredient_id == ingredient_id)
-        .all()
+        .where(Ingredient.ingredient_id == ingredient_id)
     )
-    if not recipes:
-        return []
-    return recipes
-
-
-@router.get("/search", response_model=List[RecipeResponse])
-def search_recipes(query: str, db: Session = Depends(get_db)):
+    if stream:
+        return stream_collection(query, (Recipe.id,), RecipeResponse, stream, page.cursor, fields, size)
+    result = await paginate(db, query, (Recipe.id,), page)
+    return render_page(result, RecipeResponse, fields, size)
+
+
+@router.get("/search", response_model=Page[RecipeResponse])
+async def search_recipes(
+        query: str,
+        page: PageParams = Depends(page_params),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
     Search for recipes that match the provided query.
 
-    The search is performed across the recipe title, description, ingredient names,
-    and category names. Matching is performed in a case-insensitive manner using SQL ILIKE.
+    The search runs against the in-memory recipe index, which covers the recipe title,
+    description, ingredient names and category names. Matching ignores case and accents and
+    treats simple plural forms alike; the last word may be a prefix. Results are ranked by
+    relevance (BM25F, with title matches weighted highest).
 
     Args:
         query (str): The search query string.
-        db (Session): The database session.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The database session.
 
     Returns:
-        List[RecipeResponse]: A list of recipes that match the search criteria.
+        Page[RecipeResponse]: A page of recipes that match the search criteria, best match first.
     """
-    recipes = (
-        db.query(Recipe)
-        .join(RecipeIngredient)
-        .join(Ingredient)
-        .join(RecipeCategory)
-        .join(Category)
-        .filter(
-            or_(
-                Recipe.title.ilike(f"%{query}%"),
-                or_(
-                    Recipe.description.ilike(f"%{query}%"),
-                    or_(
-                        Ingredient.name.ilike(f"%{query}%"),
-                        Category.name.ilike(f"%{query}%")
-                    )
-                )
-            )
-        )
-        .distinct()  # Ensure unique recipes in case of multiple joins.
-        .order_by(Recipe.title)
-        .all()
-    )
-    return recipes or []
+    ids, next_cursor = paginate_ranked(await recipe_search.search(db, query), page)
+    result = {"items": await recipes_by_ids(db, ids, fields), "next_cursor": next_cursor}
+    return render_page(result, RecipeResponse, fields, size)
+
+
+@router.get("/batch", response_model=Batch[RecipeResponse])
+async def get_recipes_batch(
+        ids: List[int] = Depends(batch_ids),
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve several recipes by id in one request.
+
+    The recipes are loaded with a single IN query plus the usual eager loads, whatever the number
+    of ids.
+
+    Args:
+        ids (List[int]): The ?ids= comma-separated recipe ids.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The database session provided by dependency injection.
+
+    Returns:
+        Batch[RecipeResponse]: The recipes found, in the requested order, and the ids not found.
+    """
+    result = await load_batch(db, recipe_query(fields), Recipe.id, ids)
+    return render_batch(result, RecipeResponse, fields, size)
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
-def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
+async def get_recipe(
+        recipe_id: int,
+        request: Request,
+        fields: Optional[FieldSet] = Depends(recipe_fields),
+        size: Optional[ImageSize] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
     Retrieve the details of a specific recipe.
 
+    The response carries an ETag and a Last-Modified header computed from the versions of the
+    recipe and of its categories and ingredients. A request sending them back in If-None-Match or
+    If-Modified-Since is answered with an empty 304 while they are current, before the recipe is
+    loaded.
+
     Args:
         recipe_id (int): The unique identifier of the recipe.
-        db (Session): The database session provided by dependency injection.
+        request (Request): The incoming request, read for its conditional headers.
+        fields (Optional[FieldSet]): Optional ?fields= selection limiting the loaded and returned fields.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The database session provided by dependency injection.
 
     Raises:
         HTTPException: If the recipe with the given recipe_id is not found.
@@ -193,20 +271,29 @@ def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
     Returns:
         RecipeResponse: Detailed information on the requested recipe.
     """
-    recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+    state = await recipe_state(db, recipe_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    validator = Validator.for_request(request, *state)
+    if validator.matches(request):
+        return validator.not_modified()
+
+    recipe = (await db.execute(
+        recipe_query(fields).where(Recipe.id == recipe_id)
+    )).scalar_one_or_none()
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    return recipe
+    return validator.apply(render_item(recipe, RecipeResponse, fields, size))
 
 
 @router.get("/{recipe_id}/ingredients", response_model=List[RecipeIngredientResponse])
-def get_recipe_ingredients(recipe_id: int, db: Session = Depends(get_db)):
+async def get_recipe_ingredients(recipe_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve the list of ingredients for a specific recipe.
 
     Args:
         recipe_id (int): The unique identifier of the recipe.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Raises:
         HTTPException: If no ingredients are found for the given recipe.
@@ -214,25 +301,25 @@ def get_recipe_ingredients(recipe_id: int, db: Session = Depends(get_db)):
     Returns:
         List[RecipeIngredientResponse]: A list of ingredients with their amounts and units.
     """
-    ingredients = (
-        db.query(RecipeIngredient)
+    ingredients = (await db.scalars(
+        select(RecipeIngredient)
         .join(Ingredient)
-        .filter(RecipeIngredient.recipe_id == recipe_id)
-        .all()
-    )
+        .options(contains_eager(RecipeIngredient.ingredient))
+        .where(RecipeIngredient.recipe_id == recipe_id)
+    )).all()
     if not ingredients:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    return ingredients
+    return render_list(ingredients, RecipeIngredientResponse)
 
 
 @router.get("/{recipe_id}/instructions", response_model=List[InstructionResponse])
-def get_recipe_instructions(recipe_id: int, db: Session = Depends(get_db)):
+async def get_recipe_instructions(recipe_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve the list of instructions for a specific recipe.
 
     Args:
         recipe_id (int): The unique identifier of the recipe.
-        db (Session): The SQLAlchemy database session.
+        db (AsyncSession): The SQLAlchemy database session.
 
     Raises:
         HTTPException: If no instructions are found for the given recipe.
@@ -240,81 +327,169 @@ def get_recipe_instructions(recipe_id: int, db: Session = Depends(get_db)):
     Returns:
         List[InstructionResponse]: A list of instruction steps in order.
     """
-    instructions = (
-        db.query(Instruction)
-        .join(Recipe)
-        .filter(recipe_id == Recipe.id)
-        .all()
-    )
+    instructions = (await db.scalars(
+        select(Instruction)
+        .where(Instruction.recipe_id == recipe_id)
+        .order_by(Instruction.step_number)
+    )).all()
     if not instructions:
         raise HTTPException(status_code=404, detail="Instructions not found")
-    return instructions
+    return render_list(instructions, InstructionResponse)
+
+
+@router.get("/{recipe_id}/full", response_model=RecipeDetailResponse)
+async def get_recipe_detail(
+        recipe_id: int,
+        request: Request,
+        size: Optional[ImageSize] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a recipe with everything needed to display it.
+
+    Returns the recipe together with its categories, its ingredients (with the ingredient data)
+    and its instructions in step order, replacing the three calls to /recipes/{recipe_id},
+    /recipes/{recipe_id}/ingredients and /recipes/{recipe_id}/instructions. Everything is loaded
+    in a fixed number of queries through one database session. Conditional requests are answered
+    as for /recipes/{recipe_id}.
+
+    Args:
+        recipe_id (int): The unique identifier of the recipe.
+        request (Request): The incoming request, read for its conditional headers.
+        size (Optional[ImageSize]): Optional ?size= image variant to return in image_url fields.
+        db (AsyncSession): The database session provided by dependency injection.
+
+    Raises:
+        HTTPException: If the recipe with the given recipe_id is not found.
+
+    Returns:
+        RecipeDetailResponse: The recipe, its categories, ingredients and instructions.
+    """
+    state = await recipe_state(db, recipe_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    validator = Validator.for_request(request, *state)
+    if validator.matches(request):
+        return validator.not_modified()
+
+    recipe = (await db.execute(
+        recipe_detail_query().where(Recipe.id == recipe_id)
+    )).scalar_one_or_none()
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return validator.apply(render_item(recipe, RecipeDetailResponse, size=size))
 
 
 @router.post("/", response_model=RecipeResponse)
-def create_recipe(
+async def create_recipe(
         recipe: RecipeCreate,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new recipe.
 
     This endpoint handles the creation of a new recipe, including its categories, ingredients,
-    and instructions. It first creates the basic recipe record, then iterates over the provided
-    categories, ingredients, and instructions to create associated records.
+    and instructions, in a single transaction and a fixed number of round trips whatever the
+    recipe's size:
+
+      1. the category and ingredient counters are incremented, returning the linked rows (an
+         unknown id is reported before anything is written),
+      2. the recipe is inserted, returning its new id,
+      3. its category links, ingredient links and instructions are each inserted with one
+         multi-row INSERT,
+      4. the transaction is committed once.
+
+    The response is built from the request and the returned rows rather than read back. A base64
+    image is moved to the image store and replaced by a short image reference, and its thumbnails
+    are rendered in the background.
 
     Args:
         recipe (RecipeCreate): The recipe details for creation.
-        db (Session): The SQLAlchemy database session.
-        current_user (User): The user creating the recipe (extracted from the auth token).
+        db (AsyncSession): The SQLAlchemy database session.
+        current_user (Principal): The user creating the recipe (extracted from the auth token).
 
     Returns:
         RecipeResponse: The newly created recipe with all associated details.
+
+    Raises:
+        HTTPException: If a category or ingredient does not exist.
     """
-    # Create the base recipe record.
-    new_recipe = Recipe(
+    # Move an inline image to the image store before writing anything.
+    image_url = await run_in_threadpool(ingest_image_value, recipe.image_url)
+
+    # Count the new recipe in the popularity counters of its categories and ingredients, which
+    # also fetches them for the response.
+    category_ids = {category.category_id for category in recipe.categories}
+    ingredient_ids = {ingredient.ingredient_id for ingredient in recipe.ingredients}
+    categories, ingredients = await add_recipe_links(db, category_ids, ingredient_ids)
+    for name, missing in (
+        ("Category", category_ids - categories.keys()),
+        ("Ingredient", ingredient_ids - ingredients.keys())
+    ):
+        if missing:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail=f"{name} not found: {', '.join(map(str, sorted(missing)))}")
+
+    # Create the base recipe record, getting its id back from the INSERT itself.
+    # The DateTime column keeps no time zone; return the value as it will read back.
+    created_at = datetime.now(UTC).replace(tzinfo=None)
+    recipe_id = (await db.execute(
+        insert(Recipe)
+        .values(
+            title=recipe.title,
+            description=recipe.description,
+            preparation_time=recipe.preparation_time,
+            servings=recipe.servings,
+            difficulty=recipe.difficulty,
+            image_url=image_url,
+            author_id=current_user.user_id,
+            created_at=created_at
+        )
+        .returning(Recipe.id)
+    )).scalar_one()
+
+    # Link categories, add ingredients with amounts and units, and add step-by-step instructions.
+    await insert_values(db, RecipeCategory, [
+        {"recipe_id": recipe_id, "category_id": category.category_id} for category in recipe.categories
+    ])
+    await insert_values(db, RecipeIngredient, [
+        {"recipe_id": recipe_id, "ingredient_id": item.ingredient_id, "amount": item.amount, "unit": item.unit}
+        for item in recipe.ingredients
+    ])
+    await insert_values(db, Instruction, [
+        {"recipe_id": recipe_id, "step_number": idx, "instruction_text": instruction}
+        for idx, instruction in enumerate(recipe.instructions, 1)
+    ])
+    await db.commit()
+
+    schedule_derivatives(image_url)
+    category_rows = [categories[category.category_id] for category in recipe.categories]
+    ingredient_rows = [ingredients[item.ingredient_id] for item in recipe.ingredients]
+    recipe_search.add(recipe_id, RecipeSearch.text_document(
+        recipe.title,
+        recipe.description,
+        (row.name for row in category_rows),
+        (row.name for row in ingredient_rows)
+    ))
+    return RecipeResponse(
+        id=recipe_id,
         title=recipe.title,
         description=recipe.description,
         preparation_time=recipe.preparation_time,
         servings=recipe.servings,
         difficulty=recipe.difficulty,
-        image_url=recipe.image_url,
-        author_id=current_user.user_id
+        image_url=image_url,
+        created_at=created_at,
+        categories=[row._asdict() for row in category_rows],
+        ingredients=[
+            {
+                "recipe_id": recipe_id,
+                "ingredient_id": item.ingredient_id,
+                "amount": item.amount,
+                "unit": item.unit,
+                "ingredient": row._asdict(),
+            }
+            for item, row in zip(recipe.ingredients, ingredient_rows)
+        ]
     )
-
-    db.add(new_recipe)
-    db.commit()
-    db.refresh(new_recipe)
-
-    # Link categories to the recipe.
-    for category in recipe.categories:
-        recipe_category = RecipeCategory(
-            recipe_id=new_recipe.id,
-            category_id=category.category_id
-        )
-        db.add(recipe_category)
-
-    # Add recipe ingredients with amounts and units.
-    for ingredient in recipe.ingredients:
-        recipe_ingredient = RecipeIngredient(
-            recipe_id=new_recipe.id,
-            ingredient_id=ingredient.ingredient_id,
-            amount=ingredient.amount,
-            unit=ingredient.unit
-        )
-        db.add(recipe_ingredient)
-
-    # Add step-by-step instructions.
-    for idx, instruction in enumerate(recipe.instructions, 1):
-        new_instruction = Instruction(
-            recipe_id=new_recipe.id,
-            step_number=idx,
-            instruction_text=instruction
-        )
-        db.add(new_instruction)
-
-    # Finalize all creations and refresh the recipe record.
-    db.commit()
-    db.refresh(new_recipe)
-    return new_recipe
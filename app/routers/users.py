@@ -1,69 +1,78 @@
 from datetime import UTC, datetime
-from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 
 from app.config import settings
 from app.database import get_db
+from app.models.recipe import Recipe
 from app.models.user import User
+from app.pagination import PageParams, page_params, paginate
+from app.queries.popularity import remove_recipe_links
+from app.schemas.pagination import Page
 from app.schemas.user import UserResponse, UserCreate, PasswordChange
+from app.search.catalog import recipe_search
 from app.security.config import oauth2_scheme
-from app.security.dependencies import get_current_user
-
-# Configure password hashing using bcrypt.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.security.dependencies import get_current_user, get_current_user_record
+from app.security.hashing import password_hasher
+from app.security.principals import Principal, invalidate_user
 
 # Initialize the API router for user-related endpoints.
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     Generate a bcrypt hash for the given plain text password.
 
+    The hash is computed in the password hashing process pool, off the event loop.
+
     Args:
         password (str): The plain text password that needs to be hashed.
 
+    Raises:
+        HTTPException: 503 if the password hashing pool is saturated.
+
     Returns:
         str: The hashed password.
     """
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
 
 
-@router.get("/", response_model=List[UserResponse])
-def get_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/", response_model=Page[UserResponse])
+async def get_users(
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Retrieve a list of all users.
+    Retrieve users, one page at a time.
 
     This endpoint is protected and requires a valid JWT token.
-    It returns all users present in the database.
+    It returns users ordered by id, using keyset pagination.
 
     Args:
-        db (Session): SQLAlchemy database session provided via dependency.
-        current_user (User): The currently authenticated user obtained via dependency.
+        page (PageParams): The ?limit= and ?cursor= pagination parameters.
+        db (AsyncSession): SQLAlchemy database session provided via dependency.
+        current_user (Principal): The currently authenticated user obtained via dependency.
 
     Returns:
-        List[UserResponse]: A list of user details.
+        Page[UserResponse]: A page of user details and the cursor of the next page.
     """
-    users = db.query(User).all()
-    return users
+    return await paginate(db, select(User), (User.user_id,), page)
 
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Retrieve information about the currently authenticated user.
 
     Args:
-        current_user (User): The current user provided by the authentication dependency.
+        current_user (Principal): The current user provided by the authentication dependency.
 
     Returns:
         UserResponse: The details of the currently authenticated user.
@@ -72,67 +81,77 @@ async def read_users_me(
 
 
 @router.post("/password", status_code=200)
-def change_password(
+async def change_password(
     password_data: PasswordChange,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_record)
 ):
     """
     Change the current user's password.
 
     This endpoint accepts new password data, hashes it using bcrypt,
-    updates the user's password in the database, and commits the changes.
+    updates the user's password in the database, and commits the changes. The user's cached
+    principal is then dropped so the next request sees the new row.
 
     Args:
         password_data (PasswordChange): The new password data.
-        db (Session): SQLAlchemy database session provided via dependency.
-        current_user (User): The currently authenticated user.
+        db (AsyncSession): SQLAlchemy database session provided via dependency.
+        current_user (User): The database row of the currently authenticated user.
 
     Returns:
         None
     """
     # Hash the new password before updating the user's record.
-    new_hashed_password = get_password_hash(password_data.password)
+    new_hashed_password = await get_password_hash(password_data.password)
     current_user.password = new_hashed_password
-    db.commit()
+    await db.commit()
+    invalidate_user(current_user.user_id)
 
 
 @router.delete("/deletion", status_code=status.HTTP_204_NO_CONTENT)
-def delete_account(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def delete_account(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_record)
 ):
     """
     Delete the account of the currently authenticated user.
 
     This endpoint removes the user's record from the database and commits the transaction.
+    The user's recipes, deleted by the database cascade, are also dropped from the search index
+    and from the recipe counts of their categories and ingredients, and the user's cached principal is dropped so their tokens stop authenticating.
     After deletion, a 204 No Content response is returned.
 
     Args:
-        db (Session): SQLAlchemy database session provided via dependency.
-        current_user (User): The currently authenticated user.
+        db (AsyncSession): SQLAlchemy database session provided via dependency.
+        current_user (User): The database row of the currently authenticated user.
 
     Returns:
         None
     """
-    db.delete(current_user)
-    db.commit()
+    authored = select(Recipe.id).where(Recipe.author_id == current_user.user_id)
+    recipe_ids = list(await db.scalars(authored))
+    # The recipes' links disappear through the cascade, so uncount them first.
+    await remove_recipe_links(db, authored)
+    await db.delete(current_user)
+    await db.commit()
+    invalidate_user(current_user.user_id)
+    recipe_search.remove(recipe_ids)
     return None
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Retrieve details of a specific user given their unique identifier.
 
     Args:
         user_id (int): The unique identifier of the user to retrieve.
-        db (Session): SQLAlchemy database session provided via dependency.
-        current_user (User): The currently authenticated user.
+        db (AsyncSession): SQLAlchemy database session provided via dependency.
+        current_user (Principal): The currently authenticated user.
 
     Raises:
         HTTPException: If the user with the given ID does not exist.
@@ -140,16 +159,16 @@ def get_user(
     Returns:
         UserResponse: The details of the requested user.
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new user in the system.
@@ -160,7 +179,7 @@ def create_user(
 
     Args:
         user (UserCreate): The user data for registration.
-        db (Session): SQLAlchemy database session provided via dependency.
+        db (AsyncSession): SQLAlchemy database session provided via dependency.
 
     Raises:
         HTTPException: If the email is already registered (HTTP 400).
@@ -169,7 +188,7 @@ def create_user(
         UserResponse: The details of the newly created user.
     """
     # Check if there is an existing user with the same email.
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalar_one_or_none()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,14 +199,14 @@ def create_user(
     db_user = User(
         email=user.email,
         name=user.name,
-        password=get_password_hash(user.password),
+        password=await get_password_hash(user.password),
         last_login=None
     )
 
     # Add the new user to the database and commit the transaction.
     db.add(db_user)
-    db.commit()
+    await db.commit()
     # Refresh the instance to load any new data (e.g., generated user_id).
-    db.refresh(db_user)
+    await db.refresh(db_user)
 
     return db_user
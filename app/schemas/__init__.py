@@ -1,9 +1,13 @@
 from app.schemas.ingredient import IngredientBase
 from app.schemas.ingredient import IngredientBase, IngredientCreate, IngredientResponse
 from app.schemas.instruction import InstructionBase, InstructionCreate
-from app.schemas.recipe import RecipeBase, RecipeCreate, RecipeResponse
+from app.schemas.recipe import RecipeBase, RecipeCreate, RecipeDetailResponse, RecipeResponse
 from app.schemas.recipe_ingredient import RecipeIngredientBase
 from app.schemas.recipe_ingredient import RecipeIngredientBase, RecipeIngredientCreate, RecipeIngredientResponse
 from app.schemas.user import UserBase, UserCreate, UserResponse
 from app.schemas.category import CategoryBase, CategoryResponse, CategoryCreate
 from app.schemas.recipe_category import RecipeCategoryBase, RecipeCategoryCreate, RecipeCategoryResponse
+from app.schemas.pagination import Page
+from app.schemas.batch import Batch
+from app.schemas.autocomplete import Suggestion
+from app.schemas.bulk_import import ImportKind, ImportLineError, ImportReport
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    """
+    Schema for one autocomplete suggestion.
+
+    Attributes:
+        id (int): The identifier of the suggested ingredient or category.
+        name (str): Its display name.
+    """
+    id: int
+    name: str
@@ -0,0 +1,17 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Batch(BaseModel, Generic[T]):
+    """
+    Generic schema for the result of a batch lookup by id.
+
+    Attributes:
+        items (List[T]): The records found, in the order their ids were requested.
+        missing (List[int]): The requested ids that matched no record, in request order.
+    """
+    items: List[T]
+    missing: List[int]
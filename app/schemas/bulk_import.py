@@ -0,0 +1,50 @@
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ImportKind(str, Enum):
+    """
+    Kinds of records accepted by the bulk import, one kind per NDJSON stream.
+
+    Each line of a ``recipes`` stream is a RecipeCreate, of an ``ingredients`` stream an
+    IngredientCreate and of a ``categories`` stream a CategoryCreate.
+    """
+    recipes = "recipes"
+    ingredients = "ingredients"
+    categories = "categories"
+
+
+class ImportLineError(BaseModel):
+    """
+    A line of an import that was rejected.
+
+    Attributes:
+        line (int): The 1-based line number in the NDJSON stream.
+        error (str): Why the line was rejected.
+    """
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    """
+    Outcome of a bulk import.
+
+    Attributes:
+        kind (ImportKind): The kind of records imported.
+        received (int): Number of non-blank lines read.
+        created (int): Number of records inserted.
+        updated (int): Number of existing ingredients or categories matched by name; only the
+            fields their lines provide are written.
+        repeated (int): Number of ingredient or category lines superseded by a later line with the
+            same name in the same chunk.
+        errors (List[ImportLineError]): The rejected lines, in line order.
+    """
+    kind: ImportKind
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    repeated: int = 0
+    errors: List[ImportLineError] = []
@@ -1,5 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Annotated, Optional
+from pydantic import AfterValidator, BaseModel
+
+from app.images.store import check_image_value
 
 
 class CategoryBase(BaseModel):
@@ -20,9 +22,10 @@ class CategoryCreate(CategoryBase):
     """
     Schema for creating a new category.
 
-    Inherits all attributes from CategoryBase.
+    Inherits all attributes from CategoryBase; image data in image_url is limited to
+    IMAGE_MAX_BYTES.
     """
-    pass
+    image_url: Annotated[Optional[str], AfterValidator(check_image_value)] = None
 
 
 class CategoryResponse(CategoryBase):
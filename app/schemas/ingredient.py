@@ -1,5 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Annotated, Optional
+from pydantic import AfterValidator, BaseModel
+
+from app.images.store import check_image_value
 
 
 class IngredientBase(BaseModel):
@@ -18,9 +20,10 @@ class IngredientCreate(IngredientBase):
     """
     Schema for creating a new ingredient.
 
-    Inherits all attributes from IngredientBase.
+    Inherits all attributes from IngredientBase; image data in image_url is limited to
+    IMAGE_MAX_BYTES.
     """
-    pass
+    image_url: Annotated[Optional[str], AfterValidator(check_image_value)] = None
 
 
 class IngredientResponse(IngredientBase):
@@ -0,0 +1,18 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    Generic schema for one page of a keyset-paginated collection.
+
+    Attributes:
+        items (List[T]): The records on this page, in the collection's stable order.
+        next_cursor (Optional[str]): Opaque cursor to pass back as ``?cursor=`` to fetch the next
+            page; None when this is the last page.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
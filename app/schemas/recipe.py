@@ -1,9 +1,12 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Annotated, Optional, List
+from pydantic import AfterValidator, BaseModel
+
+from app.images.store import check_image_value
 
 from app.models.instruction import Instruction  # Imported for potential reference (not directly used here)
 from app.schemas import InstructionCreate           # Imported for potential reference (not used in this schema)
+from app.schemas.instruction import InstructionResponse
 from app.schemas.recipe_ingredient import RecipeIngredientResponse, RecipeIngredientCreate
 from app.schemas.category import CategoryResponse
 
@@ -35,12 +38,15 @@ class RecipeCreate(RecipeBase):
     Inherits from RecipeBase and extends it with additional fields required during recipe creation.
 
     Attributes:
+        image_url (Optional[str]): URL or base64 data of the recipe image, limited to
+            IMAGE_MAX_BYTES of image data.
         author_id (int): The ID of the user creating the recipe.
         categories (List[CategoryResponse]): A list of categories assigned to the recipe.
         ingredients (List[RecipeIngredientCreate]): A list of ingredients required for the recipe,
             using the creation schema for recipe ingredients.
         instructions (List[str]): A list of instruction steps as strings.
     """
+    image_url: Annotated[Optional[str], AfterValidator(check_image_value)]
     author_id: int
     categories: List[CategoryResponse]
     ingredients: List[RecipeIngredientCreate]
@@ -67,3 +73,16 @@ class RecipeResponse(RecipeBase):
 
     class Config:
         from_attributes = True
+
+
+class RecipeDetailResponse(RecipeResponse):
+    """
+    Schema for returning everything a recipe screen shows in a single response.
+
+    Attributes:
+        instructions (List[InstructionResponse]): The recipe's instruction steps, in step order.
+    """
+    instructions: List[InstructionResponse]
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,4 @@
+from app.search.autocomplete import AutocompleteIndex
+from app.search.catalog import category_autocomplete, ingredient_autocomplete, ingredient_search, recipe_search
+from app.search.engine import SearchIndex
+from app.search.text import fold, tokenize
@@ -0,0 +1,153 @@
+"""
+Typeahead index for short names (ingredients, categories).
+
+Names are folded (case and accents) and stored in a sorted array keyed by every word start, so a
+prefix lookup is a binary search followed by a scan of the matching keys, keeping only the best
+``limit`` of them: "fei" finds "Feijão preto" and "pre" finds it too. When the prefix matches
+fewer names than requested, usually because of a typo, the remaining slots are filled by trigram
+similarity ("tomte" still suggests "Tomate").
+"""
+
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.search.text import fold
+
+# Minimum Jaccard similarity between trigram sets for a fuzzy suggestion.
+TRIGRAM_THRESHOLD = 0.3
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Compute the trigrams of a folded string, padded so that word starts weigh more.
+
+    Args:
+        text (str): A folded string.
+
+    Returns:
+        Set[str]: The distinct trigrams.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Candidate:
+    """
+    A prefix match, ordered worst first so that a heapq heap keeps the best matches seen so far.
+    """
+    __slots__ = ("key", "item_id")
+
+    def __init__(self, key: tuple, item_id: int):
+        self.key = key
+        self.item_id = item_id
+
+    def __lt__(self, other: "_Candidate") -> bool:
+        return self.key > other.key
+
+
+class AutocompleteIndex:
+    """
+    Prefix and trigram index over (id, name) pairs.
+    """
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()):
+        self._lock = threading.Lock()
+        # Sorted (key, rank, id) tuples; rank 0 for the whole name, 1 for later word starts.
+        self._keys: List[Tuple[str, int, int]] = []
+        self._names: Dict[int, str] = {}
+        self._trigram_counts: Dict[int, int] = {}
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+        entries = []
+        for item_id, name in items:
+            entries.extend(self._index(item_id, name))
+        self._keys = sorted(entries)
+
+    def _index(self, item_id: int, name: str) -> List[Tuple[str, int, int]]:
+        folded = fold(name)
+        self._names[item_id] = name
+        name_trigrams = trigrams(folded)
+        self._trigram_counts[item_id] = len(name_trigrams)
+        for trigram in name_trigrams:
+            self._trigrams[trigram].add(item_id)
+        words = folded.split()
+        return [(" ".join(words[i:]), 1 if i else 0, item_id) for i in range(len(words))]
+
+    def add(self, item_id: int, name: str) -> None:
+        """
+        Add a new name to the index.
+
+        Args:
+            item_id (int): The identifier of the named item.
+            name (str): The display name.
+        """
+        with self._lock:
+            if item_id in self._names:
+                return
+            for entry in self._index(item_id, name):
+                bisect.insort(self._keys, entry)
+
+    def complete(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Suggest up to ``limit`` names for what the user has typed so far.
+
+        Prefix matches on the whole name come first, then prefix matches on a later word, each
+        group shortest name first; fuzzy trigram matches fill any remaining slots.
+
+        Args:
+            query (str): The text typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[Tuple[int, str]]: (id, name) pairs, best first.
+        """
+        prefix = " ".join(fold(query).split())
+        if not prefix or limit < 1:
+            return []
+
+        with self._lock:
+            # The best ``limit`` matches, worst on top, and the candidate of each id in it: a short
+            # prefix matches a large share of the keys, which are scanned in place, never copied.
+            best: List[_Candidate] = []
+            kept: Dict[int, _Candidate] = {}
+            keys = self._keys
+            for index in range(bisect.bisect_left(keys, (prefix,)), len(keys)):
+                key, rank, item_id = keys[index]
+                if not key.startswith(prefix):
+                    break
+                name = self._names[item_id]
+                candidate = _Candidate((rank, len(name), name, item_id), item_id)
+                current = kept.get(item_id)
+                if current is not None:
+                    # The same name matched on another word; keep its better rank.
+                    if candidate.key < current.key:
+                        current.key = candidate.key
+                        heapq.heapify(best)
+                elif len(best) < limit:
+                    heapq.heappush(best, candidate)
+                    kept[item_id] = candidate
+                elif candidate.key < best[0].key:
+                    del kept[heapq.heapreplace(best, candidate).item_id]
+                    kept[item_id] = candidate
+            ranked = [candidate.item_id for candidate in sorted(best, key=lambda candidate: candidate.key)]
+
+            if len(ranked) < limit:
+                ranked.extend(self._fuzzy(prefix, limit - len(ranked), exclude=set(ranked)))
+            return [(item_id, self._names[item_id]) for item_id in ranked]
+
+    def _fuzzy(self, text: str, limit: int, exclude: Set[int]) -> List[int]:
+        query_trigrams = trigrams(text)
+        shared: Dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for item_id in self._trigrams.get(trigram, ()):
+                if item_id not in exclude:
+                    shared[item_id] += 1
+
+        scored = []
+        for item_id, count in shared.items():
+            similarity = count / (len(query_trigrams) + self._trigram_counts[item_id] - count)
+            if similarity >= TRIGRAM_THRESHOLD:
+                scored.append((-similarity, self._names[item_id], item_id))
+        return [item_id for _, _, item_id in sorted(scored)[:limit]]
@@ -0,0 +1,393 @@
+"""
+Search and autocomplete indexes for the recipe catalog.
+
+Several indexes are kept in memory per worker process:
+  - a full-text index over recipes (title, description, ingredient names and category names)
+    backing ``/recipes/search``,
+  - a full-text index over ingredient names backing ``/ingredients/search``,
+  - typeahead indexes over ingredient and category names backing the ``/autocomplete`` routes.
+
+Each is built from the database at startup or on first use, updated incrementally by the write
+endpoints of the same process, and rebuilt in a background task once it is older than
+SEARCH_INDEX_REFRESH_SECONDS so that writes made through other worker processes are picked up.
+Builds index their documents in the threadpool, a batch at a time, so they do not hold the event
+loop.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Category, Ingredient, Recipe, RecipeIngredient
+from app.search.autocomplete import AutocompleteIndex
+from app.search.engine import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Documents indexed per threadpool call while a full-text index is built.
+BUILD_BATCH_SIZE = 500
+
+
+class CatalogIndex(ABC):
+    """
+    An in-memory index that is loaded lazily from the database and periodically rebuilt.
+
+    Subclasses define how an index is built from the database.
+
+    Attributes:
+        refresh_seconds (int): Age after which the index is rebuilt from the database.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._index = None
+        self._loaded_at = None
+        self._build_lock = asyncio.Lock()
+        self._rebuild: Optional[asyncio.Task] = None
+        # Changes applied while a build reads the database, replayed onto the new index.
+        self._changes: Optional[List[Callable]] = None
+
+    @abstractmethod
+    async def build(self, db: AsyncSession):
+        """
+        Build a complete index from the database.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session.
+
+        Returns:
+            The new index object.
+        """
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Build the index if it has never been built, or start rebuilding it if it has gone stale.
+
+        The first build makes concurrent readers wait until it completes. A stale index is rebuilt
+        by a background task with its own session, while requests, including the one noticing it,
+        keep using the previous index; the new one is swapped in when ready.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session used to read the documents of
+                the first build.
+        """
+        if self._is_fresh():
+            return
+        if self._index is None:
+            async with self._build_lock:
+                if self._index is None:
+                    self._changes = []
+                    await self._load(db)
+        elif self._rebuild is None:
+            # Changes are recorded from now on, since the task only reads the database later.
+            self._changes = []
+            self._rebuild = asyncio.create_task(self._rebuild_in_background())
+
+    async def _load(self, db: AsyncSession) -> None:
+        try:
+            index = await self.build(db)
+            # The build may have read the database before some of the changes were committed.
+            # Replaying them is safe: they add or remove whole documents.
+            for change in self._changes:
+                change(index)
+        finally:
+            self._changes = None
+        self._index = index
+        self._loaded_at = time.monotonic()
+
+    async def _rebuild_in_background(self) -> None:
+        try:
+            async with self._build_lock, SessionLocal() as db:
+                await self._load(db)
+        except Exception:
+            # The previous index stays in use; the next request retries.
+            logger.exception("Rebuilding the %s index failed", type(self).__name__)
+        finally:
+            self._rebuild = self._changes = None
+
+    async def stop(self) -> None:
+        """
+        Cancel a background rebuild in progress, e.g. at shutdown.
+        """
+        rebuild = self._rebuild
+        if rebuild is not None:
+            rebuild.cancel()
+            try:
+                await rebuild
+            except asyncio.CancelledError:
+                pass
+            # A task cancelled before it started never ran its own cleanup.
+            self._rebuild = self._changes = None
+
+    async def current(self, db: AsyncSession):
+        """
+        Return the current index, building it first if needed.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session, used if the index must be (re)built.
+
+        Returns:
+            The index object.
+        """
+        await self.ensure_loaded(db)
+        return self._index
+
+    def update(self, change: Callable) -> None:
+        """
+        Apply an incremental change after a write.
+
+        Nothing happens if the index has not been built yet, since the first build will read the
+        new data from the database anyway. While a build is running, the change is also replayed
+        onto the new index before it is swapped in.
+
+        Args:
+            change (Callable): A function receiving the index object and modifying it.
+        """
+        if self._index is not None:
+            change(self._index)
+        if self._changes is not None:
+            self._changes.append(change)
+
+
+class CatalogSearch(CatalogIndex):
+    """
+    A full-text SearchIndex over documents read from the database.
+
+    Attributes:
+        field_weights (Dict[str, float]): Field names and their BM25F weights.
+    """
+
+    field_weights: Dict[str, float] = {}
+
+    @abstractmethod
+    def load_documents(self, db: AsyncSession) -> AsyncIterator[Tuple[Hashable, Dict[str, str]]]:
+        """
+        Stream every document to index from the database.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session.
+
+        Returns:
+            AsyncIterator[Tuple[Hashable, Dict[str, str]]]: (doc_id, document) pairs.
+        """
+
+    async def build(self, db: AsyncSession) -> SearchIndex:
+        index = SearchIndex(self.field_weights)
+        batch = []
+        async for doc_id, document in self.load_documents(db):
+            batch.append((doc_id, document))
+            if len(batch) == BUILD_BATCH_SIZE:
+                await run_in_threadpool(_add_documents, index, batch)
+                batch = []
+        await run_in_threadpool(_add_documents, index, batch)
+        return index
+
+    async def search(self, db: AsyncSession, query: str) -> List[Hashable]:
+        """
+        Rank the documents matching a query.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session, used if the index must be (re)built.
+            query (str): The raw query text.
+
+        Returns:
+            List[Hashable]: The ids of the matching documents, best first.
+        """
+        index = await self.current(db)
+        return [doc_id for doc_id, _ in index.search(query)]
+
+    def add(self, doc_id: Hashable, document: Dict[str, str]) -> None:
+        """
+        Index or re-index a single document after a write.
+
+        Args:
+            doc_id (Hashable): The document identifier.
+            document (Dict[str, str]): Text per field.
+        """
+        self.update(lambda index: index.add(doc_id, document))
+
+    def remove(self, doc_ids: Iterable[Hashable]) -> None:
+        """
+        Remove documents after they were deleted.
+
+        Args:
+            doc_ids (Iterable[Hashable]): The identifiers of the deleted documents.
+        """
+        doc_ids = list(doc_ids)
+
+        def change(index: SearchIndex) -> None:
+            for doc_id in doc_ids:
+                index.remove(doc_id)
+
+        self.update(change)
+
+
+def _add_documents(index: SearchIndex, documents: List[Tuple[Hashable, Dict[str, str]]]) -> None:
+    for doc_id, document in documents:
+        index.add(doc_id, document)
+
+
+class RecipeSearch(CatalogSearch):
+    """
+    Search index over recipes.
+    """
+
+    field_weights = {"title": 3.0, "categories": 2.0, "ingredients": 1.5, "description": 1.0}
+
+    @staticmethod
+    def document(recipe: Recipe) -> Dict[str, str]:
+        """
+        Build the indexed document of a recipe.
+
+        Args:
+            recipe (Recipe): A recipe with its categories and ingredients loaded.
+
+        Returns:
+            Dict[str, str]: Text per indexed field.
+        """
+        return RecipeSearch.text_document(
+            recipe.title,
+            recipe.description,
+            (category.name for category in recipe.categories),
+            (link.ingredient.name for link in recipe.ingredients)
+        )
+
+    @staticmethod
+    def text_document(
+            title: str,
+            description: Optional[str],
+            category_names: Iterable[str],
+            ingredient_names: Iterable[str]
+    ) -> Dict[str, str]:
+        """
+        Build the indexed document of a recipe from plain values, when no Recipe is loaded.
+
+        Args:
+            title (str): The recipe title.
+            description (Optional[str]): The recipe description.
+            category_names (Iterable[str]): The names of the recipe's categories.
+            ingredient_names (Iterable[str]): The names of the recipe's ingredients.
+
+        Returns:
+            Dict[str, str]: Text per indexed field.
+        """
+        return {
+            "title": title,
+            "description": description,
+            "categories": " ".join(category_names),
+            "ingredients": " ".join(ingredient_names),
+        }
+
+    async def load_documents(self, db: AsyncSession):
+        statement = (
+            select(Recipe)
+            .options(
+                load_only(Recipe.id, Recipe.title, Recipe.description),
+                selectinload(Recipe.categories).load_only(Category.name),
+                selectinload(Recipe.ingredients)
+                .joinedload(RecipeIngredient.ingredient)
+                .load_only(Ingredient.name),
+            )
+            .execution_options(yield_per=500)
+        )
+        async for recipe in await db.stream_scalars(statement):
+            yield recipe.id, self.document(recipe)
+
+
+class IngredientSearch(CatalogSearch):
+    """
+    Search index over ingredient names.
+    """
+
+    field_weights = {"name": 1.0}
+
+    async def load_documents(self, db: AsyncSession):
+        statement = select(Ingredient.ingredient_id, Ingredient.name).execution_options(yield_per=1000)
+        async for ingredient_id, name in await db.stream(statement):
+            yield ingredient_id, {"name": name}
+
+
+class NameAutocomplete(CatalogIndex):
+    """
+    Typeahead index over the names of one table.
+
+    Attributes:
+        key: The primary key column of the table.
+        name: The name column of the table.
+    """
+
+    def __init__(self, key, name, refresh_seconds: int):
+        super().__init__(refresh_seconds)
+        self.key = key
+        self.name = name
+
+    async def build(self, db: AsyncSession) -> AutocompleteIndex:
+        rows = (await db.execute(select(self.key, self.name))).all()
+        return await run_in_threadpool(AutocompleteIndex, rows)
+
+    async def complete(self, db: AsyncSession, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Suggest names for a partially typed query.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy async database session, used if the index must be (re)built.
+            query (str): The text typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[Tuple[int, str]]: (id, name) pairs, best first.
+        """
+        index = await self.current(db)
+        return index.complete(query, limit)
+
+    def add(self, item_id: int, name: str) -> None:
+        """
+        Add a newly created name.
+
+        Args:
+            item_id (int): The identifier of the new row.
+            name (str): Its name.
+        """
+        self.update(lambda index: index.add(item_id, name))
+
+
+# Global indexes used by the routers.
+recipe_search = RecipeSearch(settings.SEARCH_INDEX_REFRESH_SECONDS)
+ingredient_search = IngredientSearch(settings.SEARCH_INDEX_REFRESH_SECONDS)
+ingredient_autocomplete = NameAutocomplete(
+    Ingredient.ingredient_id, Ingredient.name, settings.SEARCH_INDEX_REFRESH_SECONDS
+)
+category_autocomplete = NameAutocomplete(
+    Category.category_id, Category.name, settings.SEARCH_INDEX_REFRESH_SECONDS
+)
+
+
+async def warm_autocomplete(db: AsyncSession) -> None:
+    """
+    Build the autocomplete indexes, so the first keystrokes after startup are answered from memory.
+
+    Args:
+        db (AsyncSession): The SQLAlchemy async database session.
+    """
+    await ingredient_autocomplete.ensure_loaded(db)
+    await category_autocomplete.ensure_loaded(db)
+
+
+async def stop_rebuilds() -> None:
+    """
+    Cancel the background index rebuilds in progress, before the connection pool is closed.
+    """
+    for index in (recipe_search, ingredient_search, ingredient_autocomplete, category_autocomplete):
+        await index.stop()
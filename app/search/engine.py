@@ -0,0 +1,154 @@
+"""
+In-memory inverted index with BM25F ranking.
+
+Each document is made of named fields (e.g. title, description, ingredients, categories) with a
+weight per field. Term frequencies are length-normalized per field and combined with the field
+weights before BM25 saturation (the BM25F scheme), so a match in a short title outweighs the same
+word buried in a long description.
+
+The index is updated incrementally: adding a document that already exists replaces it. All methods
+are thread-safe, so an index can also be shared with worker threads.
+"""
+
+import bisect
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from app.search.text import tokenize
+
+
+class SearchIndex:
+    """
+    Tokenized inverted index over multi-field documents, scored with BM25F.
+
+    Attributes:
+        fields (Tuple[str, ...]): The names of the indexed fields.
+        weights (Tuple[float, ...]): The weight of each field, in the same order.
+        k1 (float): BM25 term frequency saturation parameter.
+        b (float): BM25 length normalization parameter.
+    """
+
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.fields = tuple(field_weights)
+        self.weights = tuple(field_weights.values())
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # term -> {doc_id -> term frequency per field}
+        self._postings: Dict[str, Dict[Hashable, Tuple[int, ...]]] = defaultdict(dict)
+        # doc_id -> (length per field, distinct terms)
+        self._documents: Dict[Hashable, Tuple[Tuple[int, ...], Tuple[str, ...]]] = {}
+        self._total_lengths = [0] * len(self.fields)
+        self._sorted_terms: List[str] = []
+        self._terms_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: Hashable, document: Dict[str, str]) -> None:
+        """
+        Index a document, replacing any previous version with the same id.
+
+        Args:
+            doc_id (Hashable): The document identifier, e.g. a recipe id.
+            document (Dict[str, str]): Text per field; missing fields count as empty.
+        """
+        frequencies: Dict[str, List[int]] = defaultdict(lambda: [0] * len(self.fields))
+        lengths = []
+        for position, field in enumerate(self.fields):
+            terms = tokenize(document.get(field) or "")
+            lengths.append(len(terms))
+            for term in terms:
+                frequencies[term][position] += 1
+
+        with self._lock:
+            self._remove(doc_id)
+            for term, counts in frequencies.items():
+                if term not in self._postings:
+                    self._terms_dirty = True
+                self._postings[term][doc_id] = tuple(counts)
+            self._documents[doc_id] = (tuple(lengths), tuple(frequencies))
+            for position, length in enumerate(lengths):
+                self._total_lengths[position] += length
+
+    def remove(self, doc_id: Hashable) -> None:
+        """
+        Remove a document from the index, if present.
+
+        Args:
+            doc_id (Hashable): The document identifier.
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: Hashable) -> None:
+        entry = self._documents.pop(doc_id, None)
+        if entry is None:
+            return
+        lengths, terms = entry
+        for position, length in enumerate(lengths):
+            self._total_lengths[position] -= length
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._terms_dirty = True
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + "\uffff")
+        return self._sorted_terms[start:end]
+
+    def search(self, query: str, prefix_last: bool = True) -> List[Tuple[Hashable, float]]:
+        """
+        Rank the documents matching any term of a query.
+
+        Args:
+            query (str): The raw query text.
+            prefix_last (bool): Treat the last query term as a prefix, so partially typed words
+                ("toma") still match ("tomate").
+
+        Returns:
+            List[Tuple[Hashable, float]]: (doc_id, score) pairs, best first; ties are broken by
+                doc_id so that the order is stable across calls.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            document_count = len(self._documents)
+            if document_count == 0:
+                return []
+            average_lengths = [max(total / document_count, 1.0) for total in self._total_lengths]
+
+            query_terms = set(terms)
+            if prefix_last:
+                query_terms.update(self._expand_prefix(terms[-1]))
+
+            scores: Dict[Hashable, float] = defaultdict(float)
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, counts in postings.items():
+                    lengths = self._documents[doc_id][0]
+                    weighted = self._weighted_frequency(counts, lengths, average_lengths)
+                    scores[doc_id] += idf * weighted / (self.k1 + weighted)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _weighted_frequency(self, counts: Sequence[int], lengths: Sequence[int],
+                            average_lengths: Sequence[float]) -> float:
+        total = 0.0
+        for count, length, average, weight in zip(counts, lengths, average_lengths, self.weights):
+            if count:
+                total += weight * count / (1 - self.b + self.b * length / average)
+        return total
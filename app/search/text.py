@@ -0,0 +1,86 @@
+"""
+Text normalization for the search indexes.
+
+Recipe content is in Portuguese, so matching has to ignore accents ("feijão" = "feijao") and the
+most common inflections ("tomates" = "tomate", "limões" = "limão"). Tokens are produced by folding
+case and diacritics, splitting on anything that is not a letter or digit, dropping stopwords and
+applying a light plural/diminutive stemmer. The same function is used for documents and queries.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Frequent Portuguese function words that carry no meaning for search (already accent-folded).
+STOPWORDS = frozenset("""
+a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas pelo pelos por
+sem sob sobre um uma umas uns
+""".split())
+
+# Suffix rewrites applied in order, first match wins; (suffix, replacement, minimum word length).
+_SUFFIX_RULES = (
+    ("zinhos", "", 8),
+    ("zinhas", "", 8),
+    ("zinho", "", 7),
+    ("zinha", "", 7),
+    ("inhos", "o", 7),
+    ("inhas", "a", 7),
+    ("inho", "o", 6),
+    ("inha", "a", 6),
+    ("oes", "ao", 4),
+    ("aes", "ao", 4),
+    ("ais", "al", 4),
+    ("eis", "el", 4),
+    ("ois", "ol", 4),
+    ("res", "r", 5),
+    ("zes", "z", 5),
+    ("ns", "m", 4),
+    ("s", "", 4),
+)
+
+
+def fold(text: str) -> str:
+    """
+    Lowercase a string and strip its diacritics.
+
+    Args:
+        text (str): The text to fold.
+
+    Returns:
+        str: The folded text, e.g. "Feijão à Brasileira" -> "feijao a brasileira".
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def stem(token: str) -> str:
+    """
+    Reduce a folded token to a crude stem by removing plural and diminutive suffixes.
+
+    Args:
+        token (str): A folded token.
+
+    Returns:
+        str: The stemmed token.
+    """
+    for suffix, replacement, min_length in _SUFFIX_RULES:
+        if len(token) >= min_length and token.endswith(suffix):
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search terms.
+
+    Args:
+        text (str): Raw document or query text.
+
+    Returns:
+        List[str]: The folded, stemmed terms, without stopwords, in their original order.
+    """
+    if not text:
+        return []
+    return [stem(token) for token in _TOKEN_PATTERN.findall(fold(text)) if token not in STOPWORDS]
@@ -1,55 +1,57 @@
 from datetime import datetime, timedelta, UTC
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.config import settings
+from app.security.hashing import password_hasher
 
 # Configuration from settings for JWT processing.
 SECRET_KEY = settings.JWT_SECRET
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-# Create a cryptographic context for hashing passwords using bcrypt.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Initialize the OAuth2 password bearer scheme, which expects a token at the "token" URL.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify that the provided plain text password matches the stored hashed password.
 
-    This function uses the passlib CryptContext configured to use the bcrypt algorithm.
-    It compares the plain_password with the hashed_password and returns a boolean result.
+    The bcrypt check runs in the password hashing process pool, so the event loop keeps serving
+    other requests while it is computed.
 
     Parameters:
         plain_password (str): The plain text password provided by the user.
         hashed_password (str): The hashed password stored in the database.
 
+    Raises:
+        HTTPException: 503 if the password hashing pool is saturated.
+
     Returns:
         bool: True if the passwords match, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
-def create_access_token(email: str) -> str:
+def create_access_token(email: str, user_id: int) -> str:
     """
-    Generate a new JWT access token for the given user email.
+    Generate a new JWT access token for the given user.
 
     The token includes:
       - "sub": set to the user's email, used as the subject of the token.
+      - "user_id": the user's id, so the user can be looked up (and cached) by primary key.
       - "exp": the expiration time, calculated as the current time plus the configured token lifetime.
 
     The JWT token is then encoded using the SECRET_KEY and ALGORITHM defined in the configuration.
 
     Parameters:
         email (str): The email of the user who is being authenticated.
+        user_id (int): The unique identifier of that user.
 
     Returns:
         str: The encoded JWT token as a string.
     """
     expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"sub": email, "exp": expire}
+    to_encode = {"sub": email, "user_id": user_id, "exp": expire}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
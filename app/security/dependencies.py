@@ -1,11 +1,15 @@
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
 from app.security.config import SECRET_KEY, ALGORITHM
+from app.security.principals import Principal, principal_cache, token_cache
 
 # Dependency for OAuth2 token extraction.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -13,21 +17,25 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 async def get_current_user(
         token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
-) -> User:
+        db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
     Retrieve the current user based on the JWT token supplied in the request.
 
     This function decodes the provided JWT token using the configured secret key and algorithm.
-    It then extracts the user's email (stored under the "sub" claim) from the token payload.
+    It then extracts the user's id (stored under the "user_id" claim) from the token payload; tokens
+    issued before that claim existed are resolved through the email in the "sub" claim.
     If the token is invalid or the user is not found in the database, a 401 Unauthorized exception is raised.
 
+    Both the decoded token and the user are cached (see app.security.principals), so a repeated
+    token is authenticated without decoding it again or querying the database.
+
     Parameters:
         token (str): The JWT token extracted via OAuth2PasswordBearer dependency.
-        db (Session): The SQLAlchemy database session, provided by the get_db dependency.
+        db (AsyncSession): The SQLAlchemy async database session, provided by the get_db dependency.
 
     Returns:
-        User: The user object corresponding to the token's subject email.
+        Principal: A read-only snapshot of the user the token was issued for.
 
     Raises:
         HTTPException: If token decoding fails, the "sub" claim is missing,
@@ -38,22 +46,68 @@ async def get_current_user(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials"
     )
-    try:
-        # Decode the JWT token using the configured SECRET_KEY and ALGORITHM.
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        # Extract the email from the token payload. The email is stored in the "sub" claim.
-        email: str = payload.get("sub")
-        if email is None:
+
+    user_id = token_cache.get(token)
+    if user_id is None:
+        try:
+            # Decode the JWT token using the configured SECRET_KEY and ALGORITHM.
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            # Extract the email from the token payload. The email is stored in the "sub" claim.
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+        except JWTError:
+            # Raise the exception if there is any error during token decoding.
             raise credentials_exception
-    except JWTError:
-        # Raise the exception if there is any error during token decoding.
-        raise credentials_exception
 
-    # Query the database to retrieve the user with the corresponding email.
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        # If the user is not found, raise unauthorized exception.
-        raise credentials_exception
+        user_id = payload.get("user_id")
+        if user_id is None:
+            # Query the database to retrieve the user with the corresponding email.
+            result = await db.execute(select(User).where(User.email == email))
+            user = result.scalar_one_or_none()
+            if user is None:
+                # If the user is not found, raise unauthorized exception.
+                raise credentials_exception
+            user_id = user.user_id
+            principal_cache.set(user_id, Principal.from_user(user))
+
+        # Remember the token until it expires.
+        expires_in = payload["exp"] - time.time() if "exp" in payload else None
+        token_cache.set(token, user_id, expires_in)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(user_id, principal)
+
+    # Return the authenticated user.
+    return principal
+
 
-    # Return the authenticated user instance.
+async def get_current_user_record(
+        current_user: Principal = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Load the database row of the current user, for endpoints that modify it.
+
+    Parameters:
+        current_user (Principal): The authenticated user, from get_current_user.
+        db (AsyncSession): The SQLAlchemy async database session, provided by the get_db dependency.
+
+    Returns:
+        User: The user's row, attached to ``db``.
+
+    Raises:
+        HTTPException: If the user no longer exists.
+    """
+    user = await db.get(User, current_user.user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
     return user
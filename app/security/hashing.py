@@ -0,0 +1,140 @@
+"""
+Password hashing off the event loop.
+
+A bcrypt hash or check takes a few hundred milliseconds of pure CPU. Run inside an ``async def``
+handler it would stall every other request for that long, and run in the default threadpool it
+would compete for the few threads the rest of the application's blocking work relies on. Hashing
+therefore goes to a dedicated process pool sized to the machine's cores, behind an async API.
+
+The number of hashes queued or running is bounded. Once the bound is reached new requests are
+rejected at once with 503 Service Unavailable and a Retry-After header, instead of queueing for
+longer than a client would wait. Queue depth, rejections and latencies are published in the
+metrics registry.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.metrics import metrics
+
+# Create a cryptographic context for hashing passwords using bcrypt.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+queue_depth = metrics.gauge("password_hash_queue_depth", "Password hash operations queued or running")
+rejected = metrics.counter("password_hash_rejected_total", "Password hash operations refused because the queue was full")
+latency = {
+    "hash": metrics.histogram("password_hash_seconds", "Time to hash a password, queueing included"),
+    "verify": metrics.histogram("password_verify_seconds", "Time to verify a password, queueing included"),
+}
+
+
+def _hash_password(password: str) -> str:
+    # Runs in a worker process.
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    # Runs in a worker process.
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Bounded process pool hashing and verifying passwords for async callers.
+
+    The pool is created on first use and uses the "spawn" start method so worker processes never
+    inherit the server's threads or open database connections.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+        max_pending (int): Maximum number of operations queued or running at once.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, operation: str, function, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                rejected.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            future = self._get_executor().submit(function, *args)
+            self._pending += 1
+            queue_depth.set(self._pending)
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            latency[operation].observe(time.perf_counter() - started)
+            with self._lock:
+                self._pending -= 1
+                queue_depth.set(self._pending)
+
+    async def hash(self, password: str) -> str:
+        """
+        Generate a bcrypt hash for the given plain text password.
+
+        Args:
+            password (str): The plain text password that needs to be hashed.
+
+        Raises:
+            HTTPException: 503 if too many hash operations are already pending.
+
+        Returns:
+            str: The hashed password.
+        """
+        return await self._run("hash", _hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Check a plain text password against a stored bcrypt hash.
+
+        Args:
+            plain_password (str): The plain text password provided by the user.
+            hashed_password (str): The hashed password stored in the database.
+
+        Raises:
+            HTTPException: 503 if too many hash operations are already pending.
+
+        Returns:
+            bool: True if the passwords match, False otherwise.
+        """
+        return await self._run("verify", _verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, waiting for running operations to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global hasher used by the authentication and user endpoints.
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,86 @@
+"""
+Cached authentication principals.
+
+Authenticating a request used to cost a JWT signature check plus a SELECT on users. Both results
+are now cached in memory:
+
+  - ``token_cache`` maps a raw token to the user id it was issued for. A token's content never
+    changes, so the entry lives until the token expires (or the cache TTL, whichever is sooner).
+  - ``principal_cache`` maps a user id to a ``Principal``, a plain immutable snapshot of the user's
+    row. It is invalidated whenever the row changes (login, password change, account deletion).
+
+On the hot path an authenticated request therefore makes no database round trip at all. Each
+server process keeps its own caches, so a change made through one process reaches the others
+within ``AUTH_CACHE_TTL_SECONDS``.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.cache import TTLCache
+from app.config import settings
+from app.models.user import User
+
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS, name="auth_token_cache")
+principal_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS, name="auth_principal_cache")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Detached, read-only view of an authenticated user.
+
+    Carries the same fields as UserResponse so it can be returned from endpoints as-is, without
+    holding on to an ORM instance (and its session) between requests.
+
+    Attributes:
+        user_id (int): The unique identifier of the user.
+        email (str): The user's email address.
+        name (str): The user's full name.
+        password (str): The user's hashed password.
+        is_active (bool): Whether the user account is active.
+        created_at (datetime): When the user account was created.
+        last_login (Optional[datetime]): When the user last logged in.
+    """
+    user_id: int
+    email: str
+    name: str
+    password: str
+    is_active: bool
+    created_at: datetime
+    last_login: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """
+        Snapshot a User row.
+
+        Args:
+            user (User): The loaded user.
+
+        Returns:
+            Principal: An immutable copy of the user's columns.
+        """
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            name=user.name,
+            password=user.password,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            last_login=user.last_login
+        )
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Forget the cached principal of a user after their row changed or was deleted.
+
+    Tokens issued to the user stay cached; they resolve to the user id only, and the next request
+    reloads the principal (or fails with 401 if the user no longer exists).
+
+    Args:
+        user_id (int): The unique identifier of the user.
+    """
+    principal_cache.pop(user_id)
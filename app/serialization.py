@@ -0,0 +1,98 @@
+"""
+Fast JSON encoding of responses.
+
+For a route with a ``response_model``, FastAPI validates whatever the handler returns against the
+model, converts the validated model into plain Python lists and dicts, and only then has
+JSONResponse encode those with the standard library's ``json.dumps``. For a page of recipes that
+is three passes over every object, two of them in pure Python.
+
+Read endpoints skip that: they validate their ORM objects once through a cached ``TypeAdapter``
+of the response schema and let pydantic-core write the JSON bytes directly, returning a
+``FastJSONResponse`` that FastAPI sends as it is. The route's ``response_model`` is kept, so the
+OpenAPI schema is unchanged and the output is exactly what the model would have produced.
+
+``FastJSONResponse`` is also the application's default response class, so responses still
+serialized by FastAPI are at least encoded by pydantic-core instead of ``json.dumps``.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema) -> TypeAdapter:
+    """
+    Build (once per schema) the adapter validating and serializing a response type.
+
+    Args:
+        schema: A response type, e.g. RecipeResponse, List[InstructionResponse] or Page[RecipeResponse].
+
+    Returns:
+        TypeAdapter: The adapter of the type, with its validator and serializer compiled.
+    """
+    return TypeAdapter(schema)
+
+
+def dump_json(schema, content: Any) -> bytes:
+    """
+    Validate content against a response type and encode it as JSON.
+
+    Args:
+        schema: The response type.
+        content: ORM objects, or dicts and lists of them, read through their attributes.
+
+    Returns:
+        bytes: The JSON document the response model would produce.
+    """
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def dump_jsonable(schema, content: Any) -> Any:
+    """
+    Validate content against a response type and convert it to JSON-compatible Python data.
+
+    Used when the output is rewritten before it is encoded, e.g. to change image URLs.
+
+    Args:
+        schema: The response type.
+        content: ORM objects, or dicts and lists of them, read through their attributes.
+
+    Returns:
+        Any: The response data as lists, dicts, strings, numbers, booleans and None.
+    """
+    adapter = type_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(content, from_attributes=True), mode="json")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by pydantic-core.
+
+    The content is either JSON-compatible Python data or, from ``dump_json``, the already encoded
+    body, which is sent unchanged.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def json_response(schema, content: Any, status_code: int = 200) -> FastJSONResponse:
+    """
+    Serialize content with the fast path into a ready response.
+
+    Args:
+        schema: The response type, usually the route's response_model.
+        content: ORM objects, or dicts and lists of them, read through their attributes.
+        status_code (int): The response status.
+
+    Returns:
+        FastJSONResponse: The response, which FastAPI sends without validating it again.
+    """
+    return FastJSONResponse(dump_json(schema, content), status_code=status_code)
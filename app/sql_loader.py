@@ -0,0 +1,400 @@
+"""
+Streaming loader for T-SQL data scripts such as SQL/MockData.sql.
+
+The mock data script is written for SQL Server: multi-row ``INSERT ... VALUES`` statements whose
+rows carry inline base64 images hundreds of kilobytes long, ``GETDATE()`` calls, and optionally
+``N'...'`` literals, ``[bracketed]`` and ``dbo.``-qualified names and ``GO`` batch separators.
+This module reads such a script a chunk at a time, parses the INSERT statements into Python rows
+and writes them through SQLAlchemy Core ``executemany`` inserts, so the same script seeds a SQL
+Server, SQLite or any other database app.database is configured with, in seconds.
+
+Only one value and one batch of rows are held in memory at a time, whatever the script size.
+
+Translation rules:
+  - ``INSERT INTO table (columns) VALUES (...), (...)`` rows are inserted into the mapped table of
+    the same name, in batches; the values go through the column types like any ORM write.
+  - ``GETDATE()``, ``SYSDATETIME()`` and ``CURRENT_TIMESTAMP`` become the load's start time.
+  - ``N'...'`` literals are plain strings; ``''`` inside a literal is a quote.
+  - ``USE``, ``SET NOCOUNT`` and ``SET IDENTITY_INSERT`` statements are skipped on databases other
+    than SQL Server; ``GO`` ends a statement like ``;`` does.
+  - Any other statement (e.g. the trailing ``UPDATE``s) is executed as text, with the same
+    translations applied.
+"""
+
+import asyncio
+import re
+from datetime import UTC, datetime
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Imported from the package so that every model's table is registered in Base.metadata.
+from app.models import Base
+
+# Characters read from the script at a time.
+READ_SIZE = 1 << 16
+
+# Functions returning the current time, replaced by the load's start time.
+NOW_FUNCTIONS = {"GETDATE", "SYSDATETIME", "CURRENT_TIMESTAMP"}
+
+# Keywords starting a statement, where the previous one may end without a separator.
+STATEMENT_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "USE", "SET")
+
+# Leading keywords of statements that only make sense on SQL Server.
+SKIPPED_STATEMENTS = (("USE",), ("SET", "NOCOUNT"), ("SET", "IDENTITY_INSERT"))
+
+# Any token but a string literal, anchored at the current position.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*)
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>\[[^\]]+\]|[A-Za-z_@#][\w@#$]*)
+  | (?P<symbol>[(),;.=*<>+\-/])
+""", re.VERBOSE)
+
+
+class SQLScriptError(ValueError):
+    """
+    Raised when a script contains something the loader cannot translate.
+    """
+
+
+class Token:
+    """
+    A lexical token of the script.
+
+    Attributes:
+        kind (str): One of "string", "number", "name", "symbol" or "go".
+        value (Any): The decoded value: the string contents, the number, the unquoted name or the
+            symbol character.
+        source (str): The token as it should appear in a statement executed as text.
+    """
+    __slots__ = ("kind", "value", "source")
+
+    def __init__(self, kind: str, value: Any, source: str):
+        self.kind = kind
+        self.value = value
+        self.source = source
+
+    def is_name(self, *names: str) -> bool:
+        return self.kind == "name" and self.value.upper() in names
+
+    def is_symbol(self, symbol: str) -> bool:
+        return self.kind == "symbol" and self.value == symbol
+
+
+def tokenize(script: TextIO) -> Iterator[Token]:
+    """
+    Split a T-SQL script into tokens, reading it a chunk at a time.
+
+    Comments and whitespace are dropped. A line holding only ``GO`` yields a "go" token.
+
+    Args:
+        script (TextIO): The open script, in text mode.
+
+    Yields:
+        Token: The tokens of the script, in order.
+
+    Raises:
+        SQLScriptError: On a character that starts no token, or an unterminated string literal.
+    """
+    buffer, position, at_end = "", 0, False
+    line_start = True
+
+    def fill() -> bool:
+        nonlocal buffer, position, at_end
+        chunk = script.read(READ_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        at_end = not chunk
+        return bool(chunk)
+
+    while True:
+        if position >= len(buffer) and not fill():
+            return
+
+        if buffer.startswith(("'", "N'", "n'"), position):
+            # String literal: scan for the closing quote, reading more of the script as needed.
+            # Quotes doubled inside the literal stand for one quote.
+            position = buffer.index("'", position) + 1
+            parts = []
+            while True:
+                end = buffer.find("'", position)
+                if end == -1 and not at_end:
+                    # Keep what was scanned and drop it from the buffer, so it does not grow.
+                    parts.append(buffer[position:])
+                    position = len(buffer)
+                    fill()
+                    continue
+                if end == -1:
+                    raise SQLScriptError("unterminated string literal")
+                if end + 1 == len(buffer) and not at_end and fill():
+                    # The quote may be the first half of a doubled quote; look at the next chunk.
+                    continue
+                parts.append(buffer[position:end])
+                if buffer.startswith("''", end):
+                    parts.append("'")
+                    position = end + 2
+                    continue
+                position = end + 1
+                break
+            value = "".join(parts)
+            line_start = False
+            yield Token("string", value, "'" + value.replace("'", "''") + "'")
+            continue
+
+        match = TOKEN_PATTERN.match(buffer, position)
+        if (match is None or match.end() == len(buffer)) and not at_end and fill():
+            # The token may continue in the next chunk (and GO needs the character after it).
+            continue
+        if match is None:
+            raise SQLScriptError(f"unexpected character {buffer[position]!r}")
+        position = match.end()
+        kind, source = match.lastgroup, match.group()
+        if kind == "space":
+            line_start = line_start or "\n" in source
+            continue
+        if kind == "comment":
+            continue
+        if kind == "number":
+            yield Token(kind, Decimal(source) if "." in source else int(source), source)
+        elif kind == "name":
+            name = source[1:-1] if source.startswith("[") else source
+            if name.upper() == "GO" and line_start and buffer[position:position + 1] in ("", "\n", "\r"):
+                yield Token("go", name, "")
+            else:
+                yield Token(kind, name, f'"{name}"' if source.startswith("[") else source)
+        else:
+            yield Token(kind, source, source)
+        line_start = False
+
+
+def statements(tokens: Iterator[Token]) -> Iterator[Tuple[Token, Iterator[Token]]]:
+    """
+    Group tokens into statements.
+
+    A statement ends at ``;``, ``GO``, the end of the script, or where the next one starts: T-SQL
+    does not require a separator, so a statement keyword outside parentheses (other than the SET
+    of an UPDATE and the DELETE/UPDATE of an ``ON DELETE`` clause) starts a new statement.
+
+    The statement's tokens are produced lazily, so a statement is never held whole in memory; the
+    caller must consume (or abandon) each statement before asking for the next.
+
+    Args:
+        tokens (Iterator[Token]): The script's tokens, from tokenize.
+
+    Yields:
+        Tuple[Token, Iterator[Token]]: The first token of each statement and an iterator over the
+            remaining tokens, which stops at the statement's end.
+    """
+    tokens = iter(tokens)
+    pending: Optional[Token] = None
+
+    def rest(first: Token) -> Iterator[Token]:
+        nonlocal pending
+        depth, previous = 0, first
+        for token in tokens:
+            if token.kind == "go" or (depth == 0 and token.is_symbol(";")):
+                return
+            if (
+                depth == 0
+                and token.is_name(*STATEMENT_KEYWORDS)
+                and not (token.is_name("SET") and first.is_name("UPDATE"))
+                and not (token.is_name("DELETE", "UPDATE") and previous.is_name("ON"))
+            ):
+                pending = token
+                return
+            depth += token.is_symbol("(") - token.is_symbol(")")
+            previous = token
+            yield token
+
+    while True:
+        token, pending = pending or next(tokens, None), None
+        if token is None:
+            return
+        if token.kind == "go" or token.is_symbol(";"):
+            continue
+        body = rest(token)
+        yield token, body
+        for _ in body:
+            pass
+
+
+def _expect(tokens: Iterator[Token], check: Callable[[Token], bool], what: str) -> Token:
+    token = next(tokens, None)
+    if token is None or not check(token):
+        raise SQLScriptError(f"expected {what}, found {token.source if token else 'end of statement'}")
+    return token
+
+
+def _qualified_name(tokens: Iterator[Token]) -> Tuple[str, Optional[Token]]:
+    # Read a possibly schema-qualified name (dbo.recipes); only the last part is kept. Also
+    # returns the token following the name.
+    name = _expect(tokens, lambda t: t.kind == "name", "a table name").value
+    token = next(tokens, None)
+    while token is not None and token.is_symbol("."):
+        name = _expect(tokens, lambda t: t.kind == "name", "a name").value
+        token = next(tokens, None)
+    return name, token
+
+
+def _value(token: Token, tokens: Iterator[Token], now: datetime) -> Any:
+    if token.kind in ("string", "number"):
+        return token.value
+    if token.is_name("NULL"):
+        return None
+    if token.is_name(*NOW_FUNCTIONS):
+        if not token.is_name("CURRENT_TIMESTAMP"):
+            _expect(tokens, lambda t: t.is_symbol("("), "(")
+            _expect(tokens, lambda t: t.is_symbol(")"), ")")
+        return now
+    raise SQLScriptError(f"unsupported value {token.source}")
+
+
+def insert_rows(tokens: Iterator[Token], now: datetime) -> Tuple[str, List[str], Iterator[Dict[str, Any]]]:
+    """
+    Parse the rest of an INSERT statement, after its INSERT keyword.
+
+    Args:
+        tokens (Iterator[Token]): The statement's remaining tokens.
+        now (datetime): The value of GETDATE() and the like.
+
+    Returns:
+        Tuple[str, List[str], Iterator[Dict[str, Any]]]: The table name, the column names and an
+            iterator producing one dict of column values per row, parsed as it is consumed.
+
+    Raises:
+        SQLScriptError: If the statement is not a literal ``INSERT INTO t (columns) VALUES`` list.
+    """
+    _expect(tokens, lambda t: t.is_name("INTO"), "INTO")
+    table, token = _qualified_name(tokens)
+    if token is None or not token.is_symbol("("):
+        raise SQLScriptError(f"INSERT INTO {table} must list its columns")
+    columns = []
+    while True:
+        columns.append(_expect(tokens, lambda t: t.kind == "name", "a column name").value)
+        if _expect(tokens, lambda t: t.is_symbol(",") or t.is_symbol(")"), ", or )").is_symbol(")"):
+            break
+    _expect(tokens, lambda t: t.is_name("VALUES"), "VALUES")
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        while True:
+            _expect(tokens, lambda t: t.is_symbol("("), "(")
+            values = []
+            while True:
+                values.append(_value(_expect(tokens, lambda t: True, "a value"), tokens, now))
+                if _expect(tokens, lambda t: t.is_symbol(",") or t.is_symbol(")"), ", or )").is_symbol(")"):
+                    break
+            if len(values) != len(columns):
+                raise SQLScriptError(f"{table}: a row has {len(values)} values for {len(columns)} columns")
+            yield dict(zip(columns, values))
+            token = next(tokens, None)
+            if token is None:
+                return
+            if not token.is_symbol(","):
+                raise SQLScriptError(f"expected , or end of statement, found {token.source}")
+
+    return table, columns, rows()
+
+
+def translate_statement(first: Token, tokens: Iterator[Token]) -> str:
+    """
+    Rebuild a statement to execute as text, translating the T-SQL specific parts.
+
+    Args:
+        first (Token): The statement's first token.
+        tokens (Iterator[Token]): Its remaining tokens.
+
+    Returns:
+        str: The statement's SQL text.
+    """
+    parts = []
+    previous = None
+    for token in chain([first], tokens):
+        if token.is_name(*NOW_FUNCTIONS):
+            parts.append("CURRENT_TIMESTAMP")
+            if not token.is_name("CURRENT_TIMESTAMP"):
+                _expect(tokens, lambda t: t.is_symbol("("), "(")
+                _expect(tokens, lambda t: t.is_symbol(")"), ")")
+        elif token.is_symbol(".") and previous is not None and previous.is_name("DBO"):
+            parts.pop()
+        else:
+            parts.append(token.source)
+        previous = token
+    return " ".join(parts)
+
+
+async def load_script(
+        connection: AsyncConnection,
+        script: TextIO,
+        batch_size: int = 500,
+        transform: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+        require_empty: bool = True
+) -> Dict[str, int]:
+    """
+    Execute a T-SQL data script against any database, inserting its rows in batches.
+
+    Rows are inserted without explicit ids, as the script does, so the ids referenced by later
+    statements (e.g. recipe_categories.recipe_id) only match if the tables start out empty; by
+    default a table that already holds rows is refused.
+
+    The script is read and parsed synchronously between the inserts. This is meant for commands
+    and test setup, not for use inside a request.
+
+    Args:
+        connection (AsyncConnection): The connection to load into, inside the caller's transaction.
+        script (TextIO): The open script, in text mode.
+        batch_size (int): Number of rows sent per executemany insert.
+        transform (Optional[Callable[[str, List[Dict[str, Any]]], None]]): Called in a worker
+            thread with the table name and each batch of rows before it is inserted; may modify
+            the rows in place (e.g. to move inline images to the image store).
+        require_empty (bool): Whether to refuse inserting into a table that already holds rows.
+
+    Returns:
+        Dict[str, int]: The number of rows inserted per table name.
+
+    Raises:
+        SQLScriptError: If the script cannot be translated, names an unmapped table, or inserts
+            into a table that is not empty while ``require_empty`` is set.
+    """
+    now = datetime.now(UTC)
+    loaded: Dict[str, int] = {}
+
+    for first, tokens in statements(tokenize(script)):
+        if not first.is_name("INSERT"):
+            following = next(tokens, None)
+            leading = tuple(token.value.upper() for token in (first, following) if token is not None and token.kind == "name")
+            if connection.dialect.name != "mssql" and any(
+                leading[:len(keywords)] == keywords for keywords in SKIPPED_STATEMENTS
+            ):
+                continue
+            sql = translate_statement(first, chain([following] if following else [], tokens))
+            # Executed without parameters, so the text is sent as is (no bind-parameter parsing).
+            await connection.exec_driver_sql(sql)
+            continue
+
+        name, _, rows = insert_rows(tokens, now)
+        table = Base.metadata.tables.get(name.lower())
+        if table is None:
+            raise SQLScriptError(f"unknown table {name}")
+        if table.name not in loaded:
+            if require_empty and await connection.scalar(select(func.count()).select_from(table)):
+                raise SQLScriptError(f"table {table.name} is not empty; the script's ids would not line up")
+            loaded[table.name] = 0
+
+        batch: List[Dict[str, Any]] = []
+        for row in chain(rows, [None]):
+            if row is not None:
+                batch.append(row)
+                if len(batch) < batch_size:
+                    continue
+            if batch:
+                if transform is not None:
+                    await asyncio.to_thread(transform, table.name, batch)
+                await connection.execute(insert(table), batch)
+                loaded[table.name] += len(batch)
+                batch = []
+    return loaded
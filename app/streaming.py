@@ -0,0 +1,133 @@
+"""
+Streamed responses for whole collections.
+
+A paginated endpoint loads one page of ORM objects, validates the page and renders its JSON body
+in memory before sending anything. With ``?stream=json`` or ``?stream=ndjson`` the same endpoint
+instead returns every matching item (starting after ``?cursor=`` when given) as a single
+streamed response:
+
+  - rows are fetched through a server-side cursor, STREAM_BATCH_SIZE at a time (``yield_per``),
+    with the statement's eager loads run once per batch,
+  - each batch is serialized and sent before the next one is fetched,
+
+so memory stays flat however large the collection is, and the first bytes leave as soon as the
+first batch is read. ``json`` sends a JSON array of items, ``ndjson`` one item per line
+(``application/x-ndjson``, the format the bulk import accepts).
+
+The body is produced after the handler has returned, when its request-scoped session is already
+closed, so the stream runs its query in a session of its own.
+"""
+
+from enum import Enum
+from typing import AsyncIterator, Optional, Sequence, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.fields import FieldSet, trimmed_schema
+from app.images.derivatives import ImageSize, rewrite_image_urls
+from app.pagination import decode_cursor, keyset_filter
+from app.serialization import dump_json, dump_jsonable
+
+
+class StreamFormat(str, Enum):
+    """
+    Body formats of a streamed collection.
+    """
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    StreamFormat.JSON: "application/json",
+    StreamFormat.NDJSON: "application/x-ndjson",
+}
+
+# OpenAPI description of the streamed variants, for the ``responses`` argument of a route.
+STREAM_RESPONSES = {
+    200: {
+        "description": "A page of items, or every item when ?stream= is given.",
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+    }
+}
+
+
+def stream_collection(
+        statement: Select,
+        keys: Sequence,
+        schema: Type[BaseModel],
+        stream_format: StreamFormat,
+        cursor: Optional[str] = None,
+        fields: Optional[FieldSet] = None,
+        size: Optional[ImageSize] = None
+) -> StreamingResponse:
+    """
+    Stream every item of a collection query.
+
+    The cursor is decoded here, before the response starts, so a malformed one is still answered
+    with a 400 rather than a broken stream.
+
+    Args:
+        statement (Select): A select over one entity, with its loader options; it must not
+            already be ordered.
+        keys (Sequence): Columns forming a unique, ascending sort key, as for ``paginate``.
+        schema (Type[BaseModel]): The full item schema, e.g. RecipeResponse.
+        stream_format (StreamFormat): Whether to send a JSON array or NDJSON.
+        cursor (Optional[str]): A pagination cursor; only the items after it are sent.
+        fields (Optional[FieldSet]): The requested sparse fieldset, if any.
+        size (Optional[ImageSize]): The requested image variant, if any.
+
+    Raises:
+        HTTPException: With status 400 if the cursor is malformed.
+
+    Returns:
+        StreamingResponse: The response producing the body batch by batch.
+    """
+    if cursor:
+        statement = statement.where(keyset_filter(keys, decode_cursor(cursor, len(keys))))
+    statement = statement.order_by(*keys).execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+    if fields is not None:
+        schema = trimmed_schema(schema, fields.names)
+
+    batches = _serialized_batches(statement, schema, size)
+    if stream_format is StreamFormat.NDJSON:
+        body = _ndjson(batches)
+    else:
+        body = _json_array(batches)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[stream_format])
+
+
+def _serialize(item, schema: Type[BaseModel], size: Optional[ImageSize]) -> bytes:
+    if size is None:
+        return dump_json(schema, item)
+    return to_json(rewrite_image_urls(dump_jsonable(schema, item), size))
+
+
+async def _serialized_batches(
+        statement: Select, schema: Type[BaseModel], size: Optional[ImageSize]
+) -> AsyncIterator[list]:
+    # Each partition is one yield_per batch; its objects are released once it is serialized.
+    async with SessionLocal() as db:
+        result = await db.stream_scalars(statement)
+        async for partition in result.partitions():
+            yield [_serialize(item, schema, size) for item in partition]
+
+
+async def _json_array(batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for batch in batches:
+        if batch:
+            yield separator + b",".join(batch)
+            separator = b","
+    yield b"]"
+
+
+async def _ndjson(batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        if batch:
+            yield b"\n".join(batch) + b"\n"
@@ -0,0 +1,129 @@
+"""
+Count the database round trips and time of POST /recipes/ for recipes of growing size.
+
+The app is booted in-process against a throwaway SQLite database. Every statement sent to the
+database and every COMMIT is counted as one round trip, as it would be on a networked server such
+as SQL Server, where each costs a full network exchange.
+
+Usage:
+    python -m benchmarks.create_recipe_round_trips [--sizes 5 20 50] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, UTC
+
+# Point the app at a scratch database before it is imported.
+SCRATCH = tempfile.mkdtemp(prefix="recipe-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{SCRATCH}/bench.db"
+os.environ["IMAGE_STORE_PATH"] = os.path.join(SCRATCH, "images")
+os.environ["DB_MIGRATE_ON_STARTUP"] = "true"
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import create_app
+from app.database import SessionLocal, engine
+from app.models import User
+from app.security.dependencies import get_current_user
+from app.security.principals import Principal
+
+
+class RoundTrips:
+    """
+    Counts statements and commits sent through the app's engine.
+    """
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._statement)
+        event.listen(engine.sync_engine, "commit", self._commit)
+
+    def _statement(self, *args):
+        self.count += 1
+
+    def _commit(self, *args):
+        self.count += 1
+
+
+async def create_user() -> Principal:
+    """
+    Insert the user the benchmark's recipes are authored by.
+    """
+    async with SessionLocal() as db:
+        user = User(email="bench@example.com", password="", name="Bench", created_at=datetime.now(UTC))
+        db.add(user)
+        await db.commit()
+        return Principal.from_user(user)
+
+
+def recipe_payload(author_id: int, categories: list, ingredients: list, size: int) -> dict:
+    """
+    Build a POST /recipes/ body linking ``size`` ingredients and ``size`` instruction steps.
+    """
+    return {
+        "title": f"Benchmark recipe with {size} ingredients",
+        "description": "Round trip benchmark",
+        "preparation_time": 30,
+        "servings": 4,
+        "difficulty": "MEDIO",
+        "image_url": None,
+        "author_id": author_id,
+        "categories": categories[:3],
+        "ingredients": [
+            {"ingredient_id": item["ingredient_id"], "amount": 1.5, "unit": "g", "ingredient": item}
+            for item in ingredients[:size]
+        ],
+        "instructions": [f"Step {step}" for step in range(1, size + 1)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the round trips of recipe creation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50], help="Ingredients and steps per recipe.")
+    parser.add_argument("--repeat", type=int, default=20, help="Recipes created per size.")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with TestClient(app) as client:
+        # Authenticate every request as the benchmark user, without hashing passwords or tokens.
+        principal = client.portal.call(create_user)
+        app.dependency_overrides[get_current_user] = lambda: principal
+
+        categories = [
+            client.post("/categories/", json={"name": f"Category {i}", "description": None, "image_url": None}).json()
+            for i in range(3)
+        ]
+        ingredients = [
+            client.post("/ingredients/", json={"name": f"Ingredient {i}", "image_url": None}).json()
+            for i in range(max(args.sizes))
+        ]
+
+        round_trips = RoundTrips()
+        print(f"{'size':>6} {'round trips':>12} {'mean ms':>9} {'p95 ms':>8}")
+        for size in args.sizes:
+            payload = recipe_payload(principal.user_id, categories, ingredients, size)
+            counts, timings = [], []
+            for _ in range(args.repeat):
+                before = round_trips.count
+                started = time.perf_counter()
+                response = client.post("/recipes/", json=payload)
+                timings.append((time.perf_counter() - started) * 1000)
+                counts.append(round_trips.count - before)
+                if response.status_code != 200:
+                    sys.exit(f"POST /recipes/ failed: {response.status_code} {response.text}")
+            timings.sort()
+            print(
+                f"{size:>6} {statistics.mean(counts):>12.1f} {statistics.mean(timings):>9.2f} "
+                f"{timings[int(len(timings) * 0.95) - 1]:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,548 @@
+"""
+Benchmark every API route in-process against a freshly seeded SQLite database.
+
+The app from ``create_app()`` is started with its lifespan and driven through httpx's ASGI
+transport, so the numbers cover routing, validation, handlers, the database and serialization but
+no network. The database is seeded either from SQL/MockData.sql (``--seed mock``) or by a
+synthetic generator scaled with ``--scale`` (``--seed synthetic``, the default).
+
+Each scenario sends ``--requests`` requests to one route from ``--concurrency`` concurrent
+clients, after ``--warmup`` unrecorded ones. Throughput and latency percentiles per route are
+written as JSON (``--output``), tagged with the current git commit, so runs on different commits
+can be compared; ``--compare`` prints the change against an earlier result file.
+
+Routes of the app without a scenario are listed in the output under "uncovered".
+
+Usage:
+    python -m benchmarks.endpoints [--seed synthetic --scale 2000] [--requests 200] [--concurrency 10]
+        [--only "GET /recipes/"] [--output benchmark-results.json] [--compare previous.json]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import sqlalchemy
+from fastapi.routing import APIRoute
+from PIL import Image
+from sqlalchemy import insert
+
+# The app package connects its engine when it is imported, so it is only imported by the
+# functions below, once main() has pointed it at a scratch database. Importing this module, as
+# the spawned worker processes do, leaves the environment alone.
+
+# Password of every user created by the benchmark.
+PASSWORD = "benchmark-password"
+
+# Rows inserted per statement by the synthetic generator.
+SEED_BATCH = 500
+
+
+async def seed_synthetic(scale: int) -> None:
+    """
+    Fill the database with ``scale`` recipes and proportionate users, categories and ingredients.
+
+    Args:
+        scale (int): Number of recipes to generate.
+    """
+    from app.database import SessionLocal, engine
+    from app.migrations import drop_schema, upgrade
+    from app.models import Category, Ingredient, Recipe, RecipeCategory, RecipeIngredient, User
+    from app.models.instruction import Instruction
+    from app.queries.popularity import rebuild_recipe_counts
+    from app.security.hashing import password_hasher
+
+    rng = random.Random(42)
+    users, categories, ingredients = max(1, scale // 20), 20, 200
+    now = datetime.now(UTC)
+    password = await password_hasher.hash(PASSWORD)
+
+    async def insert_all(connection, model, rows):
+        for start in range(0, len(rows), SEED_BATCH):
+            await connection.execute(insert(model), rows[start:start + SEED_BATCH])
+
+    async with engine.begin() as connection:
+        await connection.run_sync(drop_schema)
+        await connection.run_sync(upgrade)
+        await insert_all(connection, User, [
+            {"email": f"author{i}@bench.test", "name": f"Author {i}", "password": password, "created_at": now}
+            for i in range(1, users + 1)
+        ])
+        await insert_all(connection, Category, [
+            {"name": f"Category {i}", "description": f"Synthetic category {i}"} for i in range(1, categories + 1)
+        ])
+        await insert_all(connection, Ingredient, [{"name": f"Ingredient {i}"} for i in range(1, ingredients + 1)])
+        await insert_all(connection, Recipe, [
+            {
+                "title": f"Recipe {i} with {rng.choice(['garlic', 'lemon', 'rice', 'cod', 'tomato'])}",
+                "description": f"Synthetic recipe number {i}",
+                "preparation_time": rng.randint(5, 180),
+                "servings": rng.randint(1, 8),
+                "difficulty": rng.choice(("FACIL", "MEDIO", "DIFICIL")),
+                "author_id": rng.randint(1, users),
+                "created_at": now,
+            }
+            for i in range(1, scale + 1)
+        ])
+        await insert_all(connection, RecipeCategory, [
+            {"recipe_id": recipe_id, "category_id": category_id}
+            for recipe_id in range(1, scale + 1)
+            for category_id in rng.sample(range(1, categories + 1), 2)
+        ])
+        await insert_all(connection, RecipeIngredient, [
+            {"recipe_id": recipe_id, "ingredient_id": ingredient_id, "amount": rng.randint(1, 500), "unit": "g"}
+            for recipe_id in range(1, scale + 1)
+            for ingredient_id in rng.sample(range(1, ingredients + 1), 8)
+        ])
+        await insert_all(connection, Instruction, [
+            {"recipe_id": recipe_id, "step_number": step, "instruction_text": f"Step {step} of recipe {recipe_id}"}
+            for recipe_id in range(1, scale + 1)
+            for step in range(1, 7)
+        ])
+    async with SessionLocal() as db:
+        await rebuild_recipe_counts(db)
+        await db.commit()
+    await engine.dispose()
+
+
+def png_data_uri() -> str:
+    """
+    Render a small PNG, encoded as the base64 image_url clients upload.
+    """
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), (200, 120, 40)).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+@dataclass
+class Context:
+    """
+    What scenarios need to build their requests: ids, tokens and fixtures created at setup.
+    """
+    token: str
+    headers: Dict[str, str]
+    author_id: int
+    recipe_ids: List[int]
+    category_ids: List[int]
+    ingredient_ids: List[int]
+    instruction_ids: List[int]
+    image_reference: str
+    # Tokens of users the password and deletion scenarios may modify, one per request.
+    disposable_tokens: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    """
+    A route and how to build its i-th request.
+
+    Attributes:
+        method (str): The HTTP method.
+        route (str): The route path template, as registered in the app.
+        build (Callable[[Context, int], dict]): Returns the ``httpx.AsyncClient.request`` keyword
+            arguments (url, params, json, ...) of the i-th request.
+        expect (int): The status code of a successful request.
+    """
+    method: str
+    route: str
+    build: Callable[[Context, int], dict]
+    expect: int = 200
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+def pick(items: List[int], i: int) -> int:
+    return items[i % len(items)]
+
+
+def recipe_body(ctx: Context, i: int) -> dict:
+    ingredient_ids = [pick(ctx.ingredient_ids, i + k) for k in range(min(5, len(ctx.ingredient_ids)))]
+    return {
+        "title": f"Benchmark recipe {i}",
+        "description": "Created by the endpoint benchmark",
+        "preparation_time": 20,
+        "servings": 2,
+        "difficulty": "MEDIO",
+        "image_url": None,
+        "author_id": ctx.author_id,
+        "categories": [{"category_id": pick(ctx.category_ids, i), "name": "", "description": None, "image_url": None}],
+        "ingredients": [
+            {
+                "ingredient_id": ingredient_id,
+                "amount": 2,
+                "unit": "g",
+                "ingredient": {"ingredient_id": ingredient_id, "name": "", "image_url": None},
+            }
+            for ingredient_id in dict.fromkeys(ingredient_ids)
+        ],
+        "instructions": ["Mix", "Cook", "Serve"],
+    }
+
+
+def bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+# One scenario per route of the app, in the order they run; deletions come last.
+SCENARIOS = [
+    Scenario("GET", "/", lambda ctx, i: {"url": "/"}),
+    Scenario("GET", "/metrics", lambda ctx, i: {"url": "/metrics"}),
+    Scenario("POST", "/token", lambda ctx, i: {
+        "url": "/token", "json": {"email": "bench@bench.test", "password": PASSWORD}
+    }),
+    Scenario("POST", "/users/register", lambda ctx, i: {
+        "url": "/users/register",
+        "json": {"email": f"register{i}-{time.time_ns()}@bench.test", "name": "Registered", "password": PASSWORD},
+    }, 201),
+    Scenario("GET", "/users/", lambda ctx, i: {"url": "/users/", "headers": ctx.headers}),
+    Scenario("GET", "/users/me", lambda ctx, i: {"url": "/users/me", "headers": ctx.headers}),
+    Scenario("GET", "/users/{user_id}", lambda ctx, i: {"url": f"/users/{ctx.author_id}", "headers": ctx.headers}),
+    Scenario("GET", "/recipes/", lambda ctx, i: {"url": "/recipes/"}),
+    Scenario("GET", "/recipes/author/", lambda ctx, i: {
+        "url": "/recipes/author/", "params": {"author_id": ctx.author_id}, "headers": ctx.headers
+    }),
+    Scenario("GET", "/recipes/category/{category_id}", lambda ctx, i: {
+        "url": f"/recipes/category/{pick(ctx.category_ids, i)}"
+    }),
+    Scenario("GET", "/recipes/ingredient/{ingredient_id}", lambda ctx, i: {
+        "url": f"/recipes/ingredient/{pick(ctx.ingredient_ids, i)}"
+    }),
+    Scenario("GET", "/recipes/search", lambda ctx, i: {
+        "url": "/recipes/search", "params": {"query": ("garlic", "lemon rice", "cod")[i % 3]}
+    }),
+    Scenario("GET", "/recipes/batch", lambda ctx, i: {
+        "url": "/recipes/batch", "params": {"ids": ",".join(str(pick(ctx.recipe_ids, i + k)) for k in range(20))}
+    }),
+    Scenario("GET", "/recipes/{recipe_id}", lambda ctx, i: {"url": f"/recipes/{pick(ctx.recipe_ids, i)}"}),
+    Scenario("GET", "/recipes/{recipe_id}/ingredients", lambda ctx, i: {
+        "url": f"/recipes/{pick(ctx.recipe_ids, i)}/ingredients"
+    }),
+    Scenario("GET", "/recipes/{recipe_id}/instructions", lambda ctx, i: {
+        "url": f"/recipes/{pick(ctx.recipe_ids, i)}/instructions"
+    }),
+    Scenario("GET", "/recipes/{recipe_id}/full", lambda ctx, i: {"url": f"/recipes/{pick(ctx.recipe_ids, i)}/full"}),
+    Scenario("GET", "/instructions/", lambda ctx, i: {"url": "/instructions/"}),
+    Scenario("GET", "/instructions/{instruction_id}", lambda ctx, i: {
+        "url": f"/instructions/{pick(ctx.instruction_ids, i)}"
+    }),
+    Scenario("GET", "/ingredients/", lambda ctx, i: {"url": "/ingredients/"}),
+    Scenario("GET", "/ingredients/top/{limit}", lambda ctx, i: {"url": "/ingredients/top/10"}),
+    Scenario("GET", "/ingredients/autocomplete", lambda ctx, i: {
+        "url": "/ingredients/autocomplete", "params": {"q": ("ingr", "ingredient 1", "ingrdient")[i % 3]}
+    }),
+    Scenario("GET", "/ingredients/search", lambda ctx, i: {
+        "url": "/ingredients/search", "params": {"query": "ingredient 1"}
+    }),
+    Scenario("GET", "/ingredients/batch", lambda ctx, i: {
+        "url": "/ingredients/batch", "params": {"ids": ",".join(str(pick(ctx.ingredient_ids, i + k)) for k in range(20))}
+    }),
+    Scenario("GET", "/ingredients/{ingredient_id}", lambda ctx, i: {
+        "url": f"/ingredients/{pick(ctx.ingredient_ids, i)}"
+    }),
+    Scenario("GET", "/categories/", lambda ctx, i: {"url": "/categories/"}),
+    Scenario("GET", "/categories/top", lambda ctx, i: {"url": "/categories/top"}),
+    Scenario("GET", "/categories/autocomplete", lambda ctx, i: {
+        "url": "/categories/autocomplete", "params": {"q": ("cat", "category 1", "ctegory")[i % 3]}
+    }),
+    Scenario("GET", "/categories/batch", lambda ctx, i: {
+        "url": "/categories/batch", "params": {"ids": ",".join(str(pick(ctx.category_ids, i + k)) for k in range(10))}
+    }),
+    Scenario("GET", "/images/{image_hash}", lambda ctx, i: {
+        "url": ctx.image_reference, "params": {"size": "thumb"} if i % 2 else {}
+    }),
+    Scenario("POST", "/recipes/", lambda ctx, i: {"url": "/recipes/", "json": recipe_body(ctx, i), "headers": ctx.headers}),
+    Scenario("POST", "/ingredients/", lambda ctx, i: {
+        "url": "/ingredients/", "json": {"name": f"New ingredient {i}-{time.time_ns()}", "image_url": None},
+        "headers": ctx.headers,
+    }),
+    Scenario("POST", "/categories/", lambda ctx, i: {
+        "url": "/categories/",
+        "json": {"name": f"New category {i}-{time.time_ns()}", "description": None, "image_url": None},
+        "headers": ctx.headers,
+    }),
+    Scenario("POST", "/import/{kind}", lambda ctx, i: {
+        "url": "/import/ingredients",
+        "content": "\n".join(
+            json.dumps({"name": f"Imported {i}-{k}-{time.time_ns()}", "image_url": None}) for k in range(20)
+        ),
+        "headers": {**ctx.headers, "Content-Type": "application/x-ndjson"},
+    }),
+    Scenario("POST", "/users/password", lambda ctx, i: {
+        "url": "/users/password", "json": {"password": PASSWORD},
+        "headers": bearer(pick_token(ctx, "password", i)),
+    }),
+    Scenario("DELETE", "/users/deletion", lambda ctx, i: {
+        "url": "/users/deletion", "headers": bearer(pick_token(ctx, "deletion", i))
+    }, 204),
+]
+
+
+def pick_token(ctx: Context, pool: str, i: int) -> str:
+    # Users modified by a scenario are used once each, so requests do not depend on each other.
+    return ctx.disposable_tokens[pool][i]
+
+
+async def create_users(prefix: str, count: int) -> List[str]:
+    """
+    Insert users directly and issue their tokens, without going through the password hashing pool.
+
+    Args:
+        prefix (str): Prefix of their email addresses.
+        count (int): Number of users to create.
+
+    Returns:
+        List[str]: An access token per user.
+    """
+    from app.database import SessionLocal
+    from app.models import User
+    from app.security.config import create_access_token
+    from app.security.hashing import password_hasher
+
+    password = await password_hasher.hash(PASSWORD)
+    async with SessionLocal() as db:
+        users = [User(email=f"{prefix}{i}@bench.test", name=prefix, password=password) for i in range(count)]
+        db.add_all(users)
+        await db.commit()
+        return [create_access_token(user.email, user.user_id) for user in users]
+
+
+async def setup(client: httpx.AsyncClient, requests_per_route: int) -> Context:
+    """
+    Create the benchmark user and fixtures, and collect ids of seeded rows to request.
+
+    Args:
+        client (httpx.AsyncClient): The client bound to the app.
+        requests_per_route (int): Requests per scenario, warmup included.
+
+    Returns:
+        Context: What the scenarios build their requests from.
+    """
+    from app.database import SessionLocal
+    from app.models import Category, Ingredient, Recipe
+    from app.models.instruction import Instruction
+
+    response = await client.post(
+        "/users/register", json={"email": "bench@bench.test", "name": "Bench", "password": PASSWORD}
+    )
+    response.raise_for_status()
+    author_id = response.json()["user_id"]
+    token = (await client.post("/token", json={"email": "bench@bench.test", "password": PASSWORD})).json()["access_token"]
+    headers = bearer(token)
+
+    image = await client.post(
+        "/categories/", json={"name": "Benchmark image", "description": None, "image_url": png_data_uri()},
+        headers=headers
+    )
+    image.raise_for_status()
+
+    async with SessionLocal() as db:
+        def ids(column):
+            return db.scalars(sqlalchemy.select(column).order_by(column).limit(500))
+        recipe_ids = list(await ids(Recipe.id))
+        category_ids = list(await ids(Category.category_id))
+        ingredient_ids = list(await ids(Ingredient.ingredient_id))
+        instruction_ids = list(await ids(Instruction.instruction_id))
+
+    return Context(
+        token=token,
+        headers=headers,
+        author_id=author_id,
+        recipe_ids=recipe_ids,
+        category_ids=category_ids,
+        ingredient_ids=ingredient_ids,
+        instruction_ids=instruction_ids,
+        image_reference=image.json()["image_url"],
+        disposable_tokens={
+            "password": await create_users("password", requests_per_route),
+            "deletion": await create_users("deletion", requests_per_route),
+        },
+    )
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * fraction // 1))
+    return sorted_values[int(rank) - 1]
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        ctx: Context,
+        scenario: Scenario,
+        requests: int,
+        concurrency: int,
+        warmup: int
+) -> dict:
+    """
+    Send a scenario's requests from concurrent clients and summarize their latencies.
+
+    Returns:
+        dict: Request and error counts, throughput and latency statistics in milliseconds.
+    """
+    async def send(i: int) -> Optional[float]:
+        started = time.perf_counter()
+        response = await client.request(scenario.method, **scenario.build(ctx, i))
+        elapsed = time.perf_counter() - started
+        await response.aclose()
+        return elapsed if response.status_code == scenario.expect else None
+
+    for i in range(warmup):
+        await send(i)
+
+    next_index = iter(range(warmup, warmup + requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in next_index:
+            elapsed = await send(i)
+            if elapsed is None:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    in_ms = [value * 1000 for value in latencies]
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(in_ms) / len(in_ms), 3) if in_ms else 0.0,
+        "p50_ms": round(percentile(in_ms, 0.50), 3),
+        "p95_ms": round(percentile(in_ms, 0.95), 3),
+        "p99_ms": round(percentile(in_ms, 0.99), 3),
+        "max_ms": round(in_ms[-1], 3) if in_ms else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """
+    Print the change of each route's p50 and p95 latency and throughput against a previous run.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    print(f"\nCompared with {baseline['meta'].get('commit') or baseline_path}:")
+    print(f"{'route':<42} {'p50':>9} {'p95':>9} {'rps':>9}")
+    for name, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(name)
+        if previous is None:
+            continue
+
+        def change(key):
+            return f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}%" if previous[key] else "n/a"
+        print(f"{name:<42} {change('p50_ms'):>9} {change('p95_ms'):>9} {change('throughput_rps'):>9}")
+
+
+async def benchmark(args) -> dict:
+    """
+    Seed the database, start the app and run every selected scenario.
+    """
+    from app import create_app
+    from app.commands.load_sql import DEFAULT_SCRIPT, load
+
+    if args.seed == "mock":
+        await load(DEFAULT_SCRIPT, reset=True, batch_size=500, keep_inline_images=False)
+    else:
+        await seed_synthetic(args.scale)
+
+    app = create_app()
+    routes = {f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    scenarios = [scenario for scenario in SCENARIOS if not args.only or scenario.name in args.only]
+
+    results = {"endpoints": {}}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ctx = await setup(client, args.warmup + args.requests)
+            for scenario in scenarios:
+                summary = await run_scenario(client, ctx, scenario, args.requests, args.concurrency, args.warmup)
+                results["endpoints"][scenario.name] = summary
+                print(
+                    f"{scenario.name:<42} {summary['throughput_rps']:>9.1f} rps  p50 {summary['p50_ms']:>8.2f}  "
+                    f"p95 {summary['p95_ms']:>8.2f}  p99 {summary['p99_ms']:>8.2f} ms"
+                    + (f"  {summary['errors']} errors" if summary["errors"] else "")
+                )
+
+    results["uncovered"] = sorted(routes - {scenario.name for scenario in SCENARIOS})
+    results["meta"] = {
+        "commit": git_commit(),
+        "date": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "scale": args.scale if args.seed == "synthetic" else None,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every API route in-process.")
+    parser.add_argument("--seed", choices=("synthetic", "mock"), default="synthetic", help="How to seed the database.")
+    parser.add_argument("--scale", type=int, default=2000, help="Recipes generated by the synthetic seed.")
+    parser.add_argument("--requests", type=int, default=200, help="Recorded requests per route.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients per route.")
+    parser.add_argument("--warmup", type=int, default=10, help="Unrecorded requests per route before measuring.")
+    parser.add_argument("--only", nargs="+", metavar="ROUTE", help='Routes to run, e.g. "GET /recipes/".')
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results.")
+    parser.add_argument("--compare", metavar="BASELINE", help="A previous result file to compare with.")
+    args = parser.parse_args(argv)
+
+    # Point the app at a scratch database and image store, removed once the run is over.
+    scratch = tempfile.mkdtemp(prefix="endpoint-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch}/bench.db"
+    os.environ["IMAGE_STORE_PATH"] = os.path.join(scratch, "images")
+    os.environ.setdefault("JWT_SECRET", "benchmark")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    try:
+        results = asyncio.run(benchmark(args))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {args.output}")
+    if results["uncovered"]:
+        print(f"Routes without a scenario: {', '.join(results['uncovered'])}", file=sys.stderr)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
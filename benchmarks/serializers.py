@@ -0,0 +1,115 @@
+"""
+Compare FastAPI's response_model serialization with the fast path of app.serialization.
+
+Pages of in-memory Recipe objects (each with its categories and ingredients, as the list
+endpoints load them) are serialized both ways, with no database or HTTP involved:
+
+  - "response_model": what FastAPI does with a handler's return value, i.e. validate against the
+    route's response field, convert to Python data, then encode with JSONResponse,
+  - "fast path": ``json_response`` validating once through a cached TypeAdapter and encoding
+    with pydantic-core.
+
+Both must produce the same JSON document; the script checks it before timing.
+
+Usage:
+    python -m benchmarks.serializers [--sizes 1 50 200] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+# The app package connects its engine on import: point it at a scratch database.
+SCRATCH = tempfile.mkdtemp(prefix="serializer-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{SCRATCH}/bench.db"
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.models import Category, Ingredient, Recipe, RecipeIngredient
+from app.routers.recipes import router
+from app.schemas import Page
+from app.schemas.recipe import RecipeResponse
+from app.serialization import json_response
+
+
+def build_page(size: int) -> dict:
+    """
+    Build a page of ``size`` transient recipes with 3 categories and 8 ingredients each.
+    """
+    categories = [Category(category_id=i, name=f"Category {i}", description="A category", image_url=None)
+                  for i in range(1, 4)]
+    ingredients = [Ingredient(ingredient_id=i, name=f"Ingredient {i}", image_url=f"/images/{i:064x}")
+                   for i in range(1, 9)]
+    recipes = []
+    for recipe_id in range(1, size + 1):
+        recipe = Recipe(
+            id=recipe_id,
+            title=f"Recipe {recipe_id}",
+            description="A fairly ordinary description of a recipe, long enough to be realistic.",
+            preparation_time=45,
+            servings=4,
+            difficulty="MEDIO",
+            image_url=None,
+            author_id=1,
+            created_at=datetime(2024, 5, 17, 12, 30),
+        )
+        recipe.categories = categories
+        recipe.ingredients = [
+            RecipeIngredient(recipe_id=recipe_id, ingredient_id=item.ingredient_id, amount=1.5, unit="g",
+                             ingredient=item)
+            for item in ingredients
+        ]
+        recipes.append(recipe)
+    return {"items": recipes, "next_cursor": None}
+
+
+def response_model_path(field, page: dict) -> bytes:
+    # serialize_response never suspends when validating on the event loop thread, so it is driven
+    # directly rather than through an event loop whose overhead would be timed too.
+    try:
+        serialize_response(field=field, response_content=page).send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response suspended")
+
+
+def fast_path(page: dict) -> bytes:
+    return json_response(Page[RecipeResponse], page).body
+
+
+def time_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare response serialization paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 200], help="Recipes per page.")
+    parser.add_argument("--repeat", type=int, default=200, help="Serializations timed per size and path.")
+    args = parser.parse_args(argv)
+
+    # The response field FastAPI built for GET /recipes/, as used when a handler returns objects.
+    field = next(route for route in router.routes
+                 if isinstance(route, APIRoute) and route.path == "/recipes/" and "GET" in route.methods).response_field
+
+    print(f"{'recipes':>8} {'response_model ms':>18} {'fast path ms':>13} {'speedup':>8}")
+    for size in args.sizes:
+        page = build_page(size)
+        if json.loads(response_model_path(field, page)) != json.loads(fast_path(page)):
+            raise SystemExit(f"the two paths disagree for a page of {size}")
+        slow = time_ms(lambda: response_model_path(field, page), args.repeat)
+        fast = time_ms(lambda: fast_path(page), args.repeat)
+        print(f"{size:>8} {slow:>18.3f} {fast:>13.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+import os
+
+# The app package creates its engine on import: never let the tests reach a configured database.
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
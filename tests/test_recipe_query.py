@@ -0,0 +1,56 @@
+"""
+recipe_query() must load the whole RecipeResponse graph in a fixed number of queries.
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models import Base, Category, Ingredient, Recipe, RecipeIngredient, User
+from app.queries.recipes import recipe_query
+from app.schemas.recipe import RecipeResponse
+from app.serialization import dump_jsonable
+
+
+async def count_queries(recipes: int) -> int:
+    """
+    Seed an in-memory database with ``recipes`` recipes, then count the statements needed to load
+    and serialize them all.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            async with AsyncSession(bind=connection, expire_on_commit=False) as db:
+                author = User(email="author@example.com", password="", name="Author", created_at=datetime(2024, 1, 1))
+                categories = [Category(name=f"Category {i}") for i in range(3)]
+                ingredients = [Ingredient(name=f"Ingredient {i}") for i in range(4)]
+                db.add_all([author, *categories, *ingredients])
+                await db.flush()
+                for i in range(recipes):
+                    recipe = Recipe(title=f"Recipe {i}", preparation_time=10, servings=2, difficulty="FACIL",
+                                    author_id=author.user_id, categories=categories[:2])
+                    recipe.ingredients = [RecipeIngredient(ingredient=item, amount=1, unit="g") for item in ingredients]
+                    db.add(recipe)
+                await db.flush()
+                db.expunge_all()
+
+                statements = []
+                event.listen(connection.sync_connection, "before_cursor_execute",
+                             lambda *args: statements.append(args[2]))
+                loaded = (await db.scalars(recipe_query())).all()
+                # Serializing walks every relationship; a lazy load would fail under AsyncSession.
+                responses = [dump_jsonable(RecipeResponse, recipe) for recipe in loaded]
+    finally:
+        await engine.dispose()
+
+    assert len(responses) == recipes
+    assert all(len(response["ingredients"]) == 4 and len(response["categories"]) == 2 for response in responses)
+    return len(statements)
+
+
+def test_query_count_does_not_depend_on_result_size():
+    # Recipes, their categories, and their ingredient links joined to the ingredients.
+    assert asyncio.run(count_queries(2)) == asyncio.run(count_queries(25)) == 3